@@ -0,0 +1,70 @@
+"""Synthetic SQLite databases with catalogs of a chosen size, for benchmarks."""
+
+import random
+import sqlite3
+from pathlib import Path
+
+# Words used to build table and column names that read like a real schema
+_DOMAINS = [
+    "sales", "billing", "crm", "inventory", "shipping", "hr", "payroll", "support",
+    "marketing", "analytics", "finance", "catalog", "auth", "audit", "warehouse",
+]
+_ENTITIES = [
+    "customer", "order", "invoice", "payment", "product", "supplier", "employee",
+    "ticket", "campaign", "shipment", "account", "refund", "contract", "region", "event",
+]
+_COLUMN_TYPES = ["INTEGER", "TEXT", "REAL", "NUMERIC", "TIMESTAMP", "BOOLEAN"]
+_COLUMN_WORDS = [
+    "name", "status", "amount", "total", "created_at", "updated_at", "email", "code",
+    "quantity", "price", "note", "city", "country", "priority", "score", "currency",
+]
+
+
+def table_names(tables: int) -> list[str]:
+    """Return ``tables`` distinct table names, the same for a given count."""
+    return [
+        f"{_DOMAINS[i % len(_DOMAINS)]}_{_ENTITIES[(i // len(_DOMAINS)) % len(_ENTITIES)]}_{i}"
+        for i in range(tables)
+    ]
+
+
+def build_sqlite_catalog(
+    path: Path,
+    tables: int,
+    columns: int = 8,
+    views: int = 0,
+    rows: int = 0,
+    seed: int = 42,
+) -> list[str]:
+    """Create a SQLite database with the given number of tables and views.
+
+    Every table has an ``id`` primary key, ``columns - 1`` other columns and,
+    after the first, a foreign key to an earlier table. Views select from a
+    table. Returns the table names.
+    """
+    rng = random.Random(seed)
+    names = table_names(tables)
+    path.unlink(missing_ok=True)
+    statements = []
+    for i, name in enumerate(names):
+        definitions = ["id INTEGER PRIMARY KEY"]
+        parent = names[rng.randrange(i)] if i else None
+        if parent:
+            definitions.append(f"{parent}_id INTEGER REFERENCES {parent}(id)")
+        for c in range(columns - len(definitions)):
+            word = _COLUMN_WORDS[(i + c) % len(_COLUMN_WORDS)]
+            definitions.append(f"{word}_{c} {rng.choice(_COLUMN_TYPES)}")
+        statements.append(f"CREATE TABLE {name} ({', '.join(definitions)});")
+        if rows:
+            statements.extend(
+                f"INSERT INTO {name} (id) VALUES ({r});" for r in range(1, rows + 1)
+            )
+    for v in range(views):
+        statements.append(f"CREATE VIEW view_{v} AS SELECT * FROM {names[v % tables]};")
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript("BEGIN;\n" + "\n".join(statements) + "\nCOMMIT;")
+    finally:
+        conn.close()
+    return names
@@ -0,0 +1,148 @@
+"""Benchmark response compression: bytes on the wire and CPU cost per encoding.
+
+Compresses a synthetic query result page and a synthetic catalog with every
+installed codec, both in one shot and streamed in row-sized chunks (as
+spilled results are sent).
+
+Usage:
+    python -m benchmarks.compression_bench [--rows 1000] [--tables 300] [--repeat 5] [--json out.json]
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from src.middleware.compression import Codec, available_codecs
+from src.models.metadata import (
+    ColumnMetadataResponse,
+    DatabaseDetailResponse,
+    TableMetadataResponse,
+    TableType,
+)
+from src.models.query import ColumnInfo, QueryResultResponse
+
+
+def build_query_payload(rows: int) -> tuple[bytes, list[bytes]]:
+    """Build a query result page and the chunks it would be streamed in."""
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    data = [
+        {
+            "id": i,
+            "email": f"user{i}@example.com",
+            "status": rng.choice(["active", "inactive", "pending"]),
+            "balance": f"{rng.uniform(0, 10000):.2f}",
+            "created_at": (start + timedelta(minutes=rng.randint(0, 500000))).isoformat(),
+            "notes": None if rng.random() < 0.5 else f"note {rng.randint(0, 99)}",
+        }
+        for i in range(rows)
+    ]
+    response = QueryResultResponse(
+        columns=[ColumnInfo(name=name, type="text") for name in data[0]],
+        rows=data,
+        row_count=rows,
+        truncated=False,
+    )
+    body = response.model_dump_json(by_alias=True).encode("utf-8")
+    chunks = [json.dumps(row, separators=(",", ":")).encode("utf-8") for row in data]
+    return body, chunks
+
+
+def build_catalog_payload(tables: int) -> bytes:
+    """Build a DatabaseDetailResponse for a schema with many tables."""
+    rng = random.Random(7)
+    types = ["integer", "varchar(255)", "text", "timestamp", "numeric(10,2)", "boolean"]
+    detail = DatabaseDetailResponse(
+        name="bench",
+        connection_url="postgresql://bench@localhost/bench",
+        created_at="2024-01-01T00:00:00",
+        updated_at="2024-01-01T00:00:00",
+        table_count=tables,
+        view_count=0,
+        tables=[
+            TableMetadataResponse(
+                schema_name="public",
+                table_name=f"table_{t}",
+                table_type=TableType.TABLE,
+                columns=[
+                    ColumnMetadataResponse(
+                        column_name="id" if c == 0 else f"column_{c}",
+                        data_type=rng.choice(types),
+                        is_nullable=c != 0,
+                        is_primary_key=c == 0,
+                        position=c + 1,
+                    )
+                    for c in range(rng.randint(4, 20))
+                ],
+            )
+            for t in range(tables)
+        ],
+    )
+    return detail.model_dump_json(by_alias=True).encode("utf-8")
+
+
+def measure(codec: Codec, body: bytes, chunks: list[bytes] | None, repeat: int) -> dict[str, Any]:
+    """Measure compressed size and CPU time (best of ``repeat`` runs)."""
+    best_cpu = float("inf")
+    compressed = b""
+    for _ in range(repeat):
+        started = time.process_time()
+        if chunks is None:
+            compressed = codec.compress(body)
+        else:
+            stream = codec.stream()
+            compressed = b"".join(stream.compress(chunk) for chunk in chunks) + stream.finish()
+        best_cpu = min(best_cpu, time.process_time() - started)
+    return {
+        "encoding": codec.name,
+        "mode": "one-shot" if chunks is None else "stream",
+        "original_bytes": len(body),
+        "wire_bytes": len(compressed),
+        "ratio": round(len(body) / len(compressed), 2),
+        "cpu_ms": round(best_cpu * 1000, 2),
+        "mb_per_cpu_second": round(len(body) / best_cpu / 1e6, 1) if best_cpu else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="Rows in the query payload")
+    parser.add_argument("--tables", type=int, default=300, help="Tables in the catalog payload")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    query_body, query_chunks = build_query_payload(args.rows)
+    catalog_body = build_catalog_payload(args.tables)
+
+    results = []
+    for payload, body, chunks in (
+        ("query", query_body, None),
+        ("query", query_body, query_chunks),
+        ("catalog", catalog_body, None),
+    ):
+        for codec in available_codecs():
+            results.append({"payload": payload, **measure(codec, body, chunks, args.repeat)})
+
+    header = (
+        f"{'payload':<8} {'encoding':<9} {'mode':<9} "
+        f"{'bytes':>11} {'wire':>10} {'ratio':>6} {'cpu ms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['payload']:<8} {row['encoding']:<9} {row['mode']:<9} "
+            f"{row['original_bytes']:>11} {row['wire_bytes']:>10} {row['ratio']:>6} {row['cpu_ms']:>8}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
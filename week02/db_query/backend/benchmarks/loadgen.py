@@ -0,0 +1,424 @@
+"""HTTP load generator for ``POST /dbs/{name}/query``.
+
+Sends a weighted mix of SQL statements to a running backend and reports
+throughput, latency percentiles, errors and connection pool waits.
+
+Two modes:
+
+- ``closed`` (default): ``--concurrency`` virtual users, each sending its
+  next request as soon as the previous one returns. Shows the throughput
+  one worker sustains.
+- ``open``: requests arrive at ``--rate`` per second whether or not earlier
+  ones have returned (at most ``--max-in-flight`` outstanding; arrivals
+  beyond that are counted as ``dropped``). Latency is measured from the
+  scheduled arrival, so queueing in the service counts.
+
+Users (closed) or the arrival rate (open) ramp up linearly over
+``--ramp-up`` seconds. Requests sent during the ramp-up are not included in
+the statistics. Pool waits come from ``GET /dbs/{name}/pool``, read before
+and after the measured window; if either read fails (a stalled service
+times out), the report says so and still shows latencies and errors.
+
+Without ``--url``, a uvicorn worker is started on a free port with a scratch
+metadata store. Without ``--db-url``, the connection is a stand-in SQLite
+database of customers and orders, queried by the default mix. A mix file
+is a JSON list of ``{"name", "sql", "weight"}`` objects; ``{id}`` in the SQL
+is replaced with a random id from 1 to ``--id-max``.
+
+Usage:
+    python -m benchmarks.loadgen [--url http://localhost:8000] [--db-url URL] [--mix mix.json]
+        [--mode closed|open] [--concurrency 16] [--rate 200] [--duration 30] [--ramp-up 5]
+        [--json out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.stats import percentile
+
+DEFAULT_MIX = [
+    {"name": "point", "sql": "SELECT * FROM orders WHERE id = {id}", "weight": 5},
+    {
+        "name": "customer_orders",
+        "sql": "SELECT * FROM orders WHERE customer_id = {id} ORDER BY id",
+        "weight": 3,
+    },
+    {
+        "name": "aggregate",
+        "sql": "SELECT status, COUNT(*) AS n, SUM(amount) AS total FROM orders GROUP BY status",
+        "weight": 1,
+    },
+    {"name": "page", "sql": "SELECT * FROM customers ORDER BY id LIMIT 100", "weight": 1},
+]
+
+
+@dataclass
+class Sample:
+    query: str
+    started: float
+    seconds: float
+    outcome: str
+
+
+@dataclass
+class Run:
+    """Samples of one load run."""
+
+    measure_from: float
+    samples: list[Sample] = field(default_factory=list)
+    dropped: int = 0
+
+
+def build_standin_db(path: Path, customers: int, seed: int = 42) -> None:
+    """Create a SQLite database of customers and orders (ten per customer)."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(
+            """
+            CREATE TABLE customers (
+                id INTEGER PRIMARY KEY, name TEXT NOT NULL, city TEXT, created_at TEXT
+            );
+            CREATE TABLE orders (
+                id INTEGER PRIMARY KEY,
+                customer_id INTEGER NOT NULL REFERENCES customers(id),
+                amount REAL NOT NULL,
+                status TEXT NOT NULL,
+                created_at TEXT
+            );
+            CREATE INDEX idx_orders_customer ON orders (customer_id);
+            """
+        )
+        conn.executemany(
+            "INSERT INTO customers VALUES (?, ?, ?, ?)",
+            (
+                (i, f"customer {i}", rng.choice(["Berlin", "Lima", "Osaka"]), "2024-01-01")
+                for i in range(1, customers + 1)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO orders VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    i,
+                    rng.randint(1, customers),
+                    round(rng.uniform(1, 500), 2),
+                    rng.choice(["paid", "pending", "refunded"]),
+                    "2024-06-01",
+                )
+                for i in range(1, customers * 10 + 1)
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def classify(response: httpx.Response) -> str:
+    """Return ``ok`` or an error label such as ``504 QUERY_TIMEOUT``."""
+    if response.status_code < 400:
+        return "ok"
+    code = ""
+    try:
+        body = response.json()
+        error = body.get("error") or body.get("detail") or {}
+        code = error.get("code", "") if isinstance(error, dict) else ""
+    except ValueError:
+        pass
+    return f"{response.status_code} {code}".strip()
+
+
+class LoadGenerator:
+    def __init__(self, client: httpx.AsyncClient, name: str, mix: list[dict], args):
+        self.client = client
+        self.name = name
+        self.mix = mix
+        self.weights = [entry.get("weight", 1) for entry in mix]
+        self.args = args
+        self.rng = random.Random(args.seed)
+
+    async def send(self, run: Run, scheduled: float) -> None:
+        entry = self.rng.choices(self.mix, self.weights)[0]
+        sql = entry["sql"].replace("{id}", str(self.rng.randint(1, self.args.id_max)))
+        try:
+            response = await self.client.post(
+                f"/api/v1/dbs/{self.name}/query",
+                json={"sql": sql, "pageSize": self.args.page_size},
+            )
+            outcome = classify(response)
+        except httpx.TimeoutException:
+            outcome = "client timeout"
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        run.samples.append(
+            Sample(entry["name"], scheduled, time.perf_counter() - scheduled, outcome)
+        )
+
+    async def closed_loop(self, run: Run, end: float) -> None:
+        async def user(start_delay: float) -> None:
+            await asyncio.sleep(start_delay)
+            while time.perf_counter() < end:
+                await self.send(run, time.perf_counter())
+
+        users = self.args.concurrency
+        ramp = self.args.ramp_up
+        await asyncio.gather(*(user(ramp * i / users) for i in range(users)))
+
+    async def open_loop(self, run: Run, end: float) -> None:
+        started = time.perf_counter()
+        in_flight: set[asyncio.Task] = set()
+        next_arrival = started
+        while next_arrival < end:
+            await asyncio.sleep(max(next_arrival - time.perf_counter(), 0))
+            if len(in_flight) >= self.args.max_in_flight:
+                run.dropped += next_arrival >= run.measure_from
+            else:
+                task = asyncio.create_task(self.send(run, next_arrival))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            # Ramp the rate linearly, never below one request per second
+            elapsed = next_arrival - started
+            ramp = self.args.ramp_up
+            rate = self.args.rate * min(elapsed / ramp, 1.0) if ramp else self.args.rate
+            next_arrival += 1.0 / max(rate, 1.0)
+        if in_flight:
+            await asyncio.wait(in_flight)
+
+
+async def pool_totals(client: httpx.AsyncClient, name: str) -> dict[str, float] | None:
+    """Sum the checkout counters of a connection's pools.
+
+    Returns None when the counters can't be read, which happens when the
+    service stalls under load; the run is still reported without them.
+    """
+    try:
+        response = await client.get(f"/api/v1/dbs/{name}/pool")
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"pool stats unavailable: {type(e).__name__}: {e}", file=sys.stderr)
+        return None
+    totals = Counter()
+    for endpoint in response.json()["endpoints"]:
+        attempts = endpoint["checkouts"] + endpoint["timeouts"]
+        totals["checkouts"] += endpoint["checkouts"]
+        totals["timeouts"] += endpoint["timeouts"]
+        totals["wait_ms"] += endpoint["avgCheckoutWaitMs"] * attempts
+        totals["max_wait_ms"] = max(totals["max_wait_ms"], endpoint["maxCheckoutWaitMs"])
+    return totals
+
+
+def summarize(
+    run: Run, window: float, before: dict | None, after: dict | None
+) -> dict[str, Any]:
+    measured = [s for s in run.samples if s.started >= run.measure_from]
+    ok = [s for s in measured if s.outcome == "ok"]
+    latencies = [s.seconds * 1000 for s in ok] or [0.0]
+    per_query = {}
+    for name in sorted({s.query for s in measured}):
+        query_latencies = [s.seconds * 1000 for s in ok if s.query == name] or [0.0]
+        per_query[name] = {
+            "requests": sum(1 for s in measured if s.query == name),
+            "p50_ms": round(percentile(query_latencies, 50), 1),
+            "p99_ms": round(percentile(query_latencies, 99), 1),
+        }
+    return {
+        "requests": len(measured),
+        "ok": len(ok),
+        "dropped": run.dropped,
+        "throughput_rps": round(len(ok) / window, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p90": round(percentile(latencies, 90), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": round(max(latencies), 1),
+        },
+        "errors": dict(Counter(s.outcome for s in measured if s.outcome != "ok")),
+        "queries": per_query,
+        "pool": pool_summary(before, after),
+    }
+
+
+def pool_summary(before: dict | None, after: dict | None) -> dict[str, Any] | None:
+    """Pool counters over the measured window, or None if they weren't read."""
+    if before is None or after is None:
+        return None
+    checkouts = after["checkouts"] - before["checkouts"]
+    attempts = checkouts + after["timeouts"] - before["timeouts"]
+    return {
+        "checkouts": checkouts,
+        "timeouts": after["timeouts"] - before["timeouts"],
+        "avg_wait_ms": (
+            round((after["wait_ms"] - before["wait_ms"]) / attempts, 3) if attempts else 0.0
+        ),
+        "max_wait_ms_lifetime": after["max_wait_ms"],
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir: Path) -> tuple[subprocess.Popen, str]:
+    """Start one uvicorn worker with a scratch metadata store."""
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_SQLITE_PATH": str(workdir / "meta.db"),
+        "DEEPSEEK_API_KEY": os.environ.get("DEEPSEEK_API_KEY", "loadgen"),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        env=env,
+        # The service prints failed queries; the report counts them instead
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health").status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Server did not start within 30 seconds")
+
+
+async def run(args, url: str, db_url: str, mix: list[dict]) -> dict[str, Any]:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=args.timeout) as client:
+        name = args.name
+        response = await client.get(f"/api/v1/dbs/{name}")
+        if response.status_code == 404:
+            response = await client.put(f"/api/v1/dbs/{name}", json={"url": db_url})
+        response.raise_for_status()
+
+        generator = LoadGenerator(client, name, mix, args)
+        started = time.perf_counter()
+        load = Run(measure_from=started + args.ramp_up)
+        end = load.measure_from + args.duration
+
+        # Read the pool counters when the measured window opens
+        async def snapshot_at_window() -> dict[str, float] | None:
+            await asyncio.sleep(args.ramp_up)
+            return await pool_totals(client, name)
+
+        before_task = asyncio.create_task(snapshot_at_window())
+        if args.mode == "open":
+            await generator.open_loop(load, end)
+        else:
+            await generator.closed_loop(load, end)
+        window = time.perf_counter() - load.measure_from
+        before = await before_task
+        after = await pool_totals(client, name)
+
+    return {
+        "mode": args.mode,
+        "concurrency": args.concurrency if args.mode == "closed" else None,
+        "rate": args.rate if args.mode == "open" else None,
+        "duration_s": args.duration,
+        "ramp_up_s": args.ramp_up,
+        **summarize(load, window, before, after),
+    }
+
+
+def print_report(result: dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    pool = result["pool"]
+    print(
+        f"{result['mode']} loop: {result['requests']} requests, {result['ok']} ok, "
+        f"{result['dropped']} dropped, {result['throughput_rps']} req/s"
+    )
+    print(
+        f"latency ms: p50 {latency['p50']}  p90 {latency['p90']}  "
+        f"p99 {latency['p99']}  max {latency['max']}"
+    )
+    if pool is None:
+        print("pool: stats unavailable")
+    else:
+        print(
+            f"pool: {pool['checkouts']} checkouts, avg wait {pool['avg_wait_ms']} ms, "
+            f"{pool['timeouts']} timeouts"
+        )
+    if result["errors"]:
+        print("errors:")
+        for outcome, count in sorted(result["errors"].items(), key=lambda item: -item[1]):
+            print(f"  {count:>7}  {outcome}")
+    header = f"{'query':<20} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in result["queries"].items():
+        print(f"{name:<20} {stats['requests']:>9} {stats['p50_ms']:>8} {stats['p99_ms']:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Backend base URL (default: start a local worker)")
+    parser.add_argument("--db-url", help="Database to query (default: a stand-in SQLite db)")
+    parser.add_argument("--name", default="loadgen", help="Connection name")
+    parser.add_argument("--mix", help="JSON file with the SQL mix")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=16, help="Virtual users (closed)")
+    parser.add_argument("--rate", type=float, default=200.0, help="Requests per second (open)")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="Outstanding requests before arrivals are dropped (open)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Ramp-up seconds")
+    parser.add_argument("--page-size", type=int, default=100, help="pageSize of each query")
+    parser.add_argument("--id-max", type=int, default=10000, help="Largest {id} substituted")
+    parser.add_argument("--customers", type=int, default=10000,
+                        help="Customers in the stand-in database")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client timeout (seconds)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    mix = DEFAULT_MIX
+    if args.mix:
+        with open(args.mix, encoding="utf-8") as f:
+            mix = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        db_url = args.db_url
+        if db_url is None:
+            path = workdir / "standin.db"
+            build_standin_db(path, args.customers)
+            db_url = f"sqlite:///{path}"
+        server = None
+        url = args.url
+        if url is None:
+            server, url = start_server(workdir)
+        try:
+            result = asyncio.run(run(args, url, db_url, mix))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    print_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Benchmark metadata extraction and catalog reads against synthetic catalogs.
+
+For each catalog size, builds a SQLite database with the given numbers of
+tables, columns per table and views, then runs an add/read/refresh/read
+cycle through the app in process:
+
+- ``add``: ``PUT /dbs/{name}`` (connects and extracts the metadata)
+- ``list``: ``GET /dbs``
+- ``detail``: ``GET /dbs/{name}``
+- ``refresh``: ``POST /dbs/{name}/refresh``
+- ``detail_after_refresh``: ``GET /dbs/{name}``
+
+Each step records its wall time, the SQL statements issued against the
+metadata store and against the catalog database, and the peak Python memory
+allocated during the step (tracemalloc, which slows the steps down; use
+``--no-memory`` for timings alone). Read steps are repeated and report the
+median time. Results can be written as JSON to compare runs across commits.
+
+Usage:
+    python -m benchmarks.metadata_bench [--tables 10 100 1000] [--columns 8] [--views 0]
+        [--repeat 5] [--no-memory] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from benchmarks.catalogs import build_sqlite_catalog
+
+
+class StatementCounter:
+    """Count statements per engine, split into the metadata store and the rest."""
+
+    def __init__(self, metadata_engine: Engine):
+        self.metadata_engine = metadata_engine
+        self.counts: Counter[str] = Counter()
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(Engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(Engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        store = "metadata" if conn.engine is self.metadata_engine else "source"
+        self.counts[store] += 1
+
+
+def measure(
+    step: Callable[[], Any], counter: StatementCounter, trace_memory: bool, repeat: int = 1
+) -> dict[str, Any]:
+    """Run a step ``repeat`` times and return its median time and last counts."""
+    seconds = []
+    peak = None
+    for _ in range(repeat):
+        counter.counts.clear()
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        response = step()
+        seconds.append(time.perf_counter() - started)
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        response.raise_for_status()
+    return {
+        "ms": round(statistics.median(seconds) * 1000, 1),
+        "metadata_statements": counter.counts["metadata"],
+        "source_statements": counter.counts["source"],
+        "peak_mb": round(peak / 1e6, 1) if peak is not None else None,
+        "response_kb": round(len(response.content) / 1000, 1),
+    }
+
+
+def run_size(client, counter, workdir: Path, tables: int, args) -> dict[str, Any]:
+    path = workdir / f"catalog_{tables}.db"
+    build_sqlite_catalog(path, tables, columns=args.columns, views=args.views)
+    name = f"metadata_bench_{tables}"
+    url = f"sqlite:///{path}"
+    memory = not args.no_memory
+
+    steps = {
+        "add": measure(
+            lambda: client.put(f"/api/v1/dbs/{name}", json={"url": url}), counter, memory
+        ),
+        "list": measure(lambda: client.get("/api/v1/dbs"), counter, memory, args.repeat),
+        "detail": measure(
+            lambda: client.get(f"/api/v1/dbs/{name}"), counter, memory, args.repeat
+        ),
+        "refresh": measure(
+            lambda: client.post(f"/api/v1/dbs/{name}/refresh"), counter, memory
+        ),
+        "detail_after_refresh": measure(
+            lambda: client.get(f"/api/v1/dbs/{name}"), counter, memory, args.repeat
+        ),
+    }
+    client.delete(f"/api/v1/dbs/{name}")
+    return {
+        "tables": tables,
+        "columns": args.columns,
+        "views": args.views,
+        "steps": steps,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Catalog sizes (tables)")
+    parser.add_argument("--columns", type=int, default=8, help="Columns per table")
+    parser.add_argument("--views", type=int, default=0, help="Views per catalog")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of each read step")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Don't trace memory (faster, more accurate timings)")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        # Settings are read at import time, so the app is imported once the
+        # environment points at a scratch metadata store
+        os.environ["DATABASE_SQLITE_PATH"] = str(workdir / "meta.db")
+        os.environ.setdefault("DEEPSEEK_API_KEY", "bench")
+        from fastapi.testclient import TestClient
+
+        from src.db.repository import engine
+        from src.main import app
+
+        results = []
+        with TestClient(app) as client, StatementCounter(engine) as counter:
+            for tables in args.tables:
+                results.append(run_size(client, counter, workdir, tables, args))
+                print(f"  {tables} tables done", file=sys.stderr)
+        engine.dispose()
+
+    header = (
+        f"{'tables':>7} {'step':<21} {'ms':>10} {'meta stmts':>11} "
+        f"{'src stmts':>10} {'peak MB':>8} {'resp KB':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        for step, m in row["steps"].items():
+            print(
+                f"{row['tables']:>7} {step:<21} {m['ms']:>10} {m['metadata_statements']:>11} "
+                f"{m['source_statements']:>10} {str(m['peak_mb']):>8} {m['response_kb']:>9}"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"commit": git_commit(), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
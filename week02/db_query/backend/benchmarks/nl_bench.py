@@ -0,0 +1,220 @@
+"""Benchmark the natural language to SQL path against a local mock model.
+
+For each catalog size, builds a synthetic SQLite database, adds it through the
+API (extracting its metadata) and sends ``POST /dbs/{name}/query/natural``
+requests at a fixed concurrency through the app, in process. The model is
+the OpenAI-compatible stub from ``tests/llm_stub.py`` with a configurable
+latency and writing speed, so no API key is needed and the time the mock
+model takes is known. The answer cache is disabled, so every request builds
+its schema context and calls the model.
+
+Reports throughput, p50/p99 latency, the latency beyond the mock model's
+own time (schema context, prompt building and client overhead) and the
+prompt size. With ``--max-overhead-p99-ms``, exits with status 1 when a
+catalog size exceeds it, so it can gate CI.
+
+Usage:
+    python -m benchmarks.nl_bench [--tables 10 1000 20000] [--requests 200] [--concurrency 8]
+        [--latency-ms 200] [--tokens-per-second 100] [--max-overhead-p99-ms 250] [--json out.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.catalogs import build_sqlite_catalog
+from benchmarks.stats import percentile
+from tests.llm_stub import LlmStub
+
+QUESTIONS = [
+    "How many {entity} records were created last month?",
+    "Top 10 {entity} by total amount",
+    "List {entity} with status pending and their {parent}",
+    "Average price of {entity} per country",
+    "Which {entity} have no updates since last year?",
+]
+
+
+def canned_responses(names: list[str]) -> list[str]:
+    """Model answers that select from tables of the catalog."""
+    return [
+        json.dumps(
+            {
+                "sql": f"SELECT * FROM {name} ORDER BY id LIMIT 100",
+                "explanation": f"Returns the first 100 rows of {name}, ordered by id.",
+            }
+        )
+        for name in names[:: max(len(names) // 5, 1)][:5]
+    ]
+
+
+def build_questions(names: list[str], count: int) -> list[str]:
+    """Questions mentioning the words of tables spread over the catalog."""
+    questions = []
+    for i in range(count):
+        name = names[(i * 7919) % len(names)]
+        domain, entity, _ = name.split("_", 2)
+        template = QUESTIONS[i % len(QUESTIONS)]
+        questions.append(f"{domain} " + template.format(entity=entity, parent="owner"))
+    return questions
+
+
+async def drive(client, name: str, questions: list[str], concurrency: int) -> list[dict[str, Any]]:
+    """Send the questions with ``concurrency`` requests in flight."""
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for question in questions:
+        queue.put_nowait(question)
+    samples: list[dict[str, Any]] = []
+
+    async def worker() -> None:
+        while not queue.empty():
+            question = queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.post(
+                f"/api/v1/dbs/{name}/query/natural", json={"question": question}
+            )
+            elapsed = time.perf_counter() - started
+            body = response.json()
+            samples.append(
+                {
+                    "status": response.status_code,
+                    "seconds": elapsed,
+                    "context_tokens": body.get("contextTokens"),
+                    "context_tables": len(body.get("contextTables") or []),
+                }
+            )
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+async def run_size(
+    app, stub: LlmStub, workdir: Path, tables: int, args: argparse.Namespace
+) -> dict[str, Any]:
+    path = workdir / f"catalog_{tables}.db"
+    names = build_sqlite_catalog(path, tables, columns=args.columns)
+    stub.responses = canned_responses(names)
+    name = f"nl_bench_{tables}"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        started = time.perf_counter()
+        response = await client.put(f"/api/v1/dbs/{name}", json={"url": f"sqlite:///{path}"})
+        response.raise_for_status()
+        setup_seconds = time.perf_counter() - started
+
+        # One request first, so the first sample doesn't include the catalog build
+        await drive(client, name, build_questions(names, 1), 1)
+        stub.prompt_chars.clear()
+
+        started = time.perf_counter()
+        samples = await drive(
+            client, name, build_questions(names, args.requests), args.concurrency
+        )
+        wall_seconds = time.perf_counter() - started
+        await client.delete(f"/api/v1/dbs/{name}")
+
+    ok = [s for s in samples if s["status"] == 200]
+    latencies = [s["seconds"] * 1000 for s in ok] or [0.0]
+    model_ms = args.latency_ms + stub.writing_seconds(stub.responses[0]) * 1000
+    prompt_tokens = [chars / 4 for chars in stub.prompt_chars] or [0.0]
+    return {
+        "tables": tables,
+        "setup_s": round(setup_seconds, 2),
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "throughput_rps": round(len(ok) / wall_seconds, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "model_ms": round(model_ms, 1),
+        "overhead_p50_ms": round(percentile(latencies, 50) - model_ms, 1),
+        "overhead_p99_ms": round(percentile(latencies, 99) - model_ms, 1),
+        "context_tables": round(statistics.mean(s["context_tables"] for s in ok), 1) if ok else 0,
+        "prompt_tokens_mean": round(statistics.mean(prompt_tokens)),
+        "prompt_tokens_max": round(max(prompt_tokens)),
+    }
+
+
+async def run(args: argparse.Namespace, workdir: Path, stub: LlmStub) -> list[dict[str, Any]]:
+    # Settings are read at import time, so the app is imported once the
+    # environment points at the mock model and a scratch metadata store
+    from src.main import app
+
+    results = []
+    async with app.router.lifespan_context(app):
+        for tables in args.tables:
+            results.append(await run_size(app, stub, workdir, tables, args))
+            print(f"  {tables} tables done", file=sys.stderr)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, nargs="+", default=[10, 1000, 20000],
+                        help="Catalog sizes (tables)")
+    parser.add_argument("--columns", type=int, default=8, help="Columns per table")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per catalog size")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--latency-ms", type=float, default=200.0,
+                        help="Mock model time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0,
+                        help="Mock model writing speed (0 answers at once)")
+    parser.add_argument("--max-overhead-p99-ms", type=float,
+                        help="Exit with status 1 if the p99 overhead exceeds this")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, LlmStub(
+        latency_seconds=args.latency_ms / 1000,
+        tokens_per_second=args.tokens_per_second or None,
+    ) as stub:
+        workdir = Path(tmp)
+        os.environ.update(
+            {
+                "DEEPSEEK_API_KEY": "bench",
+                "DEEPSEEK_BASE_URL": stub.base_url,
+                "DATABASE_SQLITE_PATH": str(workdir / "meta.db"),
+                "NL_ANSWER_CACHE_ENTRIES": "0",
+                "LLM_MAX_CONCURRENCY": str(args.concurrency),
+                "LLM_MAX_CONNECTIONS": str(args.concurrency),
+            }
+        )
+        results = asyncio.run(run(args, workdir, stub))
+
+    header = (
+        f"{'tables':>7} {'setup s':>8} {'req/s':>7} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'ovh p50':>8} {'ovh p99':>8} {'ctx tbl':>8} {'prompt tok':>11} {'errors':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['tables']:>7} {row['setup_s']:>8} {row['throughput_rps']:>7} "
+            f"{row['p50_ms']:>8} {row['p99_ms']:>8} {row['overhead_p50_ms']:>8} "
+            f"{row['overhead_p99_ms']:>8} {row['context_tables']:>8} "
+            f"{row['prompt_tokens_mean']:>11} {row['errors']:>7}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failed = [row for row in results if row["errors"]]
+    if args.max_overhead_p99_ms is not None:
+        failed += [row for row in results if row["overhead_p99_ms"] > args.max_overhead_p99_ms]
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
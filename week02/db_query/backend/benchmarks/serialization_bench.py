@@ -0,0 +1,128 @@
+"""Benchmark query result encoding: the response-model path vs direct encoders.
+
+Compares, for result pages of 1k/10k/100k cells:
+
+- ``model``: validating a ``QueryResultResponse`` and encoding it through
+  ``jsonable_encoder`` and ``JSONResponse`` (the previous endpoint path)
+- ``json``: ``FastJSONResponse`` (orjson when installed)
+- ``msgpack``: ``MsgPackResponse`` (when msgpack is installed)
+
+Usage:
+    python -m benchmarks.serialization_bench [--cells 1000 10000 100000] [--repeat 5] [--json out.json]
+"""
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.api import responses
+from src.api.responses import FastJSONResponse, MsgPackResponse
+from src.models.query import QueryResultResponse
+
+COLUMNS = [
+    "id", "email", "status", "balance", "created_at", "notes", "score", "active", "city", "tag",
+]
+
+
+def build_content(cells: int) -> dict[str, Any]:
+    """Build a query result body with roughly ``cells`` cells."""
+    rng = random.Random(42)
+    rows = [
+        {
+            "id": i,
+            "email": f"user{i}@example.com",
+            "status": rng.choice(["active", "inactive", "pending"]),
+            "balance": round(rng.uniform(0, 10000), 2),
+            "created_at": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00",
+            "notes": None if rng.random() < 0.5 else f"note {rng.randint(0, 99)}",
+            "score": rng.randint(0, 100),
+            "active": rng.random() < 0.5,
+            "city": rng.choice(["Berlin", "Lisbon", "Osaka", "Lima"]),
+            "tag": f"t{rng.randint(0, 9)}",
+        }
+        for i in range(max(1, cells // len(COLUMNS)))
+    ]
+    return {
+        "columns": [{"name": name, "type": "text"} for name in COLUMNS],
+        "rows": rows,
+        "rowCount": len(rows),
+        "truncated": False,
+        "nextCursor": None,
+    }
+
+
+def encode_model(content: dict[str, Any]) -> bytes:
+    model = QueryResultResponse.model_validate(content)
+    return JSONResponse(jsonable_encoder(model, by_alias=True)).body
+
+
+def encode_json(content: dict[str, Any]) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def encode_msgpack(content: dict[str, Any]) -> bytes:
+    return MsgPackResponse(content).body
+
+
+def measure(encode: Callable[[dict[str, Any]], bytes], content: dict[str, Any], repeat: int):
+    """Return (best wall time in ms, payload size) over ``repeat`` runs."""
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = encode(content)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    encoders: dict[str, Callable[[dict[str, Any]], bytes]] = {
+        "model": encode_model,
+        "json": encode_json,
+    }
+    if responses.msgpack is not None:
+        encoders["msgpack"] = encode_msgpack
+
+    results = []
+    for cells in args.cells:
+        content = build_content(cells)
+        baseline_ms = None
+        for name, encode in encoders.items():
+            elapsed_ms, size = measure(encode, content, args.repeat)
+            baseline_ms = baseline_ms or elapsed_ms
+            results.append({
+                "cells": cells,
+                "encoder": name,
+                "encode_ms": round(elapsed_ms, 3),
+                "bytes": size,
+                "speedup": round(baseline_ms / elapsed_ms, 1),
+            })
+
+    header = f"{'cells':>8} {'encoder':<8} {'encode ms':>10} {'bytes':>10} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['cells']:>8} {row['encoder']:<8} {row['encode_ms']:>10} "
+            f"{row['bytes']:>10} {row['speedup']:>7}x"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""Summary statistics shared by the benchmarks."""
+
+import math
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile: the smallest value at or above ``pct`` percent."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
@@ -1,20 +1,58 @@
 """Abstract base class and data classes for database adapters."""
 
+import re
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.engine import Connection
+
+from src.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from sqlglot import exp
+else:
+    exp = lazy_import("sqlglot.expressions")
+
+# Control characters other than tab, newline and carriage return
+_CONTROL_BYTES = re.compile(rb"[\x00-\x08\x0b\x0c\x0e-\x1f]")
 
 
 @dataclass
 class PoolConfig:
-    """Connection pool configuration for database engines."""
+    """Connection pool configuration for database engines.
+
+    ``pool_pre_ping`` tests every connection on checkout, at the cost of a
+    round trip. When it is off, ``liveness_interval_seconds`` can be set
+    instead to only test connections that have been idle for longer than the
+    interval.
+    """
 
     pool_size: int = 5
     max_overflow: int = 10
     pool_pre_ping: bool = True
     pool_recycle: int | None = None
+    pool_timeout: float = 30.0
+    pool_use_lifo: bool = False
+    liveness_interval_seconds: float | None = None
+
+    def to_engine_kwargs(self) -> dict[str, Any]:
+        """Build the pool keyword arguments for ``create_engine``."""
+        kwargs: dict[str, Any] = {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_pre_ping": self.pool_pre_ping,
+            "pool_timeout": self.pool_timeout,
+            "pool_use_lifo": self.pool_use_lifo,
+        }
+        # Only add pool_recycle if it has a valid value
+        if self.pool_recycle is not None:
+            kwargs["pool_recycle"] = self.pool_recycle
+        return kwargs
 
 
 @dataclass
@@ -37,6 +75,14 @@ class ColumnInfo:
     position: int = 0
 
 
+@dataclass
+class TableStatistics:
+    """Size estimates for a table, read from the database statistics."""
+
+    row_estimate: int | None = None
+    size_bytes: int | None = None
+
+
 class DatabaseAdapter(ABC):
     """Abstract base class for database-specific adapters.
 
@@ -138,6 +184,23 @@ class DatabaseAdapter(ABC):
             return "main"
         return None
 
+    def extract_table_statistics(
+        self, connection: Connection, schema_name: str | None
+    ) -> dict[str, TableStatistics]:
+        """Read row count and size estimates for all tables of a schema.
+
+        Estimates come from the catalog statistics the database maintains, so
+        no table is scanned. Tables without statistics are left out.
+
+        Args:
+            connection: SQLAlchemy connection to the database
+            schema_name: Schema to read (None for the default schema)
+
+        Returns:
+            Statistics keyed by table name
+        """
+        return {}
+
     # =====================
     # Data Type Methods
     # =====================
@@ -178,6 +241,158 @@ class DatabaseAdapter(ABC):
         """
         return ""
 
+    # =====================
+    # Execution Methods
+    # =====================
+
+    @contextmanager
+    def statement_timeout(self, connection: Connection, timeout_ms: int | None) -> Iterator[None]:
+        """Enforce a server-side statement timeout while the block runs.
+
+        The default implementation does nothing; adapters override this with
+        whatever mechanism their database supports.
+
+        The block may be re-entered on the same connection to read further
+        pages from a held server-side cursor, so implementations must not run
+        statements that conflict with an open streamed result.
+
+        Args:
+            connection: SQLAlchemy connection the statement will run on
+            timeout_ms: Timeout in milliseconds (None or 0 disables it)
+        """
+        yield
+
+    def add_statement_timeout_hint(self, sql: str, timeout_ms: int | None) -> str:
+        """Embed a statement timeout in the SQL text, for databases with hints.
+
+        Args:
+            sql: SELECT statement to execute
+            timeout_ms: Timeout in milliseconds (None or 0 disables it)
+
+        Returns:
+            The SQL statement, possibly with an optimizer hint added
+        """
+        return sql
+
+    def is_timeout_error(self, error: BaseException) -> bool:
+        """Check whether an exception was caused by a statement timeout.
+
+        Args:
+            error: Exception raised while executing or fetching a statement
+
+        Returns:
+            True if the database aborted the statement because of a timeout
+        """
+        return False
+
+    def replication_lag_seconds(self, connection: Connection) -> float | None:
+        """Measure how far a replica lags behind its primary.
+
+        Args:
+            connection: SQLAlchemy connection to the replica
+
+        Returns:
+            Lag in seconds, or None if the database can't report it
+        """
+        return None
+
+    def explain_cost(self, connection: Connection, sql: str) -> float | None:
+        """Estimate the cost of a query with the database's planner.
+
+        Args:
+            connection: SQLAlchemy connection to the database
+            sql: SELECT statement to plan (not executed)
+
+        Returns:
+            The planner's total cost estimate, in the database's own units,
+            or None if the database doesn't report one
+        """
+        return None
+
+    # =====================
+    # Sampling Methods
+    # =====================
+
+    @property
+    def supports_tablesample(self) -> bool:
+        """Whether tables can be sampled by page with ``TABLESAMPLE SYSTEM``.
+
+        Databases without it are sampled by primary key range.
+        """
+        return False
+
+    def estimate_row_count(
+        self, connection: Connection, schema_name: str | None, table_name: str
+    ) -> int | None:
+        """Estimate a table's row count from the database statistics.
+
+        Args:
+            connection: SQLAlchemy connection to the database
+            schema_name: Schema of the table (None for the default schema)
+            table_name: Table name
+
+        Returns:
+            Estimated number of rows, or None if no statistics are available
+        """
+        return None
+
+    # =====================
+    # Profiling Methods
+    # =====================
+
+    # Substrings of data types whose values can't be grouped or ordered
+    uncomparable_type_markers: tuple[str, ...] = (
+        "BLOB",
+        "BINARY",
+        "BYTEA",
+        "JSON",
+        "XML",
+        "ARRAY",
+        "[]",
+        "GEOMETRY",
+    )
+
+    def is_comparable_type(self, data_type: str) -> bool:
+        """Whether values of a column type can be grouped and ordered.
+
+        Column profiles only compute distinct counts, min/max and top values
+        for comparable columns.
+
+        Args:
+            data_type: Normalized data type from the cached metadata
+        """
+        type_upper = data_type.upper()
+        return not any(marker in type_upper for marker in self.uncomparable_type_markers)
+
+    def distinct_count_expression(
+        self, column: "exp.Expression"
+    ) -> "tuple[exp.Expression, bool]":
+        """Build the aggregate counting distinct values of a column.
+
+        The default is an exact ``COUNT(DISTINCT column)``; databases with an
+        approximate distinct aggregate can override this.
+
+        Args:
+            column: Column expression to count
+
+        Returns:
+            Tuple of (aggregate expression, whether the count is approximate)
+        """
+
+        return exp.Count(this=exp.Distinct(expressions=[column])), False
+
+    def byte_length_expression(self, column: "exp.Expression") -> "exp.Expression":
+        """Build an expression for the size of a value in bytes.
+
+        The default is the standard ``OCTET_LENGTH``, which counts bytes for
+        both binary and text columns.
+
+        Args:
+            column: Column expression to measure
+        """
+
+        return exp.Anonymous(this="OCTET_LENGTH", expressions=[column])
+
     # =====================
     # Serialization Methods
     # =====================
@@ -218,21 +433,7 @@ class DatabaseAdapter(ABC):
 
         # Handle bytes
         if isinstance(value, bytes):
-            try:
-                # Try to decode as UTF-8, but check for null bytes and non-printable chars
-                decoded = value.decode("utf-8")
-                # If there are null bytes or non-printable characters, use hex instead
-                if "\x00" in decoded:
-                    return value.hex()
-                # Check for non-printable characters safely
-                try:
-                    if any(ord(c) < 32 and c not in "\t\n\r" for c in decoded):
-                        return value.hex()
-                except (TypeError, ValueError):
-                    return value.hex()
-                return decoded
-            except UnicodeDecodeError:
-                return value.hex()
+            return self.serialize_bytes(value)
 
         # Handle memoryview
         if isinstance(value, memoryview):
@@ -247,3 +448,17 @@ class DatabaseAdapter(ABC):
             return str(value)
         except Exception:
             return repr(value)
+
+    def serialize_bytes(self, value: bytes) -> str:
+        """Serialize binary data as text if it is printable UTF-8, else as hex.
+
+        Control bytes are detected with a single regex scan over the raw bytes
+        (in UTF-8 they can only encode the matching control characters), so
+        binary values are never decoded just to be rejected.
+        """
+        if _CONTROL_BYTES.search(value):
+            return value.hex()
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return value.hex()
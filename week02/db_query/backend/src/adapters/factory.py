@@ -78,18 +78,9 @@ class AdapterFactory:
         # Full-featured engine with connection pooling
         pool_config = adapter.default_pool_config
 
-        # Build engine kwargs, only include pool_recycle if not None
-        engine_kwargs = {
-            "poolclass": QueuePool,
-            "pool_size": pool_config.pool_size,
-            "max_overflow": pool_config.max_overflow,
-            "pool_pre_ping": pool_config.pool_pre_ping,
-        }
-        # Only add pool_recycle if it has a valid value
-        if pool_config.pool_recycle is not None:
-            engine_kwargs["pool_recycle"] = pool_config.pool_recycle
-
-        return create_engine(normalized_url, **engine_kwargs)
+        return create_engine(
+            normalized_url, poolclass=QueuePool, **pool_config.to_engine_kwargs()
+        )
 
     @staticmethod
     def test_connection(name: str, connection_url: str) -> bool:
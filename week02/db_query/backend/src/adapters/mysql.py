@@ -1,12 +1,22 @@
 """MySQL database adapter."""
 
+import json
+import re
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 from typing import Any
 
-from src.adapters.base import ColumnInfo, DatabaseAdapter, PoolConfig, SchemaInfo
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.adapters.base import ColumnInfo, DatabaseAdapter, PoolConfig, SchemaInfo, TableStatistics
 from src.adapters.factory import adapter_factory
 
+# ER_QUERY_TIMEOUT (max_execution_time exceeded) and ER_QUERY_INTERRUPTED
+QUERY_TIMEOUT_ERROR_CODES = {3024, 1317}
+
+_SELECT_KEYWORD = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+
 
 class MySQLAdapter(DatabaseAdapter):
     """Adapter for MySQL databases."""
@@ -55,6 +65,27 @@ class MySQLAdapter(DatabaseAdapter):
         """MySQL uses database name as schema."""
         return None  # Will be determined from connection URL
 
+    def extract_table_statistics(
+        self, connection: Connection, schema_name: str | None
+    ) -> dict[str, TableStatistics]:
+        """Read ``information_schema.TABLES`` (InnoDB row counts are estimates)."""
+        rows = connection.execute(
+            text(
+                "SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH + INDEX_LENGTH "
+                "FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE()) "
+                "AND TABLE_TYPE = 'BASE TABLE'"
+            ),
+            {"schema": schema_name},
+        )
+        return {
+            name: TableStatistics(
+                row_estimate=int(table_rows) if table_rows is not None else None,
+                size_bytes=int(size_bytes) if size_bytes is not None else None,
+            )
+            for name, table_rows, size_bytes in rows
+        }
+
     def normalize_data_type(self, raw_type: str) -> str:
         """Normalize MySQL-specific data types for consistent display."""
         type_mappings = {
@@ -103,6 +134,43 @@ class MySQLAdapter(DatabaseAdapter):
         # Handle MySQL function defaults like CURRENT_TIMESTAMP
         return str(default_value).strip()
 
+    def add_statement_timeout_hint(self, sql: str, timeout_ms: int | None) -> str:
+        """Add a ``MAX_EXECUTION_TIME`` optimizer hint to the SELECT.
+
+        The hint is scoped to the statement, so no session state has to be
+        set or reset on the pooled connection (which isn't possible while a
+        streamed result is still open).
+        """
+        if not timeout_ms:
+            return sql
+        return _SELECT_KEYWORD.sub(
+            f"SELECT /*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */", sql, count=1
+        )
+
+    def is_timeout_error(self, error: BaseException) -> bool:
+        """MySQL reports timed-out statements with error 3024 (or 1317)."""
+        orig = getattr(error, "orig", error)
+        args: tuple[Any, ...] = getattr(orig, "args", ())
+        return bool(args) and args[0] in QUERY_TIMEOUT_ERROR_CODES
+
+    def replication_lag_seconds(self, connection: Connection) -> float | None:
+        """Seconds behind the source from the replica status (0 on a primary)."""
+        try:
+            row = connection.exec_driver_sql("SHOW REPLICA STATUS").mappings().first()
+        except Exception:
+            # MySQL before 8.0.22 only knows the old statement name
+            row = connection.exec_driver_sql("SHOW SLAVE STATUS").mappings().first()
+        if row is None:
+            return 0.0
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return float(lag) if lag is not None else None
+
+    def explain_cost(self, connection: Connection, sql: str) -> float | None:
+        """Read ``query_cost`` from ``EXPLAIN FORMAT=JSON``."""
+        plan = json.loads(connection.execute(text(f"EXPLAIN FORMAT=JSON {sql}")).scalar_one())
+        cost = plan.get("query_block", {}).get("cost_info", {}).get("query_cost")
+        return float(cost) if cost is not None else None
+
     def get_nl_system_prompt(self) -> str:
         """Return MySQL-specific rules for natural language SQL generation."""
         return """
@@ -150,18 +218,7 @@ MySQL-specific rules:
 
         # Handle bytes (MySQL BLOB, BINARY, VARBINARY)
         if isinstance(value, bytes):
-            try:
-                decoded = value.decode("utf-8")
-                if "\x00" in decoded:
-                    return value.hex()
-                try:
-                    if any(ord(c) < 32 and c not in "\t\n\r" for c in decoded):
-                        return value.hex()
-                except (TypeError, ValueError):
-                    return value.hex()
-                return decoded
-            except UnicodeDecodeError:
-                return value.hex()
+            return self.serialize_bytes(value)
 
         # Handle memoryview
         if isinstance(value, memoryview):
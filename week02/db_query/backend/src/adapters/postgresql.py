@@ -1,6 +1,16 @@
 """PostgreSQL database adapter."""
 
-from src.adapters.base import DatabaseAdapter, PoolConfig, SchemaInfo
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.adapters.base import DatabaseAdapter, PoolConfig, SchemaInfo, TableStatistics
+
+# SQLSTATE raised when a statement is cancelled by statement_timeout
+QUERY_CANCELED_SQLSTATE = "57014"
 
 
 class PostgreSQLAdapter(DatabaseAdapter):
@@ -18,6 +28,16 @@ class PostgreSQLAdapter(DatabaseAdapter):
     def sqlglot_dialect(self) -> str:
         return "postgres"
 
+    # No MIN/MAX for booleans and UUIDs; geometric types have no equality
+    uncomparable_type_markers = DatabaseAdapter.uncomparable_type_markers + (
+        "BOOLEAN",
+        "UUID",
+        "TSVECTOR",
+        "POINT",
+        "POLYGON",
+        "CIRCLE",
+    )
+
     @property
     def default_pool_config(self) -> PoolConfig:
         return PoolConfig(
@@ -49,6 +69,27 @@ class PostgreSQLAdapter(DatabaseAdapter):
         """PostgreSQL uses 'public' as the default schema."""
         return "public"
 
+    def extract_table_statistics(
+        self, connection: Connection, schema_name: str | None
+    ) -> dict[str, TableStatistics]:
+        """Read ``pg_class.reltuples`` and the total relation size (with indexes)."""
+        rows = connection.execute(
+            text(
+                "SELECT c.relname, c.reltuples, pg_total_relation_size(c.oid) "
+                "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = :schema AND c.relkind IN ('r', 'p', 'm')"
+            ),
+            {"schema": schema_name or self.get_default_schema()},
+        )
+        return {
+            name: TableStatistics(
+                # reltuples is -1 until the table is first analyzed
+                row_estimate=int(reltuples) if reltuples is not None and reltuples >= 0 else None,
+                size_bytes=size_bytes,
+            )
+            for name, reltuples, size_bytes in rows
+        }
+
     def normalize_data_type(self, raw_type: str) -> str:
         """Normalize PostgreSQL-specific data types."""
         type_mappings = {
@@ -75,6 +116,58 @@ class PostgreSQLAdapter(DatabaseAdapter):
         # Handle PostgreSQL function defaults like now(), nextval(), etc.
         return str(default_value).strip()
 
+    @contextmanager
+    def statement_timeout(self, connection: Connection, timeout_ms: int | None) -> Iterator[None]:
+        """Apply ``SET LOCAL statement_timeout`` for the current transaction.
+
+        SET LOCAL is scoped to the transaction, so the setting is discarded
+        when the connection is rolled back on return to the pool.
+        """
+        if timeout_ms:
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+        yield
+
+    def is_timeout_error(self, error: BaseException) -> bool:
+        """PostgreSQL reports cancelled statements with SQLSTATE 57014."""
+        orig = getattr(error, "orig", error)
+        return getattr(orig, "pgcode", None) == QUERY_CANCELED_SQLSTATE
+
+    def replication_lag_seconds(self, connection: Connection) -> float | None:
+        """Time since the last replayed transaction (0 on a primary)."""
+        lag = connection.exec_driver_sql(
+            "SELECT CASE WHEN pg_is_in_recovery() "
+            "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+            "ELSE 0 END"
+        ).scalar()
+        return float(lag) if lag is not None else None
+
+    def explain_cost(self, connection: Connection, sql: str) -> float | None:
+        """Read the top plan node's ``Total Cost`` from ``EXPLAIN (FORMAT JSON)``."""
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return float(plan[0]["Plan"]["Total Cost"])
+
+    @property
+    def supports_tablesample(self) -> bool:
+        return True
+
+    def estimate_row_count(
+        self, connection: Connection, schema_name: str | None, table_name: str
+    ) -> int | None:
+        """Read ``pg_class.reltuples`` (-1 until the table is first analyzed)."""
+        reltuples = connection.execute(
+            text(
+                "SELECT c.reltuples FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = :schema AND c.relname = :table"
+            ),
+            {"schema": schema_name or self.get_default_schema(), "table": table_name},
+        ).scalar()
+        if reltuples is None or reltuples < 0:
+            return None
+        return int(reltuples)
+
     def get_nl_system_prompt(self) -> str:
         """Return PostgreSQL-specific rules for natural language SQL generation."""
         return """
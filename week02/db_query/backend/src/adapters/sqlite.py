@@ -1,8 +1,24 @@
 """SQLite database adapter."""
 
-from datetime import date, datetime, time
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, cast
 
-from src.adapters.base import DatabaseAdapter, PoolConfig, SchemaInfo
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.adapters.base import DatabaseAdapter, PoolConfig, SchemaInfo, TableStatistics
+from src.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from sqlglot import exp
+else:
+    exp = lazy_import("sqlglot.expressions")
+
+# Number of SQLite VM instructions between progress handler calls
+PROGRESS_HANDLER_INTERVAL = 1000
 
 
 class SQLiteAdapter(DatabaseAdapter):
@@ -41,6 +57,36 @@ class SQLiteAdapter(DatabaseAdapter):
         """SQLite uses 'main' as the default schema."""
         return "main"
 
+    def extract_table_statistics(
+        self, connection: Connection, schema_name: str | None
+    ) -> dict[str, TableStatistics]:
+        """Read row counts from ``sqlite_stat1`` and sizes from ``dbstat``.
+
+        ``sqlite_stat1`` only exists once ANALYZE has run, and ``dbstat`` needs
+        SQLite built with SQLITE_ENABLE_DBSTAT_VTAB; either may be missing.
+        """
+        statistics: dict[str, TableStatistics] = {}
+        try:
+            # The first number of each stat entry is the table's row count
+            for table_name, stat in connection.execute(text("SELECT tbl, stat FROM sqlite_stat1")):
+                row_estimate = int(stat.split()[0])
+                entry = statistics.setdefault(table_name, TableStatistics())
+                entry.row_estimate = max(entry.row_estimate or 0, row_estimate)
+        except Exception:
+            pass
+        try:
+            # Pages of the table and its indexes
+            for table_name, size_bytes in connection.execute(
+                text(
+                    "SELECT m.tbl_name, SUM(d.pgsize) FROM dbstat d "
+                    "JOIN sqlite_master m ON m.name = d.name GROUP BY m.tbl_name"
+                )
+            ):
+                statistics.setdefault(table_name, TableStatistics()).size_bytes = size_bytes
+        except Exception:
+            pass
+        return statistics
+
     def normalize_data_type(self, raw_type: str) -> str:
         """Normalize SQLite data types using type affinity rules.
 
@@ -73,6 +119,39 @@ class SQLiteAdapter(DatabaseAdapter):
             return None
         return str(default_value).strip()
 
+    @contextmanager
+    def statement_timeout(self, connection: Connection, timeout_ms: int | None) -> Iterator[None]:
+        """Abort long-running statements with a progress handler.
+
+        SQLite has no server-side timeout, so a progress handler checks a
+        deadline every few VM instructions and interrupts the statement once
+        it has passed.
+        """
+        if not timeout_ms:
+            yield
+            return
+
+        dbapi_conn = cast(sqlite3.Connection, connection.connection.driver_connection)
+        deadline = time.monotonic() + timeout_ms / 1000
+
+        def _abort_after_deadline() -> int:
+            return 1 if time.monotonic() > deadline else 0
+
+        dbapi_conn.set_progress_handler(_abort_after_deadline, PROGRESS_HANDLER_INTERVAL)
+        try:
+            yield
+        finally:
+            dbapi_conn.set_progress_handler(None, 0)
+
+    def is_timeout_error(self, error: BaseException) -> bool:
+        """An aborted progress handler surfaces as ``OperationalError: interrupted``."""
+        orig = getattr(error, "orig", error)
+        return isinstance(orig, sqlite3.OperationalError) and "interrupted" in str(orig)
+
+    def byte_length_expression(self, column: "exp.Expression") -> "exp.Expression":
+        # LENGTH counts characters for text; measured as a blob it counts bytes
+        return exp.Length(this=exp.cast(column, "BLOB"))
+
     def get_nl_system_prompt(self) -> str:
         """Return SQLite-specific rules for natural language SQL generation."""
         return """
@@ -1,31 +1,54 @@
+from dataclasses import asdict
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
+from src.db.models import ColumnMetadata, DatabaseConnection, TableMetadata
+from src.config import settings
 from src.db.repository import (
     ColumnMetadataRepository,
     ConnectionRepository,
     TableMetadataRepository,
     get_db,
 )
+from src.middleware.compression import available_codecs, negotiate
 from src.models.database import (
+    CircuitBreakerResponse,
     DatabaseConnectionCreate,
     DatabaseConnectionListResponse,
     DatabaseConnectionResponse,
+    EndpointPoolStatsResponse,
+    PoolSettings,
+    PoolStatusResponse,
+    ReplicaStatusResponse,
     mask_connection_url,
 )
 from src.models.metadata import (
     ColumnMetadataResponse,
     DatabaseDetailResponse,
+    ForeignKeyResponse,
+    IndexResponse,
     TableMetadataResponse,
     TableType,
 )
+from src.services.answer_cache import answer_cache
+from src.services.catalog_cache import CatalogTables, catalog_body_cache
 from src.services.connection import ConnectionManager
 from src.services.metadata import MetadataService
+from src.services.nl_query import NlQueryService
+from src.services.pool import engine_pool
+from src.services.preview import preview_cache
+from src.services.result_buffer import encode_json
+from src.services.schema_context import schema_catalog_cache
 
 router = APIRouter(tags=["databases"])
 
+# Catalog bodies are compressed here, before the compression middleware, so
+# the compressed body can be cached by catalog version
+_catalog_codecs = available_codecs()
+
 
 def get_connection_repo(
     db: Annotated[Session, Depends(get_db)]
@@ -45,7 +68,9 @@ def get_column_repo(
     return ColumnMetadataRepository(db)
 
 
-def _build_table_responses(tables: list, column_repo: ColumnMetadataRepository) -> list[TableMetadataResponse]:
+def _build_table_responses(
+    tables: list[TableMetadata], columns_by_table: dict[int, list[ColumnMetadata]]
+) -> list[TableMetadataResponse]:
     # Deduplicate tables by (schema_name, table_name) to handle any duplicate data
     seen_tables: set[tuple[str, str]] = set()
     responses = []
@@ -56,7 +81,7 @@ def _build_table_responses(tables: list, column_repo: ColumnMetadataRepository)
             continue
         seen_tables.add(table_key)
 
-        columns = column_repo.get_by_table(table.id)
+        columns = columns_by_table.get(table.id, [])
 
         # Deduplicate columns by (column_name, position) to handle any duplicate data
         seen_columns: set[tuple[str, int]] = set()
@@ -83,12 +108,119 @@ def _build_table_responses(tables: list, column_repo: ColumnMetadataRepository)
                 schema_name=table.schema_name,
                 table_name=table.table_name,
                 table_type=TableType(table.table_type),
+                row_estimate=table.row_estimate,
+                size_bytes=table.size_bytes,
                 columns=column_responses,
+                foreign_keys=[
+                    ForeignKeyResponse.model_validate(fk) for fk in table.foreign_keys
+                ],
+                indexes=[IndexResponse.model_validate(index) for index in table.indexes],
             )
         )
     return responses
 
 
+def _build_circuit_response(name: str, connection_url: str) -> CircuitBreakerResponse:
+    breaker = ConnectionManager.get_breaker(name, connection_url)
+    return CircuitBreakerResponse(
+        state=breaker.state,
+        consecutive_failures=breaker.consecutive_failures,
+        retry_after_seconds=breaker.retry_after_seconds(),
+    )
+
+
+def _active_connections(name: str, connection_url: str) -> int:
+    # Look the engine up without creating it so listing never opens a pool
+    engine = ConnectionManager.find_engine(name, connection_url)
+    return engine_pool(engine).checkedout() if engine is not None else 0
+
+
+def _build_replica_responses(name: str) -> list[ReplicaStatusResponse]:
+    return [
+        ReplicaStatusResponse(
+            url=mask_connection_url(replica.url),
+            healthy=replica.healthy,
+            lag_seconds=replica.lag_seconds,
+            active_connections=_active_connections(name, replica.url),
+            last_error=replica.last_error,
+            circuit=_build_circuit_response(name, replica.url),
+        )
+        for replica in ConnectionManager.get_replicas(name)
+    ]
+
+
+def _catalog_tables(
+    conn: DatabaseConnection,
+    table_repo: TableMetadataRepository,
+    column_repo: ColumnMetadataRepository,
+) -> CatalogTables:
+    tables = catalog_body_cache.get_tables(conn.name, conn.catalog_version)
+    if tables is not None:
+        return tables
+
+    table_rows = table_repo.get_by_database_with_keys(conn.name)
+    table_responses = _build_table_responses(table_rows, column_repo.get_by_database(conn.name))
+    tables = CatalogTables(
+        body=encode_json([table.model_dump(mode="json", by_alias=True) for table in table_responses]),
+        table_count=sum(1 for t in table_rows if t.table_type == "table"),
+        view_count=sum(1 for t in table_rows if t.table_type == "view"),
+    )
+    catalog_body_cache.put_tables(conn.name, conn.catalog_version, tables)
+    return tables
+
+
+def _render_catalog(
+    request: Request,
+    conn: DatabaseConnection,
+    table_repo: TableMetadataRepository,
+    column_repo: ColumnMetadataRepository,
+) -> Response:
+    """Render a DatabaseDetailResponse body, compressed and cached per catalog version.
+
+    Only the connection and status fields are rebuilt on every request; they
+    are part of the cache key, so a change in replica health or circuit state
+    is never served stale.
+    """
+    tables = _catalog_tables(conn, table_repo, column_repo)
+    header = encode_json(
+        DatabaseDetailResponse(
+            name=conn.name,
+            connection_url=mask_connection_url(conn.connection_url),
+            created_at=conn.created_at.isoformat(),
+            updated_at=conn.updated_at.isoformat(),
+            statement_timeout_ms=conn.statement_timeout_ms,
+            max_replica_lag_seconds=conn.max_replica_lag_seconds,
+            replicas=_build_replica_responses(conn.name),
+            circuit=_build_circuit_response(conn.name, conn.connection_url),
+            table_count=tables.table_count,
+            view_count=tables.view_count,
+            tables=[],
+        ).model_dump(mode="json", by_alias=True, exclude={"tables"})
+    )
+
+    codec = negotiate(request.headers.get("accept-encoding", ""), _catalog_codecs)
+    key = (conn.name, conn.catalog_version, codec.name if codec else "identity", header)
+    if codec is not None:
+        compressed = catalog_body_cache.get_body(key)
+        if compressed is not None:
+            return _compressed_catalog(compressed, codec.name)
+
+    body = header[:-1] + b',"tables":' + tables.body + b"}"
+    if codec is None or len(body) < settings.compression_min_bytes:
+        return Response(body, media_type="application/json")
+    compressed = codec.compress(body)
+    catalog_body_cache.put_body(key, compressed)
+    return _compressed_catalog(compressed, codec.name)
+
+
+def _compressed_catalog(body: bytes, encoding: str) -> Response:
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+    )
+
+
 @router.get("/dbs", response_model=DatabaseConnectionListResponse)
 async def list_databases(
     repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
@@ -106,6 +238,10 @@ async def list_databases(
                 connection_url=mask_connection_url(conn.connection_url),
                 created_at=conn.created_at,
                 updated_at=conn.updated_at,
+                statement_timeout_ms=conn.statement_timeout_ms,
+                max_replica_lag_seconds=conn.max_replica_lag_seconds,
+                replicas=_build_replica_responses(conn.name),
+                circuit=_build_circuit_response(conn.name, conn.connection_url),
                 table_count=table_count,
                 view_count=view_count,
             )
@@ -136,8 +272,24 @@ async def add_database(
         )
 
     ConnectionManager.test_connection(name, request.url)
+    for replica_url in request.replica_urls:
+        ConnectionManager.test_connection(name, replica_url)
 
-    conn = repo.create(name=name, connection_url=request.url)
+    pool_settings = request.pool.model_dump(exclude_none=True) if request.pool else None
+    conn = repo.create(
+        name=name,
+        connection_url=request.url,
+        statement_timeout_ms=request.statement_timeout_ms,
+        replica_urls=request.replica_urls,
+        max_replica_lag_seconds=request.max_replica_lag_seconds,
+        pool_settings=pool_settings,
+    )
+    ConnectionManager.configure_pool(name, pool_settings)
+    ConnectionManager.configure_replicas(
+        name, request.replica_urls, request.max_replica_lag_seconds
+    )
+
+    # Catalog extraction always reads from the primary
 
     table_count, view_count = MetadataService.extract_metadata(
         db_name=name,
@@ -147,13 +299,26 @@ async def add_database(
     )
 
     repo.update_timestamp(name)
+    repo.bump_catalog_version(name)
 
     conn = repo.get(name)
+    # Build the natural language schema context now rather than on the first question
+    NlQueryService.get_catalog(
+        db_name=name,
+        connection_url=conn.connection_url,
+        catalog_version=conn.catalog_version,
+        table_repo=table_repo,
+        column_repo=column_repo,
+    )
     return DatabaseConnectionResponse(
         name=conn.name,
         connection_url=mask_connection_url(conn.connection_url),
         created_at=conn.created_at,
         updated_at=conn.updated_at,
+        statement_timeout_ms=conn.statement_timeout_ms,
+        max_replica_lag_seconds=conn.max_replica_lag_seconds,
+        replicas=_build_replica_responses(conn.name),
+        circuit=_build_circuit_response(conn.name, conn.connection_url),
         table_count=table_count,
         view_count=view_count,
     )
@@ -162,10 +327,11 @@ async def add_database(
 @router.get("/dbs/{name}", response_model=DatabaseDetailResponse)
 async def get_database(
     name: str,
+    request: Request,
     repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
     table_repo: Annotated[TableMetadataRepository, Depends(get_table_repo)],
     column_repo: Annotated[ColumnMetadataRepository, Depends(get_column_repo)],
-):
+) -> Response:
     conn = repo.get(name)
     if not conn:
         raise HTTPException(
@@ -176,30 +342,17 @@ async def get_database(
             },
         )
 
-    tables = table_repo.get_by_database(name)
-    table_responses = _build_table_responses(tables, column_repo)
-    
-    table_count = sum(1 for t in tables if t.table_type == "table")
-    view_count = sum(1 for t in tables if t.table_type == "view")
-
-    return DatabaseDetailResponse(
-        name=conn.name,
-        connection_url=mask_connection_url(conn.connection_url),
-        created_at=conn.created_at.isoformat(),
-        updated_at=conn.updated_at.isoformat(),
-        table_count=table_count,
-        view_count=view_count,
-        tables=table_responses,
-    )
+    return _render_catalog(request, conn, table_repo, column_repo)
 
 
 @router.post("/dbs/{name}/refresh", response_model=DatabaseDetailResponse)
 async def refresh_database(
     name: str,
+    request: Request,
     repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
     table_repo: Annotated[TableMetadataRepository, Depends(get_table_repo)],
     column_repo: Annotated[ColumnMetadataRepository, Depends(get_column_repo)],
-):
+) -> Response:
     conn = repo.get(name)
     if not conn:
         raise HTTPException(
@@ -211,8 +364,10 @@ async def refresh_database(
         )
 
     ConnectionManager.test_connection(name, conn.connection_url)
+    schema_catalog_cache.invalidate(name)
+    catalog_body_cache.invalidate(name)
 
-    table_count, view_count = MetadataService.extract_metadata(
+    MetadataService.extract_metadata(
         db_name=name,
         connection_url=conn.connection_url,
         table_repo=table_repo,
@@ -220,20 +375,17 @@ async def refresh_database(
     )
 
     repo.update_timestamp(name)
-
-    conn = repo.get(name)
-    tables = table_repo.get_by_database(name)
-    table_responses = _build_table_responses(tables, column_repo)
-
-    return DatabaseDetailResponse(
-        name=conn.name,
-        connection_url=mask_connection_url(conn.connection_url),
-        created_at=conn.created_at.isoformat(),
-        updated_at=conn.updated_at.isoformat(),
-        table_count=table_count,
-        view_count=view_count,
-        tables=table_responses,
+    repo.bump_catalog_version(name)
+    # Build the natural language schema context now rather than on the first question
+    NlQueryService.get_catalog(
+        db_name=name,
+        connection_url=conn.connection_url,
+        catalog_version=conn.catalog_version,
+        table_repo=table_repo,
+        column_repo=column_repo,
     )
+    # Serialize and cache the new catalog for the GETs that follow
+    return _render_catalog(request, conn, table_repo, column_repo)
 
 
 @router.delete("/dbs/{name}", status_code=status.HTTP_204_NO_CONTENT)
@@ -252,5 +404,75 @@ async def delete_database(
         )
 
     ConnectionManager.remove_engine(name, conn.connection_url)
+    ConnectionManager.remove_replicas(name)
+    ConnectionManager.configure_pool(name, None)
+    preview_cache.invalidate(name)
+    schema_catalog_cache.invalidate(name)
+    answer_cache.invalidate(name)
+    catalog_body_cache.invalidate(name)
     repo.delete(name)
     return None
+
+
+def _build_pool_status(conn: DatabaseConnection) -> PoolStatusResponse:
+    endpoints = [("primary", conn.connection_url)]
+    endpoints.extend(("replica", url) for url in conn.replica_urls or [])
+    return PoolStatusResponse(
+        name=conn.name,
+        settings=PoolSettings(
+            **asdict(ConnectionManager.get_pool_config(conn.name, conn.connection_url))
+        ),
+        overrides=PoolSettings(**(conn.pool_settings or {})),
+        endpoints=[
+            EndpointPoolStatsResponse(
+                url=mask_connection_url(url),
+                role=role,
+                **ConnectionManager.get_pool_stats(conn.name, url),
+            )
+            for role, url in endpoints
+        ],
+    )
+
+
+@router.get("/dbs/{name}/pool", response_model=PoolStatusResponse)
+async def get_pool(
+    name: str,
+    repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+) -> PoolStatusResponse:
+    conn = repo.get(name)
+    if not conn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "CONNECTION_NOT_FOUND",
+                "message": f"Database connection '{name}' not found",
+            },
+        )
+    return _build_pool_status(conn)
+
+
+@router.put("/dbs/{name}/pool", response_model=PoolStatusResponse)
+async def update_pool(
+    name: str,
+    request: PoolSettings,
+    repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+) -> PoolStatusResponse:
+    """Replace a connection's pool settings and rebuild its pools.
+
+    Unset fields fall back to the adapter defaults. Idle connections of the
+    old pools are closed; queries in flight finish on their connections.
+    """
+    conn = repo.get(name)
+    if not conn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "CONNECTION_NOT_FOUND",
+                "message": f"Database connection '{name}' not found",
+            },
+        )
+
+    pool_settings = request.model_dump(exclude_none=True)
+    repo.update_pool_settings(name, pool_settings)
+    ConnectionManager.configure_pool(name, pool_settings)
+    return _build_pool_status(conn)
@@ -0,0 +1,53 @@
+from dataclasses import asdict
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import FileResponse
+
+from src.models.errors import ProfileForbiddenError, ProfileNotFoundError
+from src.models.profiling import ProfileListResponse, ProfileResponse
+from src.services.request_profiler import check_token, request_profiler
+
+router = APIRouter(tags=["profiles"])
+
+
+def require_profile_token(x_profile_token: Annotated[str | None, Header()] = None) -> None:
+    if not check_token(x_profile_token):
+        raise ProfileForbiddenError()
+
+
+@router.get(
+    "/profiles",
+    response_model=ProfileListResponse,
+    dependencies=[Depends(require_profile_token)],
+)
+async def list_profiles() -> ProfileListResponse:
+    """List saved request profiles, newest first."""
+    return ProfileListResponse(
+        data=[ProfileResponse(**asdict(record)) for record in request_profiler.records()]
+    )
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_model=ProfileResponse,
+    dependencies=[Depends(require_profile_token)],
+)
+async def get_profile(profile_id: str) -> ProfileResponse:
+    record = request_profiler.get(profile_id)
+    if record is None:
+        raise ProfileNotFoundError(profile_id)
+    return ProfileResponse(**asdict(record))
+
+
+@router.get(
+    "/profiles/{profile_id}/files/{filename}",
+    dependencies=[Depends(require_profile_token)],
+)
+async def download_profile_file(profile_id: str, filename: str) -> FileResponse:
+    """Download a profile's ``.pstats`` file or text report."""
+    path = request_profiler.file_path(profile_id, filename)
+    if path is None:
+        raise ProfileNotFoundError(profile_id)
+    media_type = "text/plain" if path.suffix == ".txt" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=filename)
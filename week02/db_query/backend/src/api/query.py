@@ -1,26 +1,52 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
 import traceback
-from typing import Annotated
+from collections.abc import AsyncIterator
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
+from src.api.responses import (
+    MSGPACK_MEDIA_TYPE,
+    render_query_result,
+    sse_event,
+    stream_blob,
+    stream_events,
+    stream_with_result,
+)
+from src.db.models import DatabaseConnection
 from src.db.repository import (
     ColumnMetadataRepository,
     ConnectionRepository,
     TableMetadataRepository,
     get_db,
 )
+from src.models.errors import AppException, SqlValidationError
 from src.models.query import (
-    ColumnInfo,
+    AskRequest,
+    AskResponse,
     GeneratedQueryResponse,
     NaturalLanguageRequest,
+    NlAnswerCacheStatsResponse,
+    QueryCursorRequest,
     QueryRequest,
     QueryResultResponse,
 )
+from src.services.answer_cache import answer_cache
+from src.services.ask import AskService
+from src.services.blob import BlobService, sniff_content_type
 from src.services.nl_query import NlQueryService
-from src.services.query import QueryService
+from src.services.pagination import KeyLookup, TableKeyInfo
+from src.services.partial_json import JsonFieldStream
+from src.services.query import QueryResult, QueryService
+from src.services.request_profiler import profiled_to_thread
 
 router = APIRouter(tags=["query"])
+logger = logging.getLogger(__name__)
 
 
 def get_connection_repo(
@@ -41,14 +67,51 @@ def get_column_repo(
     return ColumnMetadataRepository(db)
 
 
+def _make_key_lookup(
+    db_name: str,
+    table_repo: TableMetadataRepository,
+    column_repo: ColumnMetadataRepository,
+) -> KeyLookup:
+    """Build a key lookup over the cached metadata for keyset pagination."""
+
+    def lookup(schema_name: str | None, table_name: str) -> TableKeyInfo | None:
+        table = table_repo.get_by_name(db_name, table_name, schema_name)
+        if table is None:
+            return None
+        columns = column_repo.get_by_table(table.id)
+        return TableKeyInfo(
+            primary_key=[col.column_name for col in columns if col.is_primary_key],
+            not_null={col.column_name for col in columns if not col.is_nullable},
+        )
+
+    return lookup
+
+
+# Query results are encoded directly; the response model only documents the shape
+_QUERY_RESULT_RESPONSES: dict[int | str, dict[str, Any]] = {200: {"content": {MSGPACK_MEDIA_TYPE: {}}}}
+
+
+def _build_query_response(
+    result: QueryResult, background_tasks: BackgroundTasks, accept: str | None
+) -> Response:
+    # Release the result's memory budget and spill file once the response is sent
+    background_tasks.add_task(result.close)
+    return render_query_result(result, accept)
+
+
 @router.post(
     "/dbs/{name}/query",
     response_model=QueryResultResponse,
+    responses=_QUERY_RESULT_RESPONSES,
 )
 async def execute_query(
     name: str,
     request: QueryRequest,
+    background_tasks: BackgroundTasks,
     repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+    table_repo: Annotated[TableMetadataRepository, Depends(get_table_repo)],
+    column_repo: Annotated[ColumnMetadataRepository, Depends(get_column_repo)],
+    accept: Annotated[str | None, Header()] = None,
 ):
     conn = repo.get(name)
     if not conn:
@@ -61,24 +124,21 @@ async def execute_query(
         )
 
     try:
-        rows, columns, truncated = QueryService.execute_query(
+        result = QueryService.execute_query(
             db_name=name,
             connection_url=conn.connection_url,
             sql=request.sql,
+            statement_timeout_ms=conn.statement_timeout_ms,
+            page_size=request.page_size,
+            key_lookup=_make_key_lookup(name, table_repo, column_repo),
+            lazy_blobs=request.lazy_blobs,
         )
 
-        column_infos = [
-            ColumnInfo(name=col[0], type=col[1])
-            for col in columns
-        ]
-
-        return QueryResultResponse(
-            columns=column_infos,
-            rows=rows,
-            row_count=len(rows),
-            truncated=truncated,
-        )
+        return _build_query_response(result, background_tasks, accept)
 
+    except AppException:
+        # Structured errors (e.g. QUERY_TIMEOUT) are rendered by the app handler
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -100,6 +160,144 @@ async def execute_query(
         )
 
 
+@router.post(
+    "/dbs/{name}/query/next",
+    response_model=QueryResultResponse,
+    responses=_QUERY_RESULT_RESPONSES,
+)
+async def fetch_next_page(
+    name: str,
+    request: QueryCursorRequest,
+    background_tasks: BackgroundTasks,
+    repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+    accept: Annotated[str | None, Header()] = None,
+) -> Response:
+    conn = repo.get(name)
+    if not conn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "CONNECTION_NOT_FOUND",
+                "message": f"Database connection '{name}' not found",
+            },
+        )
+
+    try:
+        # Reading the next page blocks on the cursor; keep it off the event loop
+        result = await profiled_to_thread(
+            QueryService.fetch_next_page,
+            db_name=name,
+            connection_url=conn.connection_url,
+            cursor=request.cursor,
+            statement_timeout_ms=conn.statement_timeout_ms,
+        )
+        return _build_query_response(result, background_tasks, accept)
+
+    except AppException:
+        raise
+    except Exception as e:
+        logger.exception("Fetching the next page of a query on '%s' failed", name)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "QUERY_EXECUTION_ERROR",
+                "message": f"Failed to execute query: {str(e)}",
+            },
+        )
+
+
+@router.get("/dbs/{name}/blob")
+async def fetch_blob(
+    name: str,
+    table: str,
+    column: str,
+    key: str,
+    repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+    table_repo: Annotated[TableMetadataRepository, Depends(get_table_repo)],
+    column_repo: Annotated[ColumnMetadataRepository, Depends(get_column_repo)],
+    schema: str | None = None,
+) -> Response:
+    """Stream one full column value, identified by primary key.
+
+    ``key`` is a JSON object mapping every primary key column to its value,
+    e.g. ``{"id": 42}``. Values larger than ``blob_fetch_max_bytes`` are
+    refused with 413 BLOB_TOO_LARGE.
+    """
+    conn = repo.get(name)
+    if not conn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "CONNECTION_NOT_FOUND",
+                "message": f"Database connection '{name}' not found",
+            },
+        )
+
+    table_meta = table_repo.get_by_name(name, table, schema)
+    if not table_meta:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "TABLE_NOT_FOUND",
+                "message": f"Table '{table}' not found in '{name}'",
+            },
+        )
+
+    columns = column_repo.get_by_table(table_meta.id)
+    if column not in {col.column_name for col in columns}:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "COLUMN_NOT_FOUND",
+                "message": f"Column '{column}' not found in table '{table}'",
+            },
+        )
+
+    pk_columns = [col.column_name for col in columns if col.is_primary_key]
+    try:
+        key_values = json.loads(key)
+    except json.JSONDecodeError:
+        key_values = None
+    if not pk_columns or not isinstance(key_values, dict) or set(key_values) != set(pk_columns):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "VALIDATION_ERROR",
+                "message": (
+                    "key must be a JSON object with the primary key columns: "
+                    f"{', '.join(pk_columns) or '(table has no primary key)'}"
+                ),
+            },
+        )
+
+    found, value = await profiled_to_thread(
+        BlobService.fetch_blob,
+        db_name=name,
+        connection_url=conn.connection_url,
+        schema_name=table_meta.schema_name,
+        table_name=table,
+        column_name=column,
+        key=key_values,
+        timeout_ms=QueryService.resolve_statement_timeout(conn.statement_timeout_ms),
+    )
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "ROW_NOT_FOUND",
+                "message": f"No row in '{table}' matches the given key",
+            },
+        )
+    if value is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    return stream_blob(
+        value,
+        media_type=sniff_content_type(value),
+        etag=hashlib.sha256(value).hexdigest(),
+    )
+
+
 @router.post(
     "/dbs/{name}/query/natural",
     response_model=GeneratedQueryResponse,
@@ -110,7 +308,13 @@ async def generate_sql_from_natural_language(
     repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
     table_repo: Annotated[TableMetadataRepository, Depends(get_table_repo)],
     column_repo: Annotated[ColumnMetadataRepository, Depends(get_column_repo)],
+    refresh: bool = False,
 ):
+    """Generate SQL for a question.
+
+    Answers are cached per catalog version; the same question, or one worded
+    almost the same, is answered from the cache unless ``refresh=true``.
+    """
     conn = repo.get(name)
     if not conn:
         raise HTTPException(
@@ -122,36 +326,332 @@ async def generate_sql_from_natural_language(
         )
 
     try:
-        schema_context = NlQueryService.build_schema_context(
-            db_name=name,
-            table_repo=table_repo,
-            column_repo=column_repo,
+        return await _answer_question(
+            name, conn, request.question, refresh, table_repo, column_repo
         )
 
-        sql, explanation = NlQueryService.generate_sql(
-            question=request.question,
-            schema_context=schema_context,
-            connection_url=conn.connection_url,
+    except AppException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "NL_QUERY_ERROR",
+                "message": str(e),
+            },
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "code": "NL_QUERY_ERROR",
+                "message": f"Failed to generate SQL: {str(e)}",
+            },
+        )
+
+
+async def _answer_question(
+    name: str,
+    conn: DatabaseConnection,
+    question: str,
+    refresh: bool,
+    table_repo: TableMetadataRepository,
+    column_repo: ColumnMetadataRepository,
+) -> GeneratedQueryResponse:
+    """Answer a question from the answer cache, or generate and cache the SQL."""
+    if not refresh:
+        match = answer_cache.lookup(name, conn.catalog_version, question)
+        if match is not None:
+            return GeneratedQueryResponse(
+                sql=match.answer.sql,
+                explanation=match.answer.explanation,
+                cache=match.match,
+                similarity=match.similarity,
+            )
+
+    catalog = NlQueryService.get_catalog(
+        db_name=name,
+        connection_url=conn.connection_url,
+        catalog_version=conn.catalog_version,
+        table_repo=table_repo,
+        column_repo=column_repo,
+    )
+    schema_context = NlQueryService.select_schema_context(question, catalog)
+
+    started = time.perf_counter()
+    sql, explanation = await NlQueryService.generate_sql(
+        question=question,
+        schema_context=schema_context.text,
+        connection_url=conn.connection_url,
+    )
+    answer_cache.store(
+        name,
+        conn.catalog_version,
+        question,
+        sql,
+        explanation,
+        time.perf_counter() - started,
+    )
+
+    return GeneratedQueryResponse(
+        sql=sql,
+        explanation=explanation,
+        context_tables=schema_context.tables,
+        total_tables=schema_context.total_tables,
+        context_tokens=schema_context.token_estimate,
+    )
+
+
+@router.post("/dbs/{name}/query/natural/stream")
+async def stream_sql_from_natural_language(
+    name: str,
+    request: NaturalLanguageRequest,
+    repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+    table_repo: Annotated[TableMetadataRepository, Depends(get_table_repo)],
+    column_repo: Annotated[ColumnMetadataRepository, Depends(get_column_repo)],
+    refresh: bool = False,
+) -> Response:
+    """Generate SQL for a question, streaming the answer as Server-Sent Events.
+
+    Events, each with a JSON payload:
+
+    * ``context``: ``contextTables``, ``totalTables`` and ``contextTokens``
+    * ``sql`` / ``explanation``: ``delta``, the next characters of the field
+    * ``sql_complete``: ``sql``, ``valid`` and ``error``, as soon as the SQL
+      is complete (before the explanation)
+    * ``done``: the same body as ``POST /dbs/{name}/query/natural``
+    * ``error``: ``code`` and ``message``; the stream ends after it
+
+    Cached answers are sent as ``sql_complete`` and ``done`` right away.
+    """
+    conn = repo.get(name)
+    if not conn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "CONNECTION_NOT_FOUND",
+                "message": f"Database connection '{name}' not found",
+            },
+        )
+
+    match = None if refresh else answer_cache.lookup(
+        name, conn.catalog_version, request.question
+    )
+    if match is not None:
+        response = GeneratedQueryResponse(
+            sql=match.answer.sql,
+            explanation=match.answer.explanation,
+            cache=match.match,
+            similarity=match.similarity,
+        )
+
+        async def cached_events() -> AsyncIterator[bytes]:
+            yield _sql_complete_event(response.sql, conn.connection_url)
+            yield sse_event("done", response.model_dump(by_alias=True))
+
+        return stream_events(cached_events())
+
+    catalog = NlQueryService.get_catalog(
+        db_name=name,
+        connection_url=conn.connection_url,
+        catalog_version=conn.catalog_version,
+        table_repo=table_repo,
+        column_repo=column_repo,
+    )
+    schema_context = NlQueryService.select_schema_context(request.question, catalog)
+    connection_url = conn.connection_url
+    catalog_version = conn.catalog_version
+
+    async def events() -> AsyncIterator[bytes]:
+        yield sse_event(
+            "context",
+            {
+                "contextTables": schema_context.tables,
+                "totalTables": schema_context.total_tables,
+                "contextTokens": schema_context.token_estimate,
+            },
+        )
+        parser = JsonFieldStream()
+        content = []
+        started = time.perf_counter()
+        try:
+            async for chunk in NlQueryService.stream_sql(
+                question=request.question,
+                schema_context=schema_context.text,
+                connection_url=connection_url,
+            ):
+                content.append(chunk)
+                for delta in parser.feed(chunk):
+                    if delta.field not in ("sql", "explanation"):
+                        continue
+                    if delta.delta:
+                        yield sse_event(delta.field, {"delta": delta.delta})
+                    if delta.complete and delta.field == "sql":
+                        yield _sql_complete_event(parser.values["sql"], connection_url)
+            generation_seconds = time.perf_counter() - started
+
+            try:
+                result = json.loads("".join(content))
+            except ValueError:
+                result = parser.values
+            sql = result.get("sql", "")
+            explanation = result.get("explanation", "")
+            if not sql:
+                raise ValueError("Empty response from Deepseek")
+            answer_cache.store(
+                name, catalog_version, request.question, sql, explanation, generation_seconds
+            )
+            response = GeneratedQueryResponse(
+                sql=sql,
+                explanation=explanation,
+                context_tables=schema_context.tables,
+                total_tables=schema_context.total_tables,
+                context_tokens=schema_context.token_estimate,
+            )
+            yield sse_event("done", response.model_dump(by_alias=True))
+        except AppException as e:
+            yield sse_event("error", {"code": e.code, "message": e.message})
+        except ValueError as e:
+            yield sse_event("error", {"code": "NL_QUERY_ERROR", "message": str(e)})
+        except Exception as e:
+            yield sse_event(
+                "error", {"code": "NL_QUERY_ERROR", "message": f"Failed to generate SQL: {str(e)}"}
+            )
+
+    return stream_events(events())
+
+
+def _sql_complete_event(sql: str, connection_url: str) -> bytes:
+    error = NlQueryService.check_generated_sql(sql, connection_url)
+    return sse_event("sql_complete", {"sql": sql, "valid": error is None, "error": error})
+
+
+@router.get(
+    "/dbs/{name}/query/natural/cache",
+    response_model=NlAnswerCacheStatsResponse,
+)
+async def get_natural_language_cache_stats(
+    name: str,
+    repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+) -> NlAnswerCacheStatsResponse:
+    if not repo.get(name):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "CONNECTION_NOT_FOUND",
+                "message": f"Database connection '{name}' not found",
+            },
+        )
+    return NlAnswerCacheStatsResponse(**answer_cache.stats(name))
+
+
+@router.post("/dbs/{name}/ask", response_model=AskResponse)
+async def ask(
+    name: str,
+    request: AskRequest,
+    background_tasks: BackgroundTasks,
+    repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+    table_repo: Annotated[TableMetadataRepository, Depends(get_table_repo)],
+    column_repo: Annotated[ColumnMetadataRepository, Depends(get_column_repo)],
+) -> Response:
+    """Generate SQL for a question, check it and return its first page of results.
+
+    A connection is checked out of the pool while the SQL is generated. The
+    generated SQL must parse as a single SELECT; unless ``explain`` is false,
+    its EXPLAIN cost estimate is then checked against
+    ``ASK_MAX_QUERY_COST``. The result is streamed like ``POST /dbs/{name}/query``
+    and the timings are also sent in a ``Server-Timing`` header.
+    """
+    started = time.perf_counter()
+    conn = repo.get(name)
+    if not conn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "CONNECTION_NOT_FOUND",
+                "message": f"Database connection '{name}' not found",
+            },
         )
 
-        return GeneratedQueryResponse(
-            sql=sql,
-            explanation=explanation,
+    warm_up = asyncio.create_task(
+        profiled_to_thread(AskService.warm_read_engine, name, conn.connection_url)
+    )
+    # A failed warm-up surfaces again, with context, when the query runs
+    warm_up.add_done_callback(lambda task: task.cancelled() or task.exception())
+    try:
+        answer = await _answer_question(
+            name, conn, request.question, request.refresh, table_repo, column_repo
         )
+        generated = time.perf_counter()
+
+        await asyncio.wait([warm_up])
+
+        error = NlQueryService.check_generated_sql(answer.sql, conn.connection_url)
+        if error is not None:
+            raise SqlValidationError(error, answer.sql)
+
+        planner_cost = None
+        if request.explain:
+            planner_cost = await profiled_to_thread(
+                AskService.check_cost,
+                name,
+                conn.connection_url,
+                answer.sql,
+                conn.statement_timeout_ms,
+            )
 
+        result = await profiled_to_thread(
+            QueryService.execute_query,
+            db_name=name,
+            connection_url=conn.connection_url,
+            sql=answer.sql,
+            statement_timeout_ms=conn.statement_timeout_ms,
+            page_size=request.page_size,
+            key_lookup=_make_key_lookup(name, table_repo, column_repo),
+            lazy_blobs=request.lazy_blobs,
+        )
+
+    except AppException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
-                "code": "NL_QUERY_ERROR",
+                "code": "INVALID_QUERY",
                 "message": str(e),
             },
         )
     except Exception as e:
+        logger.exception("Answering a question on '%s' failed", name)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
-                "code": "NL_QUERY_ERROR",
-                "message": f"Failed to generate SQL: {str(e)}",
+                "code": "QUERY_EXECUTION_ERROR",
+                "message": f"Failed to answer question: {str(e)}",
             },
         )
+
+    finished = time.perf_counter()
+    generation_ms = (generated - started) * 1000
+    execution_ms = (finished - generated) * 1000
+    total_ms = (finished - started) * 1000
+    content = answer.model_dump(by_alias=True)
+    content["plannerCost"] = planner_cost
+    content["timings"] = {
+        "generationMs": round(generation_ms, 1),
+        "executionMs": round(execution_ms, 1),
+        "totalMs": round(total_ms, 1),
+    }
+
+    background_tasks.add_task(result.close)
+    return stream_with_result(
+        content,
+        result,
+        headers={
+            "Server-Timing": (
+                f"generate;dur={generation_ms:.1f}, "
+                f"execute;dur={execution_ms:.1f}, "
+                f"total;dur={total_ms:.1f}"
+            )
+        },
+    )
@@ -0,0 +1,189 @@
+"""Response helpers for query results.
+
+Query results bypass FastAPI's response model: rows are already serialized by
+the adapters, so validating and re-encoding every cell through pydantic and
+``jsonable_encoder`` is pure overhead. Results are encoded directly as JSON
+(with orjson when installed) or as MessagePack when the client asks for it
+with ``Accept: application/msgpack``.
+"""
+
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, cast
+
+from fastapi.responses import Response, StreamingResponse
+
+from src.services.query import QueryResult
+from src.services.request_profiler import profiled_iterator
+from src.services.result_buffer import encode_json
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+# Chunk size used when streaming large binary values
+BLOB_CHUNK_SIZE = 64 * 1024
+
+JSON_MEDIA_TYPE = "application/json"
+SSE_MEDIA_TYPE = "text/event-stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson (or compact stdlib JSON as a fallback)."""
+
+    media_type = JSON_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+class MsgPackResponse(Response):
+    """MessagePack response."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return _packb(content)
+
+
+def prefers_msgpack(accept: str | None) -> bool:
+    """Return True if an ``Accept`` header ranks MessagePack above JSON.
+
+    MessagePack is only chosen when it is installed and explicitly requested;
+    wildcards keep the JSON default.
+    """
+    if not accept or msgpack is None:
+        return False
+
+    msgpack_quality = 0.0
+    json_quality = 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type in _MSGPACK_ALIASES:
+            msgpack_quality = max(msgpack_quality, quality)
+        elif media_type == JSON_MEDIA_TYPE:
+            json_quality = max(json_quality, quality)
+    return msgpack_quality > 0 and msgpack_quality >= json_quality
+
+
+def render_query_result(result: QueryResult, accept: str | None = None) -> Response:
+    """Encode a query result in the format requested by the client.
+
+    The body has the same shape as ``QueryResultResponse``. Results whose rows
+    spilled to disk are streamed instead of being built in memory.
+    """
+    use_msgpack = prefers_msgpack(accept)
+
+    if result.buffer.spilled:
+        if use_msgpack:
+            return StreamingResponse(
+                profiled_iterator(_iter_query_result_msgpack(result)),
+                media_type=MSGPACK_MEDIA_TYPE,
+            )
+        return stream_query_result(result)
+
+    content = {**_result_header(result), "rows": result.rows}
+    if use_msgpack:
+        return MsgPackResponse(content)
+    return FastJSONResponse(content)
+
+
+def stream_query_result(result: QueryResult) -> StreamingResponse:
+    """Stream a query result whose rows spilled to disk as a JSON body.
+
+    The body has the same shape as ``QueryResultResponse``; rows are written
+    one at a time so a spilled result is never loaded back into memory.
+    """
+    return StreamingResponse(
+        profiled_iterator(_iter_query_result_json(result)), media_type=JSON_MEDIA_TYPE
+    )
+
+
+def stream_with_result(
+    content: dict[str, Any], result: QueryResult, headers: dict[str, str] | None = None
+) -> StreamingResponse:
+    """Stream a JSON object made of ``content`` plus the query result as ``result``.
+
+    The result is written like :func:`stream_query_result`, a row at a time.
+    """
+
+    def chunks() -> Iterator[bytes]:
+        yield encode_json(content)[:-1] + b',"result":'
+        yield from _iter_query_result_json(result)
+        yield b"}"
+
+    return StreamingResponse(
+        profiled_iterator(chunks()), media_type=JSON_MEDIA_TYPE, headers=headers
+    )
+
+
+def _result_header(result: QueryResult) -> dict[str, Any]:
+    return {
+        "columns": [{"name": name, "type": col_type} for name, col_type in result.columns],
+        "rowCount": result.row_count,
+        "truncated": result.truncated,
+        "nextCursor": result.next_cursor,
+    }
+
+
+def _iter_query_result_json(result: QueryResult) -> Iterator[bytes]:
+    # Open the object and leave the rows array for last
+    yield encode_json(_result_header(result))[:-1] + b',"rows":['
+    for i, row in enumerate(result.buffer.iter_json()):
+        yield b"," + row if i else row
+    yield b"]}"
+
+
+def _iter_query_result_msgpack(result: QueryResult) -> Iterator[bytes]:
+    header = _result_header(result)
+    packer = msgpack.Packer(use_bin_type=True, default=str)
+    # A map with the header fields plus "rows", whose array length is known up front
+    yield packer.pack_map_header(len(header) + 1)
+    for key, value in header.items():
+        yield packer.pack(key) + packer.pack(value)
+    yield packer.pack("rows") + packer.pack_array_header(len(result.buffer))
+    for row in result.buffer:
+        yield packer.pack(row)
+
+
+def _packb(content: Any) -> bytes:
+    return cast(bytes, msgpack.packb(content, use_bin_type=True, default=str))
+
+
+def stream_blob(value: bytes, media_type: str, etag: str) -> StreamingResponse:
+    """Stream a binary value in fixed-size chunks."""
+    view = memoryview(value)
+    chunks = (
+        bytes(view[offset : offset + BLOB_CHUNK_SIZE])
+        for offset in range(0, len(view), BLOB_CHUNK_SIZE)
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Length": str(len(value)), "ETag": f'"{etag}"'},
+    )
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event with a JSON payload."""
+    return b"event: " + event.encode() + b"\ndata: " + encode_json(data) + b"\n\n"
+
+
+def stream_events(events: AsyncIterator[bytes]) -> StreamingResponse:
+    """Stream Server-Sent Events, asking proxies not to buffer them."""
+    return StreamingResponse(
+        events,
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,178 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.db.models import DatabaseConnection, TableMetadata
+from src.db.repository import (
+    ColumnMetadataRepository,
+    ConnectionRepository,
+    TableMetadataRepository,
+    get_db,
+)
+from src.models.metadata import (
+    ColumnProfileResponse,
+    TableProfileResponse,
+    ValueCountResponse,
+)
+from src.services.preview import PreviewService
+from src.services.profile import ProfileService
+from src.services.query import QueryService
+from src.services.request_profiler import profiled_to_thread
+
+router = APIRouter(tags=["tables"])
+
+
+def get_connection_repo(
+    db: Annotated[Session, Depends(get_db)]
+) -> ConnectionRepository:
+    return ConnectionRepository(db)
+
+
+def get_table_repo(
+    db: Annotated[Session, Depends(get_db)]
+) -> TableMetadataRepository:
+    return TableMetadataRepository(db)
+
+
+def get_column_repo(
+    db: Annotated[Session, Depends(get_db)]
+) -> ColumnMetadataRepository:
+    return ColumnMetadataRepository(db)
+
+
+def _get_table(
+    name: str,
+    table: str,
+    schema: str | None,
+    repo: ConnectionRepository,
+    table_repo: TableMetadataRepository,
+) -> tuple[DatabaseConnection, TableMetadata]:
+    conn = repo.get(name)
+    if not conn:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "CONNECTION_NOT_FOUND",
+                "message": f"Database connection '{name}' not found",
+            },
+        )
+
+    table_meta = table_repo.get_by_name(name, table, schema)
+    if not table_meta:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "TABLE_NOT_FOUND",
+                "message": f"Table '{table}' not found in '{name}'",
+            },
+        )
+    return conn, table_meta
+
+
+@router.get("/dbs/{name}/tables/{table}/profile", response_model=TableProfileResponse)
+async def get_table_profile(
+    name: str,
+    table: str,
+    repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+    table_repo: Annotated[TableMetadataRepository, Depends(get_table_repo)],
+    column_repo: Annotated[ColumnMetadataRepository, Depends(get_column_repo)],
+    schema: str | None = None,
+    refresh: bool = False,
+) -> TableProfileResponse:
+    """Profile a table's columns over a sample of its rows.
+
+    Profiles are cached with the table's metadata; ``refresh=true`` recomputes
+    them even if the cached profile is still fresh.
+    """
+    conn, table_meta = _get_table(name, table, schema, repo, table_repo)
+
+    # Sampling blocks on the database; keep it off the event loop
+    profile = await profiled_to_thread(
+        ProfileService.get_profile,
+        db_name=name,
+        connection_url=conn.connection_url,
+        schema_name=table_meta.schema_name,
+        table_name=table_meta.table_name,
+        columns=column_repo.get_by_table(table_meta.id),
+        column_repo=column_repo,
+        sample_rows=settings.profile_sample_rows,
+        top_values=settings.profile_top_values,
+        max_age_seconds=settings.profile_max_age_seconds,
+        refresh=refresh,
+        timeout_ms=QueryService.resolve_statement_timeout(conn.statement_timeout_ms),
+    )
+
+    return TableProfileResponse(
+        schema_name=table_meta.schema_name,
+        table_name=table_meta.table_name,
+        sample_rows=profile.sample_rows,
+        sample_limit=profile.sample_limit,
+        profiled_at=profile.profiled_at.isoformat(),
+        cached=profile.cached,
+        columns=[
+            ColumnProfileResponse(
+                column_name=col.column_name,
+                data_type=col.data_type,
+                null_count=stats["null_count"],
+                null_fraction=stats["null_fraction"],
+                distinct_count=stats["distinct_count"],
+                distinct_approximate=stats["distinct_approximate"],
+                min_value=stats["min_value"],
+                max_value=stats["max_value"],
+                top_values=[ValueCountResponse(**item) for item in stats["top_values"]],
+            )
+            for col, stats in profile.columns
+        ],
+    )
+
+
+@router.get(
+    "/dbs/{name}/tables/{table}/preview",
+    responses={200: {"content": {"application/json": {}}}},
+)
+async def get_table_preview(
+    name: str,
+    table: str,
+    repo: Annotated[ConnectionRepository, Depends(get_connection_repo)],
+    table_repo: Annotated[TableMetadataRepository, Depends(get_table_repo)],
+    column_repo: Annotated[ColumnMetadataRepository, Depends(get_column_repo)],
+    schema: str | None = None,
+    limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
+    refresh: bool = False,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Return a sample of a table's rows.
+
+    The body has the shape of a query result plus ``sampling`` (how the rows
+    were picked), ``catalogVersion`` and ``sampledAt``. Previews are cached
+    per catalog version; ``refresh=true`` takes a new sample.
+    """
+    conn, table_meta = _get_table(name, table, schema, repo, table_repo)
+
+    # Sampling blocks on the database; keep it off the event loop
+    snapshot, cached = await profiled_to_thread(
+        PreviewService.get_preview,
+        db_name=name,
+        connection_url=conn.connection_url,
+        catalog_version=conn.catalog_version,
+        schema_name=table_meta.schema_name,
+        table_name=table_meta.table_name,
+        columns=[
+            (col.column_name, col.data_type, col.is_primary_key)
+            for col in column_repo.get_by_table(table_meta.id)
+        ],
+        is_view=table_meta.table_type == "view",
+        limit=limit or settings.preview_rows,
+        refresh=refresh,
+        timeout_ms=QueryService.resolve_statement_timeout(conn.statement_timeout_ms),
+    )
+
+    headers = {
+        "ETag": f'"{snapshot.etag}"',
+        "X-Preview-Cache": "hit" if cached else "miss",
+    }
+    if if_none_match and snapshot.etag in if_none_match:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
@@ -7,8 +7,81 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     deepseek_api_key: str = ""
     deepseek_base_url: str = "https://api.deepseek.com"
+    # LLM requests: deadline per request (covering the wait for a slot and all
+    # retries), retries on 429/5xx with jittered backoff, requests in flight
+    # at once, and pooled HTTP connections
+    llm_timeout_seconds: float = 30.0
+    llm_max_retries: int = 2
+    llm_retry_base_seconds: float = 0.5
+    llm_max_concurrency: int = 8
+    llm_max_connections: int = 16
     database_sqlite_path: str = "~/.db_query/db_query.db"
     cors_origins: list[str] = ["http://localhost:5173", "http://127.0.0.1:5173"]
+    # Applied to connections that don't define their own timeout (0 disables)
+    default_statement_timeout_ms: int = 30000
+    # Continuation cursors for paged query results
+    cursor_secret: str = ""
+    cursor_idle_timeout_seconds: float = 60.0
+    max_open_cursors: int = 20
+    # Result size budgets: rows beyond the in-memory budgets spill to disk,
+    # results beyond the hard cap fail with RESULT_TOO_LARGE
+    query_result_budget_bytes: int = 32 * 1024 * 1024
+    process_result_budget_bytes: int = 256 * 1024 * 1024
+    query_result_max_bytes: int = 512 * 1024 * 1024
+    result_spill_dir: str = ""
+    # Binary values above this size become blob descriptors in lazy mode
+    blob_inline_max_bytes: int = 1024
+    # Values fetched through /blob are read into memory whole; larger values
+    # are refused with BLOB_TOO_LARGE (0 disables the cap)
+    blob_fetch_max_bytes: int = 64 * 1024 * 1024
+    # Response compression: bodies below the minimum are sent as-is; complete
+    # GET bodies are cached compressed (0 disables the cache)
+    compression_min_bytes: int = 1024
+    compression_cache_entries: int = 64
+    # Seconds between read replica health and lag checks
+    replica_health_interval_seconds: float = 10.0
+    # Circuit breaker: open after this many consecutive connection failures,
+    # fail fast for the cool-down, then let one probe through
+    circuit_failure_threshold: int = 5
+    circuit_cooldown_seconds: float = 30.0
+    # Startup warm-up: idle connections opened per endpoint, the time budget
+    # before reporting ready, and how many endpoints are warmed at once
+    pool_min_idle: int = 2
+    warmup_timeout_seconds: float = 10.0
+    warmup_concurrency: int = 16
+    # Column profiles: rows scanned per profile, top values kept per column,
+    # and how long a cached profile is served before it is recomputed
+    profile_sample_rows: int = 10000
+    profile_top_values: int = 5
+    profile_max_age_seconds: float = 3600.0
+    # Table previews: default row count, and the in-memory snapshot cache
+    # (bounded by total size; snapshots expire after the max age)
+    preview_rows: int = 100
+    preview_cache_bytes: int = 32 * 1024 * 1024
+    preview_max_age_seconds: float = 300.0
+    # Tables with at least this many estimated rows are flagged as large in
+    # natural language prompts, so generated queries avoid full scans
+    nl_large_table_rows: int = 1_000_000
+    # Schema context budget for natural language prompts: larger catalogs are
+    # pruned to the best matching tables (plus their foreign key neighbours)
+    nl_context_max_tokens: int = 6000
+    nl_context_top_tables: int = 10
+    # Generated SQL cache: answers kept per connection (0 disables the cache),
+    # the trigram similarity at which a different wording reuses an answer,
+    # and how long answers are kept
+    nl_answer_cache_entries: int = 1000
+    nl_answer_similarity: float = 0.95
+    nl_answer_max_age_seconds: float = 86400.0
+    # Generated queries run by /ask whose EXPLAIN cost estimate exceeds this
+    # are rejected (planner cost units of each database; 0 disables the guard)
+    ask_max_query_cost: float = 0.0
+    # On-demand request profiling (X-Profile header): the admin token that
+    # enables it (empty disables profiling), where profiles are written
+    # (empty: a "profiles" directory next to the SQLite store) and how many
+    # are kept
+    request_profile_token: str = ""
+    request_profile_dir: str = ""
+    request_profile_keep: int = 50
 
     @property
     def sqlite_path(self) -> Path:
@@ -1,6 +1,18 @@
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, create_engine
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    create_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -13,6 +25,11 @@ class DatabaseConnection(Base):
 
     name: Mapped[str] = mapped_column(String(255), primary_key=True)
     connection_url: Mapped[str] = mapped_column(Text, nullable=False)
+    statement_timeout_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    replica_urls: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+    max_replica_lag_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    pool_settings: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    catalog_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -35,11 +52,20 @@ class TableMetadata(Base):
     schema_name: Mapped[str] = mapped_column(String(255), nullable=False)
     table_name: Mapped[str] = mapped_column(String(255), nullable=False)
     table_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    row_estimate: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    comment: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     database: Mapped["DatabaseConnection"] = relationship(back_populates="tables")
     columns: Mapped[list["ColumnMetadata"]] = relationship(
         back_populates="table", cascade="all, delete-orphan"
     )
+    foreign_keys: Mapped[list["ForeignKeyMetadata"]] = relationship(
+        back_populates="table", cascade="all, delete-orphan", order_by="ForeignKeyMetadata.id"
+    )
+    indexes: Mapped[list["IndexMetadata"]] = relationship(
+        back_populates="table", cascade="all, delete-orphan", order_by="IndexMetadata.id"
+    )
 
 
 class ColumnMetadata(Base):
@@ -55,5 +81,38 @@ class ColumnMetadata(Base):
     is_primary_key: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     default_value: Mapped[str | None] = mapped_column(Text, nullable=True)
     position: Mapped[int] = mapped_column(Integer, nullable=False)
+    comment: Mapped[str | None] = mapped_column(Text, nullable=True)
+    profile: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    profiled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     table: Mapped["TableMetadata"] = relationship(back_populates="columns")
+
+
+class ForeignKeyMetadata(Base):
+    __tablename__ = "foreign_key_metadata"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    table_metadata_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("table_metadata.id", ondelete="CASCADE"), nullable=False
+    )
+    constraint_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    columns: Mapped[list[str]] = mapped_column(JSON, nullable=False)
+    referred_schema: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    referred_table: Mapped[str] = mapped_column(String(255), nullable=False)
+    referred_columns: Mapped[list[str]] = mapped_column(JSON, nullable=False)
+
+    table: Mapped["TableMetadata"] = relationship(back_populates="foreign_keys")
+
+
+class IndexMetadata(Base):
+    __tablename__ = "index_metadata"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    table_metadata_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("table_metadata.id", ondelete="CASCADE"), nullable=False
+    )
+    index_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    columns: Mapped[list[str]] = mapped_column(JSON, nullable=False)
+    is_unique: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    table: Mapped["TableMetadata"] = relationship(back_populates="indexes")
@@ -1,10 +1,22 @@
+from collections.abc import Mapping, Sequence
+from datetime import datetime
 from pathlib import Path
+from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+from sqlalchemy.pool import ConnectionPoolEntry
 
 from src.config import settings
-from src.db.models import Base, ColumnMetadata, DatabaseConnection, TableMetadata
+from src.db.models import (
+    Base,
+    ColumnMetadata,
+    DatabaseConnection,
+    ForeignKeyMetadata,
+    IndexMetadata,
+    TableMetadata,
+)
 
 
 def _get_sqlite_url() -> str:
@@ -16,8 +28,41 @@ engine = create_engine(_get_sqlite_url(), echo=False)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@event.listens_for(engine, "connect")
+def _enable_foreign_keys(
+    dbapi_connection: DBAPIConnection, connection_record: ConnectionPoolEntry
+) -> None:
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are enabled per
+    # connection; bulk deletes of table metadata rely on it
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+
+
+def _add_missing_columns() -> None:
+    """Add columns introduced after an existing metadata store was created.
+
+    ``create_all`` only creates missing tables, so new (nullable) columns on
+    existing tables are added with ALTER TABLE.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.exec_driver_sql(
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+                )
 
 
 def get_db() -> Session:
@@ -32,8 +77,23 @@ class ConnectionRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, name: str, connection_url: str) -> DatabaseConnection:
-        conn = DatabaseConnection(name=name, connection_url=connection_url)
+    def create(
+        self,
+        name: str,
+        connection_url: str,
+        statement_timeout_ms: int | None = None,
+        replica_urls: list[str] | None = None,
+        max_replica_lag_seconds: float | None = None,
+        pool_settings: dict[str, Any] | None = None,
+    ) -> DatabaseConnection:
+        conn = DatabaseConnection(
+            name=name,
+            connection_url=connection_url,
+            statement_timeout_ms=statement_timeout_ms,
+            replica_urls=replica_urls or None,
+            max_replica_lag_seconds=max_replica_lag_seconds,
+            pool_settings=pool_settings or None,
+        )
         self.db.add(conn)
         self.db.commit()
         self.db.refresh(conn)
@@ -53,8 +113,20 @@ class ConnectionRepository:
             return True
         return False
 
+    def update_pool_settings(self, name: str, pool_settings: dict[str, Any] | None) -> None:
+        conn = self.get(name)
+        if conn:
+            conn.pool_settings = pool_settings or None
+            self.db.commit()
+
+    def bump_catalog_version(self, name: str) -> None:
+        """Mark the cached metadata of a connection as re-extracted."""
+        conn = self.get(name)
+        if conn:
+            conn.catalog_version = (conn.catalog_version or 0) + 1
+            self.db.commit()
+
     def update_timestamp(self, name: str) -> None:
-        from datetime import datetime
         conn = self.get(name)
         if conn:
             conn.updated_at = datetime.utcnow()
@@ -71,12 +143,18 @@ class TableMetadataRepository:
         schema_name: str,
         table_name: str,
         table_type: str,
+        row_estimate: int | None = None,
+        size_bytes: int | None = None,
+        comment: str | None = None,
     ) -> TableMetadata:
         table = TableMetadata(
             db_name=db_name,
             schema_name=schema_name,
             table_name=table_name,
             table_type=table_type,
+            row_estimate=row_estimate,
+            size_bytes=size_bytes,
+            comment=comment,
         )
         self.db.add(table)
         self.db.commit()
@@ -86,6 +164,30 @@ class TableMetadataRepository:
     def get_by_database(self, db_name: str) -> list[TableMetadata]:
         return self.db.query(TableMetadata).filter(TableMetadata.db_name == db_name).all()
 
+    def get_by_database_with_keys(self, db_name: str) -> list[TableMetadata]:
+        """Return a database's tables with their foreign keys and indexes loaded.
+
+        The relationships are loaded with one query each for the whole
+        database rather than lazily per table.
+        """
+        return (
+            self.db.query(TableMetadata)
+            .options(selectinload(TableMetadata.foreign_keys), selectinload(TableMetadata.indexes))
+            .filter(TableMetadata.db_name == db_name)
+            .all()
+        )
+
+    def get_by_name(
+        self, db_name: str, table_name: str, schema_name: str | None = None
+    ) -> TableMetadata | None:
+        query = self.db.query(TableMetadata).filter(
+            TableMetadata.db_name == db_name,
+            TableMetadata.table_name == table_name,
+        )
+        if schema_name:
+            query = query.filter(TableMetadata.schema_name == schema_name)
+        return query.first()
+
     def delete_by_database(self, db_name: str) -> None:
         self.db.query(TableMetadata).filter(TableMetadata.db_name == db_name).delete()
         self.db.commit()
@@ -104,6 +206,7 @@ class ColumnMetadataRepository:
         is_primary_key: bool,
         default_value: str | None,
         position: int,
+        comment: str | None = None,
     ) -> ColumnMetadata:
         column = ColumnMetadata(
             table_metadata_id=table_metadata_id,
@@ -113,6 +216,7 @@ class ColumnMetadataRepository:
             is_primary_key=is_primary_key,
             default_value=default_value,
             position=position,
+            comment=comment,
         )
         self.db.add(column)
         self.db.commit()
@@ -127,8 +231,84 @@ class ColumnMetadataRepository:
             .all()
         )
 
+    def get_by_database(self, db_name: str) -> dict[int, list[ColumnMetadata]]:
+        """Return all columns of a database in one query, keyed by table id."""
+        columns: dict[int, list[ColumnMetadata]] = {}
+        query = (
+            self.db.query(ColumnMetadata)
+            .join(TableMetadata)
+            .filter(TableMetadata.db_name == db_name)
+            .order_by(ColumnMetadata.table_metadata_id, ColumnMetadata.position)
+        )
+        for column in query:
+            columns.setdefault(column.table_metadata_id, []).append(column)
+        return columns
+
+    def save_profiles(self, profiles: dict[int, dict[str, Any]], profiled_at: datetime) -> None:
+        """Store column profiles, keyed by column metadata id."""
+        for column in self.db.query(ColumnMetadata).filter(ColumnMetadata.id.in_(profiles)):
+            column.profile = profiles[column.id]
+            column.profiled_at = profiled_at
+        self.db.commit()
+
     def delete_by_table(self, table_metadata_id: int) -> None:
         self.db.query(ColumnMetadata).filter(
             ColumnMetadata.table_metadata_id == table_metadata_id
         ).delete()
         self.db.commit()
+
+
+class ForeignKeyMetadataRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_many(
+        self, table_metadata_id: int, foreign_keys: Sequence[Mapping[str, Any]]
+    ) -> None:
+        """Store a table's foreign keys, as returned by the SQLAlchemy inspector."""
+        self.db.add_all(
+            ForeignKeyMetadata(
+                table_metadata_id=table_metadata_id,
+                constraint_name=fk.get("name"),
+                columns=fk["constrained_columns"],
+                referred_schema=fk.get("referred_schema"),
+                referred_table=fk["referred_table"],
+                referred_columns=fk["referred_columns"],
+            )
+            for fk in foreign_keys
+        )
+        self.db.commit()
+
+    def get_by_table(self, table_metadata_id: int) -> list[ForeignKeyMetadata]:
+        return (
+            self.db.query(ForeignKeyMetadata)
+            .filter(ForeignKeyMetadata.table_metadata_id == table_metadata_id)
+            .order_by(ForeignKeyMetadata.id)
+            .all()
+        )
+
+
+class IndexMetadataRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_many(self, table_metadata_id: int, indexes: Sequence[Mapping[str, Any]]) -> None:
+        """Store a table's indexes, as returned by the SQLAlchemy inspector."""
+        self.db.add_all(
+            IndexMetadata(
+                table_metadata_id=table_metadata_id,
+                index_name=index.get("name"),
+                columns=index["column_names"],
+                is_unique=bool(index.get("unique")),
+            )
+            for index in indexes
+        )
+        self.db.commit()
+
+    def get_by_table(self, table_metadata_id: int) -> list[IndexMetadata]:
+        return (
+            self.db.query(IndexMetadata)
+            .filter(IndexMetadata.table_metadata_id == table_metadata_id)
+            .order_by(IndexMetadata.id)
+            .all()
+        )
@@ -0,0 +1,37 @@
+"""Modules imported on first use.
+
+``openai`` and ``sqlglot`` together take longer to import than the rest of
+the app, and most requests never need them. Modules that use them bind a
+:func:`lazy_import` proxy at module level, and import the real module under
+``TYPE_CHECKING`` for annotations (which stay quoted)::
+
+    if TYPE_CHECKING:
+        from sqlglot import exp
+    else:
+        exp = lazy_import("sqlglot.expressions")
+"""
+
+import importlib
+from types import ModuleType
+from typing import Any
+
+
+class _LazyModule:
+    """Stands in for a module and imports it on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: ModuleType | None = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}>"
+
+
+def lazy_import(name: str) -> Any:
+    """Return a proxy for module ``name`` that imports it when first used."""
+    return _LazyModule(name)
@@ -1,3 +1,4 @@
+import math
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -5,10 +6,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from src.adapters import adapter_registry, ensure_adapters_registered
-from src.api import databases, query
+from src.api import databases, profiles, query, tables
 from src.config import settings
-from src.db.repository import init_db
+from src.db.repository import ConnectionRepository, SessionLocal, init_db
+from src.middleware import CompressionMiddleware, ProfilingMiddleware
 from src.models.errors import AppException
+from src.services.connection import ConnectionManager, replica_monitor
+from src.services.pagination import server_cursors
+from src.services.warmup import start_warmup, warmup_state
 
 
 @asynccontextmanager
@@ -17,7 +22,43 @@ async def lifespan(app: FastAPI):
     init_db()
     # Ensure adapters are registered (important for hot reload)
     ensure_adapters_registered()
+    # Register pool settings and read replicas, then start replica health checks
+    endpoints = _register_connections()
+    replica_monitor.start()
+    # Close idle result cursors so they release their pooled connections
+    server_cursors.start()
+    # Pre-open pooled connections; /ready reports once this finishes or times out
+    start_warmup(
+        endpoints,
+        min_idle=settings.pool_min_idle,
+        timeout_seconds=settings.warmup_timeout_seconds,
+        max_workers=settings.warmup_concurrency,
+    )
     yield
+    replica_monitor.stop()
+    # Release connections pinned by open result cursors
+    server_cursors.stop()
+    server_cursors.close_all()
+
+
+def _register_connections() -> list[tuple[str, str]]:
+    """Register pool settings and replicas of stored connections.
+
+    Returns every (connection name, URL) endpoint for warm-up.
+    """
+    endpoints = []
+    db = SessionLocal()
+    try:
+        for conn in ConnectionRepository(db).get_all():
+            ConnectionManager.configure_pool(conn.name, conn.pool_settings)
+            ConnectionManager.configure_replicas(
+                conn.name, conn.replica_urls, conn.max_replica_lag_seconds
+            )
+            endpoints.append((conn.name, conn.connection_url))
+            endpoints.extend((conn.name, url) for url in conn.replica_urls or [])
+    finally:
+        db.close()
+    return endpoints
 
 
 app = FastAPI(
@@ -27,6 +68,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Innermost, so a profile covers the request's handling and not CORS or compression
+app.add_middleware(ProfilingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -35,10 +79,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_bytes,
+    cache_entries=settings.compression_cache_entries,
+)
+
 
 @app.exception_handler(AppException)
 async def app_exception_handler(request: Request, exc: AppException):
     status_code = _get_status_code(exc.code)
+    headers = None
+    if exc.details and "retryAfterSeconds" in exc.details:
+        headers = {"Retry-After": str(math.ceil(exc.details["retryAfterSeconds"]))}
     return JSONResponse(
         status_code=status_code,
         content={
@@ -48,6 +101,7 @@ async def app_exception_handler(request: Request, exc: AppException):
                 "details": exc.details,
             }
         },
+        headers=headers,
     )
 
 
@@ -59,16 +113,38 @@ def _get_status_code(code: str) -> int:
         "SQL_VALIDATION_ERROR": 400,
         "NON_SELECT_STATEMENT": 400,
         "QUERY_EXECUTION_ERROR": 500,
+        "QUERY_TIMEOUT": 504,
+        "QUERY_TOO_EXPENSIVE": 400,
+        "INVALID_CURSOR": 400,
+        "RESULT_TOO_LARGE": 413,
+        "BLOB_TOO_LARGE": 413,
         "NL_QUERY_GENERATION_ERROR": 500,
+        "NL_QUERY_TIMEOUT": 504,
+        "NL_QUERY_UNAVAILABLE": 503,
         "VALIDATION_ERROR": 400,
+        "PROFILE_FORBIDDEN": 403,
+        "PROFILE_NOT_FOUND": 404,
+        "PROFILER_BUSY": 409,
     }
     return status_map.get(code, 500)
 
 
 app.include_router(databases.router, prefix="/api/v1")
 app.include_router(query.router, prefix="/api/v1")
+app.include_router(tables.router, prefix="/api/v1")
+app.include_router(profiles.router, prefix="/api/v1")
 
 
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    if not warmup_state.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "warmup": warmup_state.summary()},
+        )
+    return JSONResponse(content={"status": "ready", "warmup": warmup_state.summary()})
@@ -0,0 +1,6 @@
+"""ASGI middleware for the API."""
+
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.profiling import ProfilingMiddleware
+
+__all__ = ["CompressionMiddleware", "ProfilingMiddleware"]
@@ -0,0 +1,341 @@
+"""Content-Encoding negotiation for API responses.
+
+gzip is always available; zstd and brotli are used when the optional
+``zstandard`` and ``brotli`` packages are installed. The encoding is chosen
+from the client's ``Accept-Encoding`` header by q-value, with ties going to
+the better codec (zstd, then brotli, then gzip).
+
+Complete bodies of GET responses are compressed once and cached by body
+digest, so unchanged bodies are served without recompressing. The database
+detail endpoint compresses its catalog itself, cached by catalog version (see
+``src.services.catalog_cache``), and passes through untouched. Streamed bodies
+are compressed incrementally as they are sent.
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Protocol, cast
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Levels favour speed: responses are compressed on every request
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+BROTLI_QUALITY = 4
+
+# Content types worth compressing; everything else passes through untouched
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/msgpack",
+    "application/x-msgpack",
+)
+# Event streams must reach the client as each event is sent
+NEVER_COMPRESSED_TYPES = ("text/event-stream",)
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class Codec(ABC):
+    """A content encoding with one-shot and streaming compression."""
+
+    name: str = ""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a complete body."""
+        pass
+
+    @abstractmethod
+    def stream(self) -> StreamCompressor:
+        """Return a compressor for a body sent in chunks."""
+        pass
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+    def stream(self) -> StreamCompressor:
+        return _ZlibStream(GZIP_LEVEL, 16 + zlib.MAX_WBITS)
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+
+    def __init__(self) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def stream(self) -> StreamCompressor:
+        return _ZstdStream(ZSTD_LEVEL)
+
+
+class BrotliCodec(Codec):
+    name = "br"
+
+    def compress(self, data: bytes) -> bytes:
+        return cast(bytes, brotli.compress(data, quality=BROTLI_QUALITY))
+
+    def stream(self) -> StreamCompressor:
+        return _BrotliStream(brotli.Compressor(quality=BROTLI_QUALITY))
+
+
+class _ZlibStream:
+    def __init__(self, level: int, wbits: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, compressor: Any):
+        self._compressor = compressor
+
+    def compress(self, data: bytes) -> bytes:
+        return cast(bytes, self._compressor.process(data))
+
+    def finish(self) -> bytes:
+        return cast(bytes, self._compressor.finish())
+
+
+def available_codecs() -> list[Codec]:
+    """Return the installed codecs in order of preference."""
+    codecs: list[Codec] = []
+    if zstandard is not None:
+        codecs.append(ZstdCodec())
+    if brotli is not None:
+        codecs.append(BrotliCodec())
+    codecs.append(GzipCodec())
+    return codecs
+
+
+def negotiate(accept_encoding: str, codecs: list[Codec]) -> Codec | None:
+    """Pick a codec for an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding: Header value, e.g. ``"gzip, br;q=0.9, *;q=0.1"``
+        codecs: Available codecs in order of server preference
+
+    Returns:
+        The codec with the highest q-value (ties go to server preference),
+        or None if the client accepts none of them
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+
+    best: Codec | None = None
+    best_quality = 0.0
+    for codec in codecs:
+        quality = weights.get(codec.name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+class CompressedBodyCache:
+    """LRU cache of compressed bodies keyed by encoding and body digest."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compress(self, codec: Codec, body: bytes) -> bytes:
+        """Return the cached compressed body, compressing it on a miss."""
+        if self.max_entries <= 0:
+            return codec.compress(body)
+
+        key = (codec.name, hashlib.sha256(body).digest())
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        compressed = codec.compress(body)
+        with self._lock:
+            self._entries[key] = compressed
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses responses per ``Accept-Encoding``."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache_entries: int = 64,
+        codecs: list[Codec] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.codecs = codecs if codecs is not None else available_codecs()
+        self.cache = CompressedBodyCache(cache_entries)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        codec = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.codecs)
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, codec, cacheable=scope["method"] == "GET")
+        await self.app(scope, receive, responder.send_wrapper(send))
+
+
+class _CompressionResponder:
+    """Per-request state for compressing one response."""
+
+    def __init__(self, middleware: CompressionMiddleware, codec: Codec, cacheable: bool):
+        self.middleware = middleware
+        self.codec = codec
+        self.cacheable = cacheable
+        self.start_message: Message | None = None
+        self.passthrough = False
+        self.stream: StreamCompressor | None = None
+
+    def send_wrapper(self, send: Send) -> Send:
+        async def wrapped(message: Message) -> None:
+            await self.handle(message, send)
+
+        return wrapped
+
+    async def handle(self, message: Message, send: Send) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                or content_type.startswith(NEVER_COMPRESSED_TYPES)
+            )
+            if self.passthrough:
+                await send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None and self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+
+            if not more_body:
+                # Complete body in a single message
+                if len(body) < self.middleware.minimum_size:
+                    self.passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                if self.cacheable:
+                    compressed = self.middleware.cache.get_or_compress(self.codec, body)
+                else:
+                    compressed = self.codec.compress(body)
+                headers["Content-Encoding"] = self.codec.name
+                headers["Content-Length"] = str(len(compressed))
+                headers.add_vary_header("Accept-Encoding")
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            declared_length = headers.get("content-length")
+            if declared_length is not None and int(declared_length) < self.middleware.minimum_size:
+                self.passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            # Streamed body: compress chunks as they arrive
+            self.stream = self.codec.stream()
+            headers["Content-Encoding"] = self.codec.name
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await send(start)
+
+        assert self.stream is not None
+        chunk = self.stream.compress(body)
+        if more_body:
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            return
+        await send({"type": "http.response.body", "body": chunk + self.stream.finish()})
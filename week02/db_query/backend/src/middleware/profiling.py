@@ -0,0 +1,65 @@
+"""Opt-in profiling of single requests via the ``X-Profile`` header.
+
+See :mod:`src.services.request_profiler`. Requests without the header pass
+straight through. A profiled response carries ``X-Profile-Id``; the profile
+is saved once the response has been sent and can be downloaded from
+``GET /api/v1/profiles/{id}/files/{filename}``.
+"""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.models.errors import AppException, ProfileForbiddenError, ProfilerBusyError
+from src.services.request_profiler import PROFILE_KINDS, check_token, request_profiler
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        kind = headers.get("x-profile", "").strip().lower()
+        if not kind:
+            await self.app(scope, receive, send)
+            return
+
+        if kind not in PROFILE_KINDS:
+            error = AppException(
+                code="VALIDATION_ERROR",
+                message=f"X-Profile must be one of: {', '.join(PROFILE_KINDS)}",
+            )
+            await _error_response(error, 400)(scope, receive, send)
+            return
+        if not check_token(headers.get("x-profile-token")):
+            await _error_response(ProfileForbiddenError(), 403)(scope, receive, send)
+            return
+        session = request_profiler.begin(kind, scope["method"], scope["path"])
+        if session is None:
+            await _error_response(ProfilerBusyError(), 409)(scope, receive, send)
+            return
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                session.status = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = session.id
+            await send(message)
+
+        session.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session.finish()
+
+
+def _error_response(error: AppException, status_code: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "error": {"code": error.code, "message": error.message, "details": error.details}
+        },
+    )
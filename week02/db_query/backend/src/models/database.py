@@ -3,16 +3,57 @@
 import re
 from datetime import datetime
 
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
 
 from src.adapters import adapter_registry
 from src.models import BaseResponseModel
 
 
+class PoolSettings(BaseResponseModel):
+    """Connection pool settings; unset fields use the adapter defaults."""
+
+    pool_size: int | None = Field(default=None, ge=1, description="Connections kept in the pool")
+    max_overflow: int | None = Field(
+        default=None, ge=0, description="Extra connections allowed above pool_size"
+    )
+    pool_recycle: int | None = Field(
+        default=None, ge=1, description="Replace connections older than this many seconds"
+    )
+    pool_timeout: float | None = Field(
+        default=None, gt=0, description="Seconds to wait for a free connection"
+    )
+    pool_pre_ping: bool | None = Field(
+        default=None, description="Test every connection on checkout (one extra round trip)"
+    )
+    pool_use_lifo: bool | None = Field(
+        default=None, description="Reuse the most recently returned connection first"
+    )
+    liveness_interval_seconds: float | None = Field(
+        default=None,
+        gt=0,
+        description="Without pre-ping, test connections idle for longer than this",
+    )
+
+
 class DatabaseConnectionCreate(BaseResponseModel):
     """Model for creating a new database connection."""
 
     url: str = Field(..., min_length=1, description="Database connection URL")
+    statement_timeout_ms: int | None = Field(
+        default=None,
+        ge=0,
+        description="Server-enforced statement timeout in milliseconds (0 disables, null uses the default)",
+    )
+    replica_urls: list[str] = Field(
+        default_factory=list,
+        description="Read replica URLs; read-only queries are balanced across healthy replicas",
+    )
+    max_replica_lag_seconds: float | None = Field(
+        default=None,
+        ge=0,
+        description="Skip replicas lagging further behind the primary (null disables the gate)",
+    )
+    pool: PoolSettings | None = Field(default=None, description="Connection pool settings")
 
     @field_validator("url")
     @classmethod
@@ -32,6 +73,48 @@ class DatabaseConnectionCreate(BaseResponseModel):
 
         return v
 
+    @field_validator("replica_urls")
+    @classmethod
+    def validate_replica_urls(cls, v: list[str]) -> list[str]:
+        """Validate that every replica URL is supported."""
+        for url in v:
+            if not adapter_registry.is_supported(url):
+                supported = adapter_registry.list_all_prefixes()
+                raise ValueError(
+                    f"Invalid replica URL format. Supported prefixes: {', '.join(supported)}"
+                )
+        return v
+
+    @model_validator(mode="after")
+    def validate_replica_types(self) -> "DatabaseConnectionCreate":
+        """Replicas must be the same database type as the primary."""
+        primary_type = adapter_registry.get_adapter(self.url).db_type
+        for url in self.replica_urls:
+            if adapter_registry.get_adapter(url).db_type != primary_type:
+                raise ValueError(
+                    f"Replica URLs must use the same database type as the primary ({primary_type})"
+                )
+        return self
+
+
+class CircuitBreakerResponse(BaseResponseModel):
+    """State of an endpoint's circuit breaker."""
+
+    state: str = Field(description="closed, open or half_open")
+    consecutive_failures: int = 0
+    retry_after_seconds: float | None = None
+
+
+class ReplicaStatusResponse(BaseResponseModel):
+    """Health of one read replica."""
+
+    url: str
+    healthy: bool
+    lag_seconds: float | None = None
+    active_connections: int = 0
+    last_error: str | None = None
+    circuit: CircuitBreakerResponse | None = None
+
 
 class DatabaseConnectionResponse(BaseResponseModel):
     """Response model for a database connection."""
@@ -40,10 +123,40 @@ class DatabaseConnectionResponse(BaseResponseModel):
     connection_url: str
     created_at: datetime
     updated_at: datetime
+    statement_timeout_ms: int | None = None
+    max_replica_lag_seconds: float | None = None
+    replicas: list[ReplicaStatusResponse] = []
+    circuit: CircuitBreakerResponse | None = None
     table_count: int = 0
     view_count: int = 0
 
 
+class EndpointPoolStatsResponse(BaseResponseModel):
+    """Live statistics of one endpoint's connection pool."""
+
+    url: str
+    role: str = Field(description="primary or replica")
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    avg_checkout_wait_ms: float
+    max_checkout_wait_ms: float
+
+
+class PoolStatusResponse(BaseResponseModel):
+    """Pool settings and statistics of a connection."""
+
+    name: str
+    settings: PoolSettings
+    overrides: PoolSettings
+    endpoints: list[EndpointPoolStatsResponse]
+
+
 class DatabaseConnectionListResponse(BaseResponseModel):
     """Response model for a list of database connections."""
 
@@ -50,6 +50,15 @@ class ConnectionFailedError(AppException):
         )
 
 
+class CircuitOpenError(ConnectionFailedError):
+    def __init__(self, name: str, retry_after_seconds: float | None):
+        super().__init__(name, "circuit breaker is open after repeated connection failures")
+        self.details = {
+            **(self.details or {}),
+            "retryAfterSeconds": round(retry_after_seconds or 0.0, 1),
+        }
+
+
 class SqlValidationError(AppException):
     def __init__(self, message: str, sql: str | None = None):
         super().__init__(
@@ -77,9 +86,106 @@ class QueryExecutionError(AppException):
         )
 
 
+class QueryTimeoutError(AppException):
+    def __init__(self, timeout_ms: int, sql: str | None = None):
+        details: dict[str, Any] = {"timeoutMs": timeout_ms}
+        if sql:
+            details["sql"] = sql
+        super().__init__(
+            code="QUERY_TIMEOUT",
+            message=f"Query exceeded the statement timeout of {timeout_ms} ms",
+            details=details,
+        )
+
+
+class QueryTooExpensiveError(AppException):
+    def __init__(self, cost: float, max_cost: float, sql: str):
+        super().__init__(
+            code="QUERY_TOO_EXPENSIVE",
+            message=f"Estimated query cost {cost:g} exceeds the limit of {max_cost:g}",
+            details={"cost": cost, "maxCost": max_cost, "sql": sql},
+        )
+
+
+class ResultTooLargeError(AppException):
+    def __init__(self, limit_bytes: int):
+        super().__init__(
+            code="RESULT_TOO_LARGE",
+            message=f"Query result exceeds the maximum size of {limit_bytes} bytes",
+            details={"limitBytes": limit_bytes},
+        )
+
+
+class BlobTooLargeError(AppException):
+    def __init__(self, length_bytes: int, limit_bytes: int):
+        super().__init__(
+            code="BLOB_TOO_LARGE",
+            message=(
+                f"Value of {length_bytes} bytes exceeds the maximum fetch size of "
+                f"{limit_bytes} bytes"
+            ),
+            details={"lengthBytes": length_bytes, "limitBytes": limit_bytes},
+        )
+
+
+class InvalidCursorError(AppException):
+    def __init__(self, reason: str):
+        super().__init__(
+            code="INVALID_CURSOR",
+            message=f"Invalid continuation cursor: {reason}",
+            details={"reason": reason},
+        )
+
+
 class NlQueryGenerationError(AppException):
     def __init__(self, message: str):
         super().__init__(
             code="NL_QUERY_GENERATION_ERROR",
             message=message,
         )
+
+
+class LlmTimeoutError(AppException):
+    def __init__(self, timeout_seconds: float):
+        super().__init__(
+            code="NL_QUERY_TIMEOUT",
+            message=f"SQL generation exceeded the deadline of {timeout_seconds:g} s",
+            details={"timeoutSeconds": timeout_seconds},
+        )
+
+
+class LlmUnavailableError(AppException):
+    def __init__(self, reason: str, retry_after_seconds: float | None = None):
+        details: dict[str, Any] = {"reason": reason}
+        if retry_after_seconds is not None:
+            details["retryAfterSeconds"] = retry_after_seconds
+        super().__init__(
+            code="NL_QUERY_UNAVAILABLE",
+            message=f"The language model API is unavailable: {reason}",
+            details=details,
+        )
+
+
+class ProfileForbiddenError(AppException):
+    def __init__(self) -> None:
+        super().__init__(
+            code="PROFILE_FORBIDDEN",
+            message="Request profiling requires a valid X-Profile-Token",
+        )
+
+
+class ProfilerBusyError(AppException):
+    def __init__(self) -> None:
+        super().__init__(
+            code="PROFILER_BUSY",
+            message="Another request is being profiled; try again when it finishes",
+        )
+
+
+class ProfileNotFoundError(AppException):
+    def __init__(self, profile_id: str):
+        super().__init__(
+            code="PROFILE_NOT_FOUND",
+            message=f"Profile '{profile_id}' not found",
+            details={"id": profile_id},
+        )
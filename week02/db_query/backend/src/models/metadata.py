@@ -1,7 +1,8 @@
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
 from src.models import BaseResponseModel
+from src.models.database import CircuitBreakerResponse, ReplicaStatusResponse
 
 
 class TableType(str, Enum):
@@ -18,11 +19,29 @@ class ColumnMetadataResponse(BaseResponseModel):
     position: int
 
 
+class ForeignKeyResponse(BaseResponseModel):
+    constraint_name: Optional[str] = None
+    columns: list[str]
+    referred_schema: Optional[str] = None
+    referred_table: str
+    referred_columns: list[str]
+
+
+class IndexResponse(BaseResponseModel):
+    index_name: Optional[str] = None
+    columns: list[str]
+    is_unique: bool
+
+
 class TableMetadataResponse(BaseResponseModel):
     schema_name: str
     table_name: str
     table_type: TableType
+    row_estimate: Optional[int] = None
+    size_bytes: Optional[int] = None
     columns: list[ColumnMetadataResponse]
+    foreign_keys: list[ForeignKeyResponse] = []
+    indexes: list[IndexResponse] = []
 
 
 class DatabaseDetailResponse(BaseResponseModel):
@@ -30,6 +49,37 @@ class DatabaseDetailResponse(BaseResponseModel):
     connection_url: str
     created_at: str
     updated_at: str
+    statement_timeout_ms: Optional[int] = None
+    max_replica_lag_seconds: Optional[float] = None
+    replicas: list[ReplicaStatusResponse] = []
+    circuit: Optional[CircuitBreakerResponse] = None
     table_count: int
     view_count: int
     tables: list[TableMetadataResponse]
+
+
+class ValueCountResponse(BaseResponseModel):
+    value: Any
+    count: int
+
+
+class ColumnProfileResponse(BaseResponseModel):
+    column_name: str
+    data_type: str
+    null_count: int
+    null_fraction: Optional[float] = None
+    distinct_count: Optional[int] = None
+    distinct_approximate: bool = False
+    min_value: Any = None
+    max_value: Any = None
+    top_values: list[ValueCountResponse] = []
+
+
+class TableProfileResponse(BaseResponseModel):
+    schema_name: str
+    table_name: str
+    sample_rows: int
+    sample_limit: int
+    profiled_at: str
+    cached: bool
+    columns: list[ColumnProfileResponse]
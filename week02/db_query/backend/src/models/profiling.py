@@ -0,0 +1,18 @@
+from src.models import BaseResponseModel
+
+
+class ProfileResponse(BaseResponseModel):
+    """A saved request profile."""
+
+    id: str
+    kind: str
+    method: str
+    path: str
+    status: int | None = None
+    duration_ms: float
+    created_at: str
+    files: list[str]
+
+
+class ProfileListResponse(BaseResponseModel):
+    data: list[ProfileResponse]
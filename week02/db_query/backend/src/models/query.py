@@ -1,10 +1,21 @@
 from typing import Any
 
+from pydantic import Field
+
 from src.models import BaseResponseModel
 
 
 class QueryRequest(BaseResponseModel):
     sql: str
+    page_size: int | None = Field(default=None, ge=1, description="Rows per page (max 1000)")
+    lazy_blobs: bool = Field(
+        default=False,
+        description="Replace large binary values with descriptors fetched via /blob",
+    )
+
+
+class QueryCursorRequest(BaseResponseModel):
+    cursor: str
 
 
 class ColumnInfo(BaseResponseModel):
@@ -17,6 +28,7 @@ class QueryResultResponse(BaseResponseModel):
     rows: list[dict[str, Any]]
     row_count: int
     truncated: bool
+    next_cursor: str | None = None
 
 
 class NaturalLanguageRequest(BaseResponseModel):
@@ -26,3 +38,57 @@ class NaturalLanguageRequest(BaseResponseModel):
 class GeneratedQueryResponse(BaseResponseModel):
     sql: str
     explanation: str
+    context_tables: list[str] = Field(
+        default_factory=list, description="Tables included in the prompt's schema context"
+    )
+    total_tables: int | None = Field(default=None, description="Tables in the catalog")
+    context_tokens: int | None = Field(
+        default=None, description="Estimated token count of the schema context"
+    )
+    cache: str | None = Field(
+        default=None, description="exact or similar when the answer came from the cache"
+    )
+    similarity: float | None = Field(
+        default=None, description="Similarity of the cached question that was reused"
+    )
+
+
+class NlAnswerCacheStatsResponse(BaseResponseModel):
+    """Hit rate of a connection's generated SQL cache."""
+
+    entries: int
+    lookups: int
+    exact_hits: int
+    similar_hits: int
+    misses: int
+    hit_rate: float
+    latency_saved_ms: float = Field(description="Generation time of the answers served from cache")
+
+
+class AskRequest(BaseResponseModel):
+    question: str
+    page_size: int | None = Field(default=None, ge=1, description="Rows per page (max 1000)")
+    lazy_blobs: bool = Field(
+        default=False,
+        description="Replace large binary values with descriptors fetched via /blob",
+    )
+    refresh: bool = Field(default=False, description="Generate the SQL even if it is cached")
+    explain: bool = Field(
+        default=True, description="Check the EXPLAIN cost estimate before running the query"
+    )
+
+
+class AskTimings(BaseResponseModel):
+    generation_ms: float
+    execution_ms: float
+    total_ms: float
+
+
+class AskResponse(GeneratedQueryResponse):
+    """Generated SQL and the first page of its results."""
+
+    planner_cost: float | None = Field(
+        default=None, description="EXPLAIN cost estimate, when the database reports one"
+    )
+    timings: AskTimings
+    result: QueryResultResponse
@@ -0,0 +1,261 @@
+"""Cache of generated SQL for natural language questions.
+
+Answers are stored per connection and catalog version, keyed by the
+normalized question (case folded, whitespace collapsed, trailing punctuation
+dropped). A lookup first tries the exact normalized question, then the most
+similar cached question by cosine similarity of character trigrams. Cached
+questions are found through an inverted trigram index, so only questions
+sharing trigrams with the new one are compared. Similar questions must also
+use the same words apart from stopwords, so questions that differ in a
+negation, an ordering or a value ("shipped" vs "not shipped", "paid" vs
+"unpaid", "top 10" vs "top 20") never match by similarity.
+"""
+
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from src.config import settings
+
+NGRAM_SIZE = 3
+
+_WHITESPACE = re.compile(r"\s+")
+_NUMBERS = re.compile(r"\d+(?:\.\d+)?")
+_WORDS = re.compile(r"\d+(?:\.\d+)?|\w+")
+_TRAILING_PUNCTUATION = "?？!！.。;；,， "
+
+# Words that can be added or dropped without changing what is asked. Words
+# like "not", "no", "without", "asc" or "desc" are deliberately absent.
+STOPWORDS = frozenset(
+    "a an the me my our us i we you please can could would show list give get find "
+    "display return tell see want need what which who is are was were be do does "
+    "that this those these of for in on at to by from with all any".split()
+)
+
+
+def normalize_question(question: str) -> str:
+    question = unicodedata.normalize("NFKC", question).casefold()
+    return _WHITESPACE.sub(" ", question).strip().rstrip(_TRAILING_PUNCTUATION)
+
+
+def content_words(text: str) -> frozenset[str]:
+    return frozenset(word for word in _WORDS.findall(text) if word not in STOPWORDS)
+
+
+def char_ngrams(text: str, size: int = NGRAM_SIZE) -> Counter[str]:
+    padded = f" {text} "
+    if len(padded) <= size:
+        return Counter([padded])
+    return Counter(padded[i : i + size] for i in range(len(padded) - size + 1))
+
+
+@dataclass
+class CachedAnswer:
+    """A generated query and what it cost to generate."""
+
+    question: str
+    sql: str
+    explanation: str
+    generation_seconds: float
+    created_at: float
+    ngrams: Counter[str]
+    norm: float
+    numbers: tuple[str, ...]
+    words: frozenset[str]
+
+
+@dataclass
+class AnswerMatch:
+    """A cache hit."""
+
+    answer: CachedAnswer
+    match: str
+    similarity: float
+
+
+class AnswerStats:
+    """Hit counters for one connection."""
+
+    def __init__(self) -> None:
+        self.lookups = 0
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.saved_seconds = 0.0
+
+    def snapshot(self, entries: int) -> dict[str, Any]:
+        hits = self.exact_hits + self.similar_hits
+        return {
+            "entries": entries,
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.lookups - hits,
+            "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+            "latency_saved_ms": round(self.saved_seconds * 1000, 3),
+        }
+
+
+class _Bucket:
+    """Answers of one connection at one catalog version."""
+
+    def __init__(self, catalog_version: int | None):
+        self.catalog_version = catalog_version
+        self.answers: OrderedDict[str, CachedAnswer] = OrderedDict()
+        self.postings: dict[str, set[str]] = {}
+
+    def add(self, answer: CachedAnswer) -> None:
+        if answer.question in self.answers:
+            self.remove(answer.question)
+        self.answers[answer.question] = answer
+        for gram in answer.ngrams:
+            self.postings.setdefault(gram, set()).add(answer.question)
+
+    def remove(self, question: str) -> None:
+        answer = self.answers.pop(question)
+        for gram in answer.ngrams:
+            questions = self.postings[gram]
+            questions.discard(question)
+            if not questions:
+                del self.postings[gram]
+
+    def most_similar(
+        self,
+        ngrams: Counter[str],
+        norm: float,
+        numbers: tuple[str, ...],
+        words: frozenset[str],
+    ) -> tuple[CachedAnswer, float] | None:
+        dots: Counter[str] = Counter()
+        for gram, count in ngrams.items():
+            for question in self.postings.get(gram, ()):
+                dots[question] += count * self.answers[question].ngrams[gram]
+        best = None
+        for question, dot in dots.items():
+            answer = self.answers[question]
+            if answer.numbers != numbers or answer.words != words:
+                continue
+            similarity = dot / (norm * answer.norm)
+            if best is None or similarity > best[1]:
+                best = (answer, similarity)
+        return best
+
+
+class AnswerCache:
+    """Generated answers per connection, bounded per connection."""
+
+    def __init__(self, max_entries: int, similarity_threshold: float, max_age_seconds: float):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.max_age_seconds = max_age_seconds
+        self._buckets: dict[str, _Bucket] = {}
+        self._stats: dict[str, AnswerStats] = {}
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, db_name: str, catalog_version: int | None, question: str
+    ) -> AnswerMatch | None:
+        """Find a cached answer for a question and count the lookup."""
+        if self.max_entries <= 0:
+            return None
+        normalized = normalize_question(question)
+        with self._lock:
+            stats = self._stats.setdefault(db_name, AnswerStats())
+            stats.lookups += 1
+            bucket = self._buckets.get(db_name)
+            if bucket is None or bucket.catalog_version != catalog_version:
+                return None
+
+            match = None
+            answer = bucket.answers.get(normalized)
+            if answer is not None and not self._expired(answer):
+                match = AnswerMatch(answer=answer, match="exact", similarity=1.0)
+                stats.exact_hits += 1
+            else:
+                ngrams = char_ngrams(normalized)
+                best = bucket.most_similar(
+                    ngrams,
+                    _norm(ngrams),
+                    tuple(_NUMBERS.findall(normalized)),
+                    content_words(normalized),
+                )
+                if best is not None and best[1] >= self.similarity_threshold:
+                    answer, similarity = best
+                    if not self._expired(answer):
+                        match = AnswerMatch(
+                            answer=answer, match="similar", similarity=round(similarity, 4)
+                        )
+                        stats.similar_hits += 1
+            if match is None:
+                return None
+            bucket.answers.move_to_end(match.answer.question)
+            stats.saved_seconds += match.answer.generation_seconds
+            return match
+
+    def store(
+        self,
+        db_name: str,
+        catalog_version: int | None,
+        question: str,
+        sql: str,
+        explanation: str,
+        generation_seconds: float,
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        normalized = normalize_question(question)
+        ngrams = char_ngrams(normalized)
+        answer = CachedAnswer(
+            question=normalized,
+            sql=sql,
+            explanation=explanation,
+            generation_seconds=generation_seconds,
+            created_at=time.monotonic(),
+            ngrams=ngrams,
+            norm=_norm(ngrams),
+            numbers=tuple(_NUMBERS.findall(normalized)),
+            words=content_words(normalized),
+        )
+        with self._lock:
+            bucket = self._buckets.get(db_name)
+            # Answers for an older catalog may reference tables that changed
+            if bucket is None or bucket.catalog_version != catalog_version:
+                bucket = self._buckets[db_name] = _Bucket(catalog_version)
+            bucket.add(answer)
+            while len(bucket.answers) > self.max_entries:
+                bucket.remove(next(iter(bucket.answers)))
+
+    def stats(self, db_name: str) -> dict[str, Any]:
+        with self._lock:
+            bucket = self._buckets.get(db_name)
+            stats = self._stats.get(db_name) or AnswerStats()
+            return stats.snapshot(len(bucket.answers) if bucket else 0)
+
+    def invalidate(self, db_name: str) -> None:
+        """Drop a connection's answers and hit counters."""
+        with self._lock:
+            self._buckets.pop(db_name, None)
+            self._stats.pop(db_name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._stats.clear()
+
+    def _expired(self, answer: CachedAnswer) -> bool:
+        return time.monotonic() - answer.created_at > self.max_age_seconds
+
+
+def _norm(ngrams: Counter[str]) -> float:
+    return math.sqrt(sum(count * count for count in ngrams.values()))
+
+
+answer_cache = AnswerCache(
+    settings.nl_answer_cache_entries,
+    settings.nl_answer_similarity,
+    settings.nl_answer_max_age_seconds,
+)
@@ -0,0 +1,76 @@
+"""Helpers for answering a question in one request (``POST /dbs/{name}/ask``).
+
+The route generates SQL for the question, checks it and runs it. While the
+LLM is generating, :meth:`AskService.warm_read_engine` opens a connection on
+the engine the query will use, so the pool (and, for a connection that was
+idle, the TCP/TLS handshake and login) is ready by the time the SQL arrives.
+"""
+
+from sqlalchemy import text
+
+from src.adapters import adapter_factory
+from src.config import settings
+from src.models.errors import QueryTimeoutError, QueryTooExpensiveError
+from src.services.connection import ConnectionManager
+from src.services.query import QueryService
+
+
+class AskService:
+    """Connection warm-up and cost guard for one-shot questions."""
+
+    @classmethod
+    def warm_read_engine(cls, db_name: str, connection_url: str) -> None:
+        """Check out and return a pooled connection on the read engine."""
+        engine = ConnectionManager.get_read_engine(db_name, connection_url)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    @classmethod
+    def check_cost(
+        cls,
+        db_name: str,
+        connection_url: str,
+        sql: str,
+        statement_timeout_ms: int | None = None,
+        max_cost: float | None = None,
+    ) -> float | None:
+        """Estimate a query's cost with EXPLAIN and reject it over the limit.
+
+        Args:
+            db_name: Database connection name
+            connection_url: Database connection URL
+            sql: Validated SELECT statement
+            statement_timeout_ms: Per-connection statement timeout
+            max_cost: Cost limit (defaults to ``settings.ask_max_query_cost``;
+                0 only reports the estimate)
+
+        Returns:
+            The planner's cost estimate, or None if the database reports none
+
+        Raises:
+            QueryTooExpensiveError: If the estimate exceeds the limit
+            QueryTimeoutError: If planning hit the statement timeout
+        """
+        if max_cost is None:
+            max_cost = settings.ask_max_query_cost
+        adapter = adapter_factory.get_adapter(connection_url)
+        timeout_ms = QueryService.resolve_statement_timeout(statement_timeout_ms)
+        base_sql = sql.strip().rstrip(";").strip()
+
+        # Plan on the endpoint the query will run on
+        if QueryService.is_read_only(base_sql):
+            engine = ConnectionManager.get_read_engine(db_name, connection_url)
+        else:
+            engine = ConnectionManager.get_engine(db_name, connection_url)
+        with engine.connect() as conn:
+            try:
+                with adapter.statement_timeout(conn, timeout_ms):
+                    cost = adapter.explain_cost(conn, base_sql)
+            except Exception as e:
+                if timeout_ms and adapter.is_timeout_error(e):
+                    raise QueryTimeoutError(timeout_ms, base_sql) from e
+                raise
+
+        if cost is not None and max_cost and cost > max_cost:
+            raise QueryTooExpensiveError(cost, max_cost, base_sql)
+        return cost
@@ -0,0 +1,187 @@
+"""Large binary value handling.
+
+In lazy mode, binary values above a size threshold are replaced in query
+results by a small descriptor. The full value is fetched on demand by primary
+key through ``GET /dbs/{name}/blob``. Fetched values are read into memory
+whole, so values above ``blob_fetch_max_bytes`` are refused; the size is
+checked in the query itself, so an oversized value is never transferred.
+"""
+
+import hashlib
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import text
+
+from src.adapters import adapter_factory
+from src.config import settings
+from src.lazy_import import lazy_import
+from src.models.errors import BlobTooLargeError, QueryTimeoutError
+from src.services.connection import ConnectionManager
+
+if TYPE_CHECKING:
+    from sqlglot import exp
+else:
+    exp = lazy_import("sqlglot.expressions")
+
+# (magic prefix, content type) pairs checked in order
+_MAGIC_NUMBERS: list[tuple[bytes, str]] = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"BM", "image/bmp"),
+    (b"OggS", "audio/ogg"),
+    (b"ID3", "audio/mpeg"),
+]
+
+# Number of hex characters of the SHA-256 digest included in descriptors
+DIGEST_PREFIX_LENGTH = 16
+
+BINARY_TYPES = (bytes, bytearray, memoryview)
+
+
+def sniff_content_type(value: bytes) -> str:
+    """Guess a content type from the leading bytes of a value."""
+    for magic, content_type in _MAGIC_NUMBERS:
+        if value.startswith(magic):
+            return content_type
+    if value[:4] == b"RIFF" and value[8:12] == b"WEBP":
+        return "image/webp"
+    head = value[:1024]
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character may be cut off at the end of the sample
+        if e.start < len(head) - 3:
+            return "application/octet-stream"
+    if b"\x00" in head:
+        return "application/octet-stream"
+    return "text/plain"
+
+
+def describe_blob(value: bytes | bytearray | memoryview) -> dict[str, Any]:
+    """Build the descriptor that replaces a large binary value in results."""
+    data = bytes(value)
+    return {
+        "$blob": True,
+        "length": len(data),
+        "sha256": hashlib.sha256(data).hexdigest()[:DIGEST_PREFIX_LENGTH],
+        "contentType": sniff_content_type(data),
+    }
+
+
+class BlobService:
+    """Service for fetching single large values by primary key."""
+
+    @classmethod
+    def build_fetch_sql(
+        cls,
+        dialect: str,
+        schema_name: str | None,
+        table_name: str,
+        column_name: str,
+        key_columns: list[str],
+        byte_length: "Callable[[exp.Expression], exp.Expression] | None" = None,
+    ) -> str:
+        """Build ``SELECT column FROM table WHERE pk = :k0 ...`` with quoted names.
+
+        With ``byte_length``, the query selects the size of the value and the
+        value itself only when the size is at most ``:max_bytes``.
+        """
+
+        condition = exp.and_(
+            *(
+                exp.EQ(this=exp.column(key, quoted=True), expression=exp.var(f":k{i}"))
+                for i, key in enumerate(key_columns)
+            )
+        )
+        column = exp.column(column_name, quoted=True)
+        if byte_length is None:
+            projections: list[exp.Expression] = [column]
+        else:
+            within_cap = exp.LTE(this=byte_length(column), expression=exp.var(":max_bytes"))
+            projections = [
+                byte_length(column.copy()),
+                exp.Case(ifs=[exp.If(this=within_cap, true=column.copy())]),
+            ]
+        query = (
+            exp.select(*projections)
+            .from_(exp.table_(table_name, db=schema_name, quoted=True))
+            .where(condition)
+        )
+        return query.sql(dialect=dialect)
+
+    @classmethod
+    def fetch_blob(
+        cls,
+        db_name: str,
+        connection_url: str,
+        schema_name: str | None,
+        table_name: str,
+        column_name: str,
+        key: dict[str, Any],
+        timeout_ms: int | None = None,
+        max_bytes: int | None = None,
+    ) -> tuple[bool, bytes | None]:
+        """Fetch one value by primary key.
+
+        Args:
+            db_name: Database connection name
+            connection_url: Database connection URL
+            schema_name: Schema of the table (None for the default schema)
+            table_name: Table name
+            column_name: Column holding the value
+            key: Primary key column values identifying the row
+            timeout_ms: Statement timeout in milliseconds (None disables it)
+            max_bytes: Largest value returned (None uses ``blob_fetch_max_bytes``,
+                0 disables the cap)
+
+        Returns:
+            Tuple of (row_found, value as bytes or None if NULL)
+
+        Raises:
+            BlobTooLargeError: If the value is larger than the cap
+        """
+        if max_bytes is None:
+            max_bytes = settings.blob_fetch_max_bytes
+        adapter = adapter_factory.get_adapter(connection_url)
+        engine = ConnectionManager.get_engine(db_name, connection_url)
+        key_columns = list(key)
+        sql = cls.build_fetch_sql(
+            adapter.sqlglot_dialect,
+            schema_name if adapter.supports_schemas else None,
+            table_name,
+            column_name,
+            key_columns,
+            byte_length=adapter.byte_length_expression if max_bytes > 0 else None,
+        )
+        sql = adapter.add_statement_timeout_hint(sql, timeout_ms)
+        params = {f"k{i}": key[column] for i, column in enumerate(key_columns)}
+        if max_bytes > 0:
+            params["max_bytes"] = max_bytes
+
+        with engine.connect() as conn:
+            try:
+                with adapter.statement_timeout(conn, timeout_ms):
+                    row = conn.execute(text(sql), params).first()
+            except Exception as e:
+                if timeout_ms and adapter.is_timeout_error(e):
+                    raise QueryTimeoutError(timeout_ms, sql) from e
+                raise
+
+        if row is None:
+            return False, None
+        if max_bytes > 0 and row[0] is not None and row[0] > max_bytes:
+            raise BlobTooLargeError(int(row[0]), max_bytes)
+        value = row[-1]
+        if value is None:
+            return True, None
+        if isinstance(value, str):
+            return True, value.encode("utf-8")
+        if isinstance(value, BINARY_TYPES):
+            return True, bytes(value)
+        return True, str(value).encode("utf-8")
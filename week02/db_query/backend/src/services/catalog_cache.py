@@ -0,0 +1,93 @@
+"""Cache of serialized catalog bodies for the database detail endpoint.
+
+A connection's table list only changes when its catalog is extracted again,
+which bumps the catalog version. The serialized tables are kept per
+(connection, catalog version), and complete compressed bodies per
+(connection, catalog version, encoding, status header), so repeated catalog
+GETs skip the metadata queries, the JSON encoding and the compression. The
+status header (replica health, circuit state) is small and rebuilt on every
+request, so it is part of the key rather than served stale.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.config import settings
+
+CatalogBodyKey = tuple[str, int | None, str, bytes]
+
+
+@dataclass(frozen=True)
+class CatalogTables:
+    """A connection's tables serialized as a JSON array, with their counts."""
+
+    body: bytes
+    table_count: int
+    view_count: int
+
+
+class CatalogBodyCache:
+    """Serialized tables per catalog version and an LRU of compressed bodies."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._tables: dict[str, tuple[int | None, CatalogTables]] = {}
+        self._bodies: OrderedDict[CatalogBodyKey, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_tables(self, db_name: str, catalog_version: int | None) -> CatalogTables | None:
+        with self._lock:
+            entry = self._tables.get(db_name)
+            if entry is None or entry[0] != catalog_version:
+                return None
+            return entry[1]
+
+    def put_tables(
+        self, db_name: str, catalog_version: int | None, tables: CatalogTables
+    ) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            # Only the current catalog version of a connection is kept
+            self._tables[db_name] = (catalog_version, tables)
+
+    def get_body(self, key: CatalogBodyKey) -> bytes | None:
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._bodies.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put_body(self, key: CatalogBodyKey, body: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._bodies[key] = body
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+
+    def invalidate(self, db_name: str) -> None:
+        """Drop everything cached for a connection."""
+        with self._lock:
+            self._tables.pop(db_name, None)
+            for key in [key for key in self._bodies if key[0] == db_name]:
+                del self._bodies[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+            self._bodies.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+
+catalog_body_cache = CatalogBodyCache(settings.compression_cache_entries)
@@ -0,0 +1,87 @@
+"""Circuit breaker for connections to upstream databases.
+
+A breaker starts **closed**. After ``failure_threshold`` consecutive
+connection failures it **opens**, and new connection attempts fail
+immediately for ``cooldown_seconds``. After the cool-down it is
+**half-open**: a single probe attempt is let through. If the probe connects,
+the breaker closes again. If it fails, the breaker reopens for another
+cool-down.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Tracks consecutive connection failures for one endpoint."""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        cooldown_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._cooldown_elapsed():
+                return HALF_OPEN
+            return self._state
+
+    @property
+    def consecutive_failures(self) -> int:
+        return self._consecutive_failures
+
+    def retry_after_seconds(self) -> float | None:
+        """Seconds until a probe is allowed, or None if the breaker isn't open."""
+        with self._lock:
+            if self._state != OPEN:
+                return None
+            return max(0.0, self._opened_at + self.cooldown_seconds - self._clock())
+
+    def allow_request(self) -> bool:
+        """Check whether a connection attempt may go ahead.
+
+        When the cool-down has elapsed, the first caller becomes the half-open
+        probe; other callers keep failing fast until the probe reports back.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._cooldown_elapsed():
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def _cooldown_elapsed(self) -> bool:
+        return self._clock() - self._opened_at >= self.cooldown_seconds
@@ -4,15 +4,29 @@ This module provides connection management using the adapter pattern.
 Database-specific behavior is delegated to the appropriate adapter.
 """
 
+import threading
+import time
 import warnings
+from dataclasses import dataclass
+from typing import Any
 from urllib.parse import urlparse
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.engine.interfaces import DBAPIConnection, Dialect
+from sqlalchemy.pool import ConnectionPoolEntry
 
 from src.adapters import adapter_factory
-from src.models.errors import ConnectionFailedError
+from src.adapters.base import PoolConfig
+from src.config import settings
+from src.models.errors import CircuitOpenError, ConnectionFailedError
+from src.services.circuit_breaker import CLOSED, CircuitBreaker
+from src.services.pool import (
+    InstrumentedQueuePool,
+    engine_pool,
+    instrument_engine,
+    merge_pool_config,
+)
 
 
 # =============================================================================
@@ -69,10 +83,46 @@ def extract_database_name(connection_url: str) -> str | None:
 # =============================================================================
 
 
+@dataclass
+class ReplicaEndpoint:
+    """A read replica of a registered connection and its last health check."""
+
+    url: str
+    healthy: bool = False
+    lag_seconds: float | None = None
+    last_checked: float | None = None
+    last_error: str | None = None
+
+
+@dataclass
+class ReplicaSet:
+    """The read replicas registered for one connection."""
+
+    replicas: list[ReplicaEndpoint]
+    max_lag_seconds: float | None = None
+
+
 class ConnectionManager:
-    """Manages database engine instances using the adapter pattern."""
+    """Manages database engine instances using the adapter pattern.
+
+    Each endpoint (the primary URL and every replica URL of a connection) has
+    its own engine and pool. Read-only queries can be routed to the
+    least-loaded healthy replica with :meth:`get_read_engine`; everything
+    else, including catalog extraction, uses the primary.
+
+    Every endpoint also has a :class:`CircuitBreaker`. New DB-API connections
+    are opened through it, so an unreachable database fails fast with
+    ``CONNECTION_FAILED`` instead of every request waiting out the driver's
+    connect timeout.
+    """
 
     _engines: dict[str, Engine] = {}
+    _engine_lock = threading.RLock()
+    _pool_overrides: dict[str, dict[str, Any]] = {}
+    _breakers: dict[str, CircuitBreaker] = {}
+    _breaker_lock = threading.Lock()
+    _replica_sets: dict[str, ReplicaSet] = {}
+    _replica_lock = threading.Lock()
 
     @classmethod
     def get_engine(cls, name: str, connection_url: str) -> Engine:
@@ -92,24 +142,110 @@ class ConnectionManager:
         adapter = adapter_factory.get_adapter(connection_url)
         normalized_url = adapter.normalize_url(connection_url)
 
-        cache_key = f"{name}:{normalized_url}"
-        if cache_key not in cls._engines:
-            # Create engine using adapter's pool configuration
-            pool_config = adapter.default_pool_config
+        cache_key = cls._endpoint_key(name, connection_url)
+        with cls._engine_lock:
+            if cache_key not in cls._engines:
+                # Adapter defaults with the connection's own overrides applied
+                pool_config = cls.get_pool_config(name, connection_url)
+                engine = create_engine(
+                    normalized_url,
+                    poolclass=InstrumentedQueuePool,
+                    **pool_config.to_engine_kwargs(),
+                )
+                instrument_engine(engine, pool_config)
+                cls._guard_connects(engine, name, cls.get_breaker(name, connection_url))
+                cls._engines[cache_key] = engine
+            return cls._engines[cache_key]
+
+    @classmethod
+    def find_engine(cls, name: str, connection_url: str) -> Engine | None:
+        """Return the cached engine for an endpoint without creating one."""
+        cache_key = cls._endpoint_key(name, connection_url)
+        with cls._engine_lock:
+            return cls._engines.get(cache_key)
+
+    @classmethod
+    def get_pool_config(cls, name: str, connection_url: str) -> PoolConfig:
+        """Return the effective pool settings for one of a connection's endpoints."""
+        adapter = adapter_factory.get_adapter(connection_url)
+        return merge_pool_config(adapter.default_pool_config, cls._pool_overrides.get(name))
+
+    @classmethod
+    def configure_pool(cls, name: str, overrides: dict[str, Any] | None) -> None:
+        """Set a connection's pool settings and rebuild its pools.
+
+        The connection's engines are replaced lazily: the old engines are
+        disposed, which closes their idle connections, while connections that
+        are checked out (running queries, open cursors) keep working and are
+        closed when they are returned.
+
+        Args:
+            name: Connection name
+            overrides: PoolConfig fields to override (None or empty uses the
+                adapter defaults)
+        """
+        with cls._engine_lock:
+            if overrides:
+                cls._pool_overrides[name] = dict(overrides)
+            else:
+                cls._pool_overrides.pop(name, None)
+            prefix = f"{name}:"
+            stale = [key for key in cls._engines if key.startswith(prefix)]
+            old_engines = [cls._engines.pop(key) for key in stale]
+        for engine in old_engines:
+            engine.dispose()
+
+    @classmethod
+    def get_pool_stats(cls, name: str, connection_url: str) -> dict[str, Any]:
+        """Return live connection counts and checkout statistics for an endpoint."""
+        pool = engine_pool(cls.get_engine(name, connection_url))
+        return pool.stats.snapshot(pool)
+
+    @classmethod
+    def _endpoint_key(cls, name: str, connection_url: str) -> str:
+        adapter = adapter_factory.get_adapter(connection_url)
+        return f"{name}:{adapter.normalize_url(connection_url)}"
 
-            # Build engine kwargs, only include pool_recycle if not None
-            engine_kwargs = {
-                "poolclass": QueuePool,
-                "pool_size": pool_config.pool_size,
-                "max_overflow": pool_config.max_overflow,
-                "pool_pre_ping": pool_config.pool_pre_ping,
-            }
-            # Only add pool_recycle if it has a valid value
-            if pool_config.pool_recycle is not None:
-                engine_kwargs["pool_recycle"] = pool_config.pool_recycle
+    @classmethod
+    def get_breaker(cls, name: str, connection_url: str) -> CircuitBreaker:
+        """Get or create the circuit breaker for an endpoint.
 
-            cls._engines[cache_key] = create_engine(normalized_url, **engine_kwargs)
-        return cls._engines[cache_key]
+        Args:
+            name: Connection name
+            connection_url: Endpoint connection URL
+
+        Returns:
+            CircuitBreaker shared by all connections to the endpoint
+        """
+        key = cls._endpoint_key(name, connection_url)
+        with cls._breaker_lock:
+            if key not in cls._breakers:
+                cls._breakers[key] = CircuitBreaker(
+                    failure_threshold=settings.circuit_failure_threshold,
+                    cooldown_seconds=settings.circuit_cooldown_seconds,
+                )
+            return cls._breakers[key]
+
+    @classmethod
+    def _guard_connects(cls, engine: Engine, name: str, breaker: CircuitBreaker) -> None:
+        """Open the engine's DB-API connections through the circuit breaker."""
+
+        @event.listens_for(engine, "do_connect")
+        def connect_through_breaker(
+            dialect: Dialect,
+            conn_rec: ConnectionPoolEntry,
+            cargs: tuple[Any, ...],
+            cparams: dict[str, Any],
+        ) -> DBAPIConnection:
+            if not breaker.allow_request():
+                raise CircuitOpenError(name, breaker.retry_after_seconds())
+            try:
+                dbapi_connection = dialect.connect(*cargs, **cparams)
+            except Exception:
+                breaker.record_failure()
+                raise
+            breaker.record_success()
+            return dbapi_connection
 
     @classmethod
     def remove_engine(cls, name: str, connection_url: str) -> None:
@@ -119,12 +255,129 @@ class ConnectionManager:
             name: Connection name
             connection_url: Database connection URL
         """
-        adapter = adapter_factory.get_adapter(connection_url)
-        normalized_url = adapter.normalize_url(connection_url)
-        cache_key = f"{name}:{normalized_url}"
-        if cache_key in cls._engines:
-            cls._engines[cache_key].dispose()
-            del cls._engines[cache_key]
+        cache_key = cls._endpoint_key(name, connection_url)
+        with cls._engine_lock:
+            engine = cls._engines.pop(cache_key, None)
+        if engine is not None:
+            engine.dispose()
+        with cls._breaker_lock:
+            cls._breakers.pop(cache_key, None)
+
+    @classmethod
+    def configure_replicas(
+        cls,
+        name: str,
+        replica_urls: list[str] | None,
+        max_lag_seconds: float | None = None,
+    ) -> None:
+        """Register the read replicas of a connection.
+
+        Replicas start out unhealthy and receive reads once a health check
+        has passed. Engines of replicas that are no longer listed are disposed.
+
+        Args:
+            name: Connection name
+            replica_urls: Replica connection URLs (None or empty removes all)
+            max_lag_seconds: Replicas lagging further behind are skipped
+                (None disables the gate)
+        """
+        replica_urls = replica_urls or []
+        with cls._replica_lock:
+            previous = cls._replica_sets.pop(name, None)
+            existing = {r.url: r for r in previous.replicas} if previous else {}
+            if replica_urls:
+                cls._replica_sets[name] = ReplicaSet(
+                    replicas=[existing.get(url) or ReplicaEndpoint(url=url) for url in replica_urls],
+                    max_lag_seconds=max_lag_seconds,
+                )
+        for url in set(existing) - set(replica_urls):
+            cls.remove_engine(name, url)
+        if replica_urls:
+            replica_monitor.wake()
+
+    @classmethod
+    def remove_replicas(cls, name: str) -> None:
+        """Forget a connection's replicas and dispose of their engines."""
+        cls.configure_replicas(name, None)
+
+    @classmethod
+    def get_replicas(cls, name: str) -> list[ReplicaEndpoint]:
+        """Return the replicas registered for a connection."""
+        with cls._replica_lock:
+            replica_set = cls._replica_sets.get(name)
+            return list(replica_set.replicas) if replica_set else []
+
+    @classmethod
+    def get_read_engine(cls, name: str, connection_url: str) -> Engine:
+        """Pick the engine for a read-only query.
+
+        Chooses the healthy replica (within the lag gate, with a closed
+        circuit breaker) with the fewest checked-out connections, falling back
+        to the primary when no replica is eligible.
+
+        Args:
+            name: Connection name
+            connection_url: Primary connection URL
+
+        Returns:
+            SQLAlchemy Engine for the chosen endpoint
+        """
+        with cls._replica_lock:
+            replica_set = cls._replica_sets.get(name)
+            replicas = replica_set.replicas if replica_set else []
+            max_lag = replica_set.max_lag_seconds if replica_set else None
+            candidates = [
+                replica.url
+                for replica in replicas
+                if replica.healthy
+                and (
+                    max_lag is None
+                    or (replica.lag_seconds is not None and replica.lag_seconds <= max_lag)
+                )
+            ]
+        candidates = [url for url in candidates if cls.get_breaker(name, url).state == CLOSED]
+        if not candidates:
+            return cls.get_engine(name, connection_url)
+
+        engines = [cls.get_engine(name, url) for url in candidates]
+        return min(engines, key=lambda engine: engine_pool(engine).checkedout())
+
+    @classmethod
+    def check_replicas(cls) -> None:
+        """Run a health and lag check against every registered replica.
+
+        Lag is only measured for connections with a lag gate. A failed lag
+        query leaves the replica healthy with an unknown lag, which the gate
+        excludes from routing.
+        """
+        with cls._replica_lock:
+            targets = [
+                (name, replica, replica_set.max_lag_seconds)
+                for name, replica_set in cls._replica_sets.items()
+                for replica in replica_set.replicas
+            ]
+
+        for name, replica, max_lag_seconds in targets:
+            lag, error = None, None
+            try:
+                adapter = adapter_factory.get_adapter(replica.url)
+                engine = cls.get_engine(name, replica.url)
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                    if max_lag_seconds is not None:
+                        try:
+                            lag = adapter.replication_lag_seconds(conn)
+                        except Exception as e:
+                            error = f"Replication lag unavailable: {e}"
+                healthy = True
+            except Exception as e:
+                healthy, error, lag = False, str(e), None
+
+            with cls._replica_lock:
+                replica.healthy = healthy
+                replica.lag_seconds = lag
+                replica.last_error = error
+                replica.last_checked = time.time()
 
     @classmethod
     def test_connection(cls, name: str, connection_url: str) -> bool:
@@ -138,8 +391,12 @@ class ConnectionManager:
             True if connection is successful
 
         Raises:
-            ConnectionFailedError: If connection fails
+            ConnectionFailedError: If connection fails or the endpoint's
+                circuit breaker is open
         """
+        breaker = cls.get_breaker(name, connection_url)
+        if not breaker.allow_request():
+            raise CircuitOpenError(name, breaker.retry_after_seconds())
         try:
             adapter = adapter_factory.get_adapter(connection_url)
             normalized_url = adapter.normalize_url(connection_url)
@@ -147,9 +404,11 @@ class ConnectionManager:
             with engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
             engine.dispose()
-            return True
         except Exception as e:
+            breaker.record_failure()
             raise ConnectionFailedError(name, str(e))
+        breaker.record_success()
+        return True
 
     @classmethod
     def get_engine_for_query(cls, connection_url: str) -> Engine:
@@ -180,3 +439,42 @@ class ConnectionManager:
         with engine.connect() as conn:
             result = conn.execute(text(sql))
             return [dict(row._mapping) for row in result]
+
+
+class ReplicaMonitor:
+    """Background thread that periodically health-checks read replicas."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="replica-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def wake(self) -> None:
+        """Run a check now instead of waiting for the next interval."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            ConnectionManager.check_replicas()
+            self._wake.wait(self.interval_seconds)
+
+
+replica_monitor = ReplicaMonitor(settings.replica_health_interval_seconds)
@@ -0,0 +1,191 @@
+"""Async client for the OpenAI-compatible LLM API.
+
+Requests go through one pooled HTTP client that keeps connections alive
+between calls. Each request has a deadline covering the wait for a
+concurrency slot, every attempt and the pauses between attempts. Rate
+limited (429), server error (5xx) and connection failures are retried with
+full-jitter exponential backoff; a ``Retry-After`` header from the server is
+respected as long as the deadline allows it. At most ``llm_max_concurrency``
+requests are sent at once; the others wait for a slot.
+
+Streamed responses are retried only until the response starts; the deadline
+and the concurrency slot cover the whole stream.
+
+The HTTP client and the semaphore belong to an event loop, so they are
+recreated when the client is used from a different loop (e.g. in tests).
+
+``openai`` takes longer to import than the rest of the app together, so it
+is imported on the first request rather than at startup
+(see :mod:`src.lazy_import`).
+"""
+
+import asyncio
+import random
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any
+
+from src.lazy_import import lazy_import
+from src.models.errors import LlmTimeoutError, LlmUnavailableError
+
+if TYPE_CHECKING:
+    import openai
+    from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
+else:
+    openai = lazy_import("openai")
+
+
+class LlmClient:
+    """Chat completions with deadlines, retries and a concurrency limit."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        timeout_seconds: float,
+        max_retries: int,
+        retry_base_seconds: float,
+        max_concurrency: int,
+        max_connections: int,
+        rng: random.Random | None = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.rng = rng or random.Random()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: openai.AsyncOpenAI | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _bind(self) -> "tuple[openai.AsyncOpenAI, asyncio.Semaphore]":
+        loop = asyncio.get_running_loop()
+        client, semaphore = self._client, self._semaphore
+        if self._loop is not loop or client is None or semaphore is None:
+            # Use the Limits class of the HTTP library openai was built on,
+            # which may not be the httpx package
+            limits = type(openai.DEFAULT_CONNECTION_LIMITS)(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            )
+            client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                # Retries are handled here, within the request's deadline
+                max_retries=0,
+                http_client=openai.DefaultAsyncHttpxClient(limits=limits),
+            )
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop, self._client, self._semaphore = loop, client, semaphore
+        return client, semaphore
+
+    async def chat(
+        self, messages: "list[ChatCompletionMessageParam]", **kwargs: Any
+    ) -> str | None:
+        """Send a chat completion request and return the message content.
+
+        Raises:
+            LlmTimeoutError: The deadline passed before a response arrived
+            LlmUnavailableError: The API kept failing with 429/5xx or
+                connection errors
+        """
+        client, semaphore = self._bind()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_seconds
+        try:
+            async with asyncio.timeout_at(deadline):
+                async with semaphore:
+                    response: ChatCompletion = await self._send(
+                        client, messages, deadline, kwargs
+                    )
+        except (TimeoutError, openai.APITimeoutError) as e:
+            raise LlmTimeoutError(self.timeout_seconds) from e
+        return response.choices[0].message.content
+
+    async def stream_chat(
+        self, messages: "list[ChatCompletionMessageParam]", **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Send a streaming chat completion request and yield content deltas.
+
+        Raises:
+            LlmTimeoutError: The deadline passed before the stream ended
+            LlmUnavailableError: The API kept failing before the stream started
+        """
+        client, semaphore = self._bind()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_seconds
+
+        def remaining() -> float:
+            return max(deadline - loop.time(), 0.0)
+
+        # Every wait is bounded separately: a timeout scope can't span the
+        # yields, where the caller's code runs
+        try:
+            await asyncio.wait_for(semaphore.acquire(), remaining())
+        except TimeoutError as e:
+            raise LlmTimeoutError(self.timeout_seconds) from e
+        try:
+            try:
+                stream = await asyncio.wait_for(
+                    self._send(client, messages, deadline, {**kwargs, "stream": True}),
+                    remaining(),
+                )
+            except (TimeoutError, openai.APITimeoutError) as e:
+                raise LlmTimeoutError(self.timeout_seconds) from e
+            try:
+                chunks = aiter(stream)
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(anext(chunks), remaining())
+                    except StopAsyncIteration:
+                        return
+                    except (TimeoutError, openai.APITimeoutError) as e:
+                        raise LlmTimeoutError(self.timeout_seconds) from e
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
+        finally:
+            semaphore.release()
+
+    async def _send(
+        self,
+        client: "openai.AsyncOpenAI",
+        messages: "list[ChatCompletionMessageParam]",
+        deadline: float,
+        kwargs: dict[str, Any],
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            try:
+                return await client.chat.completions.create(
+                    messages=messages,
+                    timeout=max(deadline - loop.time(), 0.001),
+                    **kwargs,
+                )
+            except openai.APITimeoutError:
+                raise
+            except (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError) as e:
+                retry_after = _retry_after(e)
+                if attempt >= self.max_retries:
+                    raise LlmUnavailableError(str(e), retry_after) from e
+                delay = self.rng.uniform(0, self.retry_base_seconds * 2**attempt)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                if loop.time() + delay >= deadline:
+                    raise LlmUnavailableError(str(e), retry_after) from e
+                attempt += 1
+                await asyncio.sleep(delay)
+
+
+def _retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after", ""))
+    except ValueError:
+        return None
@@ -5,12 +5,18 @@ Database-specific behavior is delegated to the appropriate adapter.
 """
 
 import warnings
+from typing import Any
 
-from sqlalchemy import inspect
+from sqlalchemy import Inspector, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import ReflectedForeignKeyConstraint
 
 from src.adapters import adapter_factory
+from src.adapters.base import DatabaseAdapter, TableStatistics
 from src.db.repository import (
     ColumnMetadataRepository,
+    ForeignKeyMetadataRepository,
+    IndexMetadataRepository,
     TableMetadataRepository,
 )
 from src.services.connection import ConnectionManager
@@ -75,7 +81,9 @@ class MetadataService:
         """Extract metadata (tables, views, columns) from a database.
 
         Uses the appropriate adapter to handle database-specific
-        schema extraction and type normalization.
+        schema extraction and type normalization. Foreign keys and indexes
+        of tables are read for a whole schema at once and stored in the same
+        metadata store.
 
         Args:
             db_name: Database connection name
@@ -86,6 +94,8 @@ class MetadataService:
         Returns:
             Tuple of (table_count, view_count)
         """
+        foreign_key_repo = ForeignKeyMetadataRepository(table_repo.db)
+        index_repo = IndexMetadataRepository(table_repo.db)
         engine = ConnectionManager.get_engine(db_name, connection_url)
         inspector = inspect(engine)
 
@@ -103,14 +113,27 @@ class MetadataService:
 
         for schema_info in schemas:
             schema_name = schema_info.name
+            statistics = cls._extract_table_statistics(
+                engine, adapter, schema_name if adapter.supports_schemas else None
+            )
+            foreign_keys, indexes = cls._extract_relationships(
+                inspector, schema_name if adapter.supports_schemas else None
+            )
+            comments = cls._extract_table_comments(
+                inspector, schema_name if adapter.supports_schemas else None
+            )
 
             # Extract tables
             for table_name in inspector.get_table_names(schema=schema_name if adapter.supports_schemas else None):
+                table_stats = statistics.get(table_name, TableStatistics())
                 table = table_repo.create(
                     db_name=db_name,
                     schema_name=schema_name,
                     table_name=table_name,
                     table_type="table",
+                    row_estimate=table_stats.row_estimate,
+                    size_bytes=table_stats.size_bytes,
+                    comment=comments.get(table_name),
                 )
                 cls._extract_columns(
                     inspector=inspector,
@@ -120,6 +143,8 @@ class MetadataService:
                     column_repo=column_repo,
                     adapter=adapter,
                 )
+                foreign_key_repo.create_many(table.id, foreign_keys.get(table_name, []))
+                index_repo.create_many(table.id, indexes.get(table_name, []))
                 table_count += 1
 
             # Extract views
@@ -142,6 +167,84 @@ class MetadataService:
 
         return table_count, view_count
 
+    @classmethod
+    def _extract_table_statistics(
+        cls, engine: Engine, adapter: DatabaseAdapter, schema_name: str | None
+    ) -> dict[str, TableStatistics]:
+        """Read row count and size estimates for a schema's tables.
+
+        Statistics are optional: if they can't be read (missing privileges,
+        no ANALYZE yet), tables are stored without estimates.
+        """
+        try:
+            with engine.connect() as conn:
+                return adapter.extract_table_statistics(conn, schema_name)
+        except Exception:
+            return {}
+
+    @classmethod
+    def _extract_table_comments(cls, inspector: Inspector, schema_name: str | None) -> dict[str, str]:
+        """Read table comments of a schema (SQLite has none)."""
+        try:
+            comments = inspector.get_multi_table_comment(schema=schema_name)
+        except NotImplementedError:
+            return {}
+        return {
+            table_name: text
+            for (_, table_name), comment in comments.items()
+            if (text := comment.get("text"))
+        }
+
+    @classmethod
+    def _extract_relationships(
+        cls, inspector: Inspector, schema_name: str | None
+    ) -> tuple[dict[str, list[ReflectedForeignKeyConstraint]], dict[str, list[dict[str, Any]]]]:
+        """Read foreign keys and indexes of all tables in a schema.
+
+        Unique constraints that aren't backed by a reported index (SQLite
+        hides their automatic indexes) are added as unique indexes. Expression
+        index entries are replaced by their expression text.
+
+        Returns:
+            Tuple of (foreign keys, indexes), each keyed by table name
+        """
+        foreign_keys = {
+            table_name: fks
+            for (_, table_name), fks in inspector.get_multi_foreign_keys(schema=schema_name).items()
+        }
+        indexes: dict[str, list[dict[str, Any]]] = {}
+        for (_, table_name), table_indexes in inspector.get_multi_indexes(
+            schema=schema_name
+        ).items():
+            indexes[table_name] = [
+                {
+                    **index,
+                    "column_names": [
+                        name if name is not None else expression
+                        for name, expression in zip(
+                            index["column_names"],
+                            index.get("expressions", index["column_names"]),
+                        )
+                    ],
+                }
+                for index in table_indexes
+            ]
+        for (_, table_name), constraints in inspector.get_multi_unique_constraints(
+            schema=schema_name
+        ).items():
+            table_entries = indexes.setdefault(table_name, [])
+            indexed = {tuple(index["column_names"]) for index in table_entries}
+            for constraint in constraints:
+                if tuple(constraint["column_names"]) not in indexed:
+                    table_entries.append(
+                        {
+                            "name": constraint.get("name"),
+                            "column_names": constraint["column_names"],
+                            "unique": True,
+                        }
+                    )
+        return foreign_keys, indexes
+
     @classmethod
     def _extract_columns(
         cls,
@@ -184,6 +287,7 @@ class MetadataService:
                 is_primary_key=col["name"] in pk_columns,
                 default_value=default_value,
                 position=position,
+                comment=col.get("comment"),
             )
 
     @classmethod
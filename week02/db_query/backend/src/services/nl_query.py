@@ -6,18 +6,49 @@ Database-specific behavior is delegated to the appropriate adapter.
 
 import json
 import warnings
-
-from openai import OpenAI
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 
 from src.adapters import adapter_factory
 from src.config import settings
 from src.db.repository import ColumnMetadataRepository, TableMetadataRepository
-
-client = OpenAI(
-    api_key=settings.deepseek_api_key,
-    base_url=settings.deepseek_base_url,
+from src.lazy_import import lazy_import
+from src.services.llm_client import LlmClient
+from src.services.query import QueryService
+from src.services.schema_context import (
+    SchemaCatalog,
+    SchemaCatalogCache,
+    SchemaContext,
+    schema_catalog_cache,
 )
 
+if TYPE_CHECKING:
+    import sqlglot
+    from openai.types.chat import ChatCompletionMessageParam
+else:
+    sqlglot = lazy_import("sqlglot")
+
+_client: LlmClient | None = None
+
+
+def get_client() -> LlmClient:
+    """Return the shared API client, created on first use.
+
+    The client needs the API key, so it isn't created at import time.
+    """
+    global _client
+    if _client is None:
+        _client = LlmClient(
+            api_key=settings.deepseek_api_key,
+            base_url=settings.deepseek_base_url,
+            timeout_seconds=settings.llm_timeout_seconds,
+            max_retries=settings.llm_max_retries,
+            retry_base_seconds=settings.llm_retry_base_seconds,
+            max_concurrency=settings.llm_max_concurrency,
+            max_connections=settings.llm_max_connections,
+        )
+    return _client
+
 
 def get_system_prompt(db_type: str = "postgresql") -> str:
     """Generate database-type aware system prompt.
@@ -69,6 +100,42 @@ Respond in the following JSON format:
 class NlQueryService:
     """Service for generating SQL from natural language questions."""
 
+    @classmethod
+    def build_catalog(
+        cls,
+        db_name: str,
+        table_repo: TableMetadataRepository,
+        column_repo: ColumnMetadataRepository,
+    ) -> SchemaCatalog:
+        """Render and index every table of a database for the LLM."""
+        return SchemaCatalog.build(
+            table_repo.get_by_database_with_keys(db_name),
+            column_repo.get_by_database(db_name),
+            settings.nl_large_table_rows,
+        )
+
+    @classmethod
+    def get_catalog(
+        cls,
+        db_name: str,
+        connection_url: str,
+        catalog_version: int | None,
+        table_repo: TableMetadataRepository,
+        column_repo: ColumnMetadataRepository,
+        cache: SchemaCatalogCache = schema_catalog_cache,
+    ) -> SchemaCatalog:
+        """Return a database's catalog, building it on the first use of a version.
+
+        The catalog only changes when the metadata is re-extracted, which bumps
+        the connection's catalog version.
+        """
+        key = (db_name, catalog_version, adapter_factory.get_adapter(connection_url).sqlglot_dialect)
+        catalog = cache.get(key)
+        if catalog is None:
+            catalog = cls.build_catalog(db_name, table_repo, column_repo)
+            cache.put(key, catalog)
+        return catalog
+
     @classmethod
     def build_schema_context(
         cls,
@@ -86,57 +153,50 @@ class NlQueryService:
         Returns:
             Formatted schema context string
         """
-        tables = table_repo.get_by_database(db_name)
-
-        if not tables:
+        catalog = cls.build_catalog(db_name, table_repo, column_repo)
+        if not catalog.entries:
             return "No tables found in the database."
+        return catalog.render_all()
 
-        schema_parts = []
-        for table in tables:
-            columns = column_repo.get_by_table(table.id)
-            column_defs = []
-            for col in columns:
-                constraints = []
-                if col.is_primary_key:
-                    constraints.append("PRIMARY KEY")
-                if not col.is_nullable:
-                    constraints.append("NOT NULL")
-                if col.default_value:
-                    constraints.append(f"DEFAULT {col.default_value}")
-
-                constraint_str = f" {', '.join(constraints)}" if constraints else ""
-                column_defs.append(f"  {col.column_name} {col.data_type}{constraint_str}")
-
-            column_str = ",\n".join(column_defs)
-            schema_parts.append(
-                f"Table: {table.schema_name}.{table.table_name} ({table.table_type})\n"
-                f"Columns:\n{column_str}"
+    @classmethod
+    def select_schema_context(
+        cls,
+        question: str,
+        catalog: SchemaCatalog,
+    ) -> SchemaContext:
+        """Build the schema context for one question.
+
+        Catalogs larger than ``nl_context_max_tokens`` are pruned to the
+        tables most relevant to the question (see
+        :mod:`src.services.schema_context`).
+        """
+        if not catalog.entries:
+            return SchemaContext(
+                text="No tables found in the database.",
+                tables=[],
+                total_tables=0,
+                token_estimate=0,
             )
+        return catalog.select(
+            question,
+            top_tables=settings.nl_context_top_tables,
+            max_tokens=settings.nl_context_max_tokens,
+        )
 
-        return "\n\n".join(schema_parts)
+    @classmethod
+    def _check_api_key(cls) -> None:
+        if not settings.deepseek_api_key or settings.deepseek_api_key == "your-deepseek-api-key-here":
+            raise ValueError("Deepseek API key is not configured. Please set DEEPSEEK_API_KEY in .env file.")
 
     @classmethod
-    def generate_sql(
+    def build_messages(
         cls,
         question: str,
         schema_context: str,
         connection_url: str | None = None,
         db_type: str | None = None,
-    ) -> tuple[str, str]:
-        """Generate SQL from natural language question.
-
-        Args:
-            question: Natural language question
-            schema_context: Database schema context
-            connection_url: Database connection URL (used to detect db_type)
-            db_type: Database type override (if provided, skips URL detection)
-
-        Returns:
-            Tuple of (sql, explanation)
-        """
-        if not settings.deepseek_api_key or settings.deepseek_api_key == "your-deepseek-api-key-here":
-            raise ValueError("Deepseek API key is not configured. Please set DEEPSEEK_API_KEY in .env file.")
-
+    ) -> "list[ChatCompletionMessageParam]":
+        """Build the chat messages asking for SQL that answers a question."""
         # Detect database type from connection URL or use provided type
         if db_type is None and connection_url:
             db_type = adapter_factory.get_db_type(connection_url)
@@ -167,6 +227,8 @@ Rules:
 4. Add WHERE clauses to filter data based on the question.
 5. Use LIMIT when appropriate to avoid returning too many rows.
 6. Return the SQL query and a brief explanation of what the query does.
+7. Tables marked LARGE are very big: filter them on primary key or other selective columns, always add LIMIT, and avoid unfiltered COUNT(*), ORDER BY or joins over their full contents.
+8. Join tables along the listed foreign keys, and filter and join on PRIMARY KEY or INDEXED columns (or the leading columns of composite indexes) where possible.
 
 Database type: {db_type.upper()}
 {db_rules}
@@ -183,18 +245,37 @@ Respond in the following JSON format:
 Question: {question}
 
 Generate a SQL query to answer this question."""
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    @classmethod
+    async def generate_sql(
+        cls,
+        question: str,
+        schema_context: str,
+        connection_url: str | None = None,
+        db_type: str | None = None,
+    ) -> tuple[str, str]:
+        """Generate SQL from natural language question.
 
-        response = client.chat.completions.create(
+        Args:
+            question: Natural language question
+            schema_context: Database schema context
+            connection_url: Database connection URL (used to detect db_type)
+            db_type: Database type override (if provided, skips URL detection)
+
+        Returns:
+            Tuple of (sql, explanation)
+        """
+        cls._check_api_key()
+        content = await get_client().chat(
+            cls.build_messages(question, schema_context, connection_url, db_type),
             model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
             temperature=0.1,
             response_format={"type": "json_object"},
         )
-
-        content = response.choices[0].message.content
         if not content:
             raise ValueError("Empty response from Deepseek")
 
@@ -204,3 +285,40 @@ Generate a SQL query to answer this question."""
         explanation = result.get("explanation", "")
 
         return sql, explanation
+
+    @classmethod
+    def check_generated_sql(cls, sql: str, connection_url: str) -> str | None:
+        """Check that generated SQL parses and is a single SELECT.
+
+        Returns:
+            The error message, or None if the SQL is valid
+        """
+        is_valid, error = QueryService.validate_sql(sql)
+        if not is_valid:
+            return error
+        try:
+            sqlglot.parse(sql, read=adapter_factory.get_adapter(connection_url).sqlglot_dialect)
+        except sqlglot.errors.ParseError as e:
+            return str(e)
+        return None
+
+    @classmethod
+    async def stream_sql(
+        cls,
+        question: str,
+        schema_context: str,
+        connection_url: str | None = None,
+        db_type: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Generate SQL from a question, yielding the JSON answer as it arrives.
+
+        The answer has the same shape as the one parsed by :meth:`generate_sql`.
+        """
+        cls._check_api_key()
+        async for delta in get_client().stream_chat(
+            cls.build_messages(question, schema_context, connection_url, db_type),
+            model="deepseek-chat",
+            temperature=0.1,
+            response_format={"type": "json_object"},
+        ):
+            yield delta
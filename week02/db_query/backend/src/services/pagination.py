@@ -0,0 +1,454 @@
+"""Continuation cursors for paging through query results.
+
+Two kinds of cursor are supported:
+
+- **Keyset cursors** are used when the query reads a single table and its
+  ORDER BY (or the primary key, when there is no ORDER BY) uniquely identifies
+  each row. The next page is a fresh query with a ``WHERE (keys) > (last keys)``
+  predicate, so fetching page N costs the same as fetching page 1 and no
+  database resources are held between requests.
+- **Server-side cursors** are used for everything else. The result set stays
+  open on a pooled connection and is closed after an idle timeout. At most
+  half of a pool's connections are held by cursors at a time.
+
+Cursor tokens are opaque to clients and signed, so they can't be tampered with.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from datetime import time as time_of_day
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.pool import QueuePool
+
+from src.config import settings
+from src.lazy_import import lazy_import
+from src.models.errors import InvalidCursorError
+
+if TYPE_CHECKING:
+    import sqlglot
+    from sqlglot import exp
+else:
+    sqlglot = lazy_import("sqlglot")
+    exp = lazy_import("sqlglot.expressions")
+
+CURSOR_VERSION = 1
+
+# Signing key for cursor tokens; a per-process key invalidates cursors on restart
+_signing_key = (
+    settings.cursor_secret.encode("utf-8") if settings.cursor_secret else secrets.token_bytes(32)
+)
+
+
+@dataclass
+class TableKeyInfo:
+    """Key information about a table, taken from the metadata store."""
+
+    primary_key: list[str]
+    not_null: set[str] = field(default_factory=set)
+
+
+# Looks up key information by (schema_name, table_name)
+KeyLookup = Callable[[str | None, str], TableKeyInfo | None]
+
+
+@dataclass
+class KeysetPlan:
+    """SQL statements for keyset pagination over a single query."""
+
+    first_page_sql: str
+    next_page_sql: str
+    key_names: list[str]
+
+
+# =============================================================================
+# Cursor tokens
+# =============================================================================
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Encode and sign a cursor payload as an opaque token."""
+    body = json.dumps({"v": CURSOR_VERSION, **payload}, separators=(",", ":")).encode("utf-8")
+    signature = hmac.new(_signing_key, body, hashlib.sha256).digest()[:16]
+    return f"{_b64encode(body)}.{_b64encode(signature)}"
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    """Verify and decode a cursor token.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or its signature is invalid
+    """
+    try:
+        body_part, signature_part = token.split(".", 1)
+        body = _b64decode(body_part)
+        signature = _b64decode(signature_part)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Malformed cursor")
+
+    expected = hmac.new(_signing_key, body, hashlib.sha256).digest()[:16]
+    if not hmac.compare_digest(signature, expected):
+        raise InvalidCursorError("Invalid or expired cursor")
+
+    payload: dict[str, Any] = json.loads(body)
+    if payload.get("v") != CURSOR_VERSION:
+        raise InvalidCursorError("Unsupported cursor version")
+    return payload
+
+
+def encode_key_value(value: Any) -> Any:
+    """Encode a raw key value so it round-trips through a JSON cursor."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, time_of_day):
+        return {"$time": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {"$timedelta": value.total_seconds()}
+    if isinstance(value, (bytes, memoryview)):
+        return {"$bytes": bytes(value).hex()}
+    if isinstance(value, uuid.UUID):
+        return {"$uuid": str(value)}
+    return str(value)
+
+
+def decode_key_value(value: Any) -> Any:
+    """Decode a key value produced by :func:`encode_key_value`."""
+    if not isinstance(value, dict):
+        return value
+    tag, raw = next(iter(value.items()))
+    decoders: dict[str, Callable[[Any], Any]] = {
+        "$decimal": Decimal,
+        "$datetime": datetime.fromisoformat,
+        "$date": date.fromisoformat,
+        "$time": time_of_day.fromisoformat,
+        "$timedelta": lambda seconds: timedelta(seconds=seconds),
+        "$bytes": bytes.fromhex,
+        "$uuid": uuid.UUID,
+    }
+    if tag not in decoders:
+        raise InvalidCursorError(f"Unknown key type in cursor: {tag}")
+    return decoders[tag](raw)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+# =============================================================================
+# Keyset planning
+# =============================================================================
+
+
+def plan_keyset(
+    sql: str, dialect: str, page_size: int, key_lookup: KeyLookup | None
+) -> KeysetPlan | None:
+    """Derive a keyset pagination plan for a query, if one is possible.
+
+    The query must be a plain SELECT from one table without LIMIT, OFFSET,
+    DISTINCT, GROUP BY or aggregates. Its ORDER BY columns must be non-nullable
+    and include the table's primary key; without an ORDER BY the primary key
+    is used. Every key column must also appear in the query output.
+
+    Args:
+        sql: SELECT statement without a trailing semicolon
+        dialect: sqlglot dialect name
+        page_size: Number of rows per page
+        key_lookup: Callback returning key information for a table
+
+    Returns:
+        KeysetPlan, or None if the query can't be paged by key
+    """
+    if key_lookup is None:
+        return None
+
+    try:
+        tree = sqlglot.parse_one(sql, read=dialect)
+    except sqlglot.errors.ParseError:
+        return None
+
+    if not isinstance(tree, exp.Select):
+        return None
+    # sqlglot renamed some args ("from" -> "from_", "with" -> "with_"); check both
+    blocking_args = ("limit", "offset", "group", "having", "distinct", "joins", "qualify")
+    for arg in (*blocking_args, "with", "with_"):
+        if tree.args.get(arg):
+            return None
+    if any(projection.find(exp.AggFunc, exp.Window) for projection in tree.expressions):
+        return None
+
+    from_clause = tree.args.get("from_") or tree.args.get("from")
+    if from_clause is None or not isinstance(from_clause.this, exp.Table):
+        return None
+    table = from_clause.this
+    table_refs = {table.name, table.alias_or_name}
+
+    key_info = key_lookup(table.db or None, table.name)
+    if key_info is None or not key_info.primary_key:
+        return None
+
+    # Resolve the ordering keys as (column expression, descending)
+    order = tree.args.get("order")
+    if order:
+        keys: list[tuple[exp.Column, bool]] = []
+        for ordered in order.expressions:
+            column = ordered.this
+            if not isinstance(column, exp.Column) or (column.table and column.table not in table_refs):
+                return None
+            keys.append((column, bool(ordered.args.get("desc"))))
+        key_names = [column.name for column, _ in keys]
+        if not set(key_info.primary_key) <= set(key_names):
+            return None
+        non_nullable = key_info.not_null | set(key_info.primary_key)
+        if any(name not in non_nullable for name in key_names):
+            return None
+    else:
+        keys = [(exp.column(name, quoted=True), False) for name in key_info.primary_key]
+        tree = tree.order_by(*(column.copy() for column, _ in keys))
+
+    output_names = _output_names(tree, table_refs)
+    if output_names is None or any(column.name not in output_names for column, _ in keys):
+        return None
+
+    first_page = tree.copy().limit(page_size + 1)
+    next_page = tree.copy().where(_keyset_predicate(keys), append=True).limit(page_size + 1)
+
+    return KeysetPlan(
+        first_page_sql=first_page.sql(dialect=dialect),
+        next_page_sql=next_page.sql(dialect=dialect),
+        key_names=[output_names[column.name] for column, _ in keys],
+    )
+
+
+def _output_names(tree: "exp.Select", table_refs: set[str]) -> dict[str, str] | None:
+    """Map source column names to the names they have in the result set."""
+
+    names: dict[str, str] = {}
+    has_star = False
+    for projection in tree.expressions:
+        if isinstance(projection, exp.Star):
+            has_star = True
+        elif isinstance(projection, exp.Column) and isinstance(projection.this, exp.Star):
+            has_star = has_star or projection.table in table_refs
+        elif isinstance(projection, exp.Column):
+            names.setdefault(projection.name, projection.name)
+        elif isinstance(projection, exp.Alias) and isinstance(projection.this, exp.Column):
+            names.setdefault(projection.this.name, projection.alias)
+
+    if has_star:
+        return _StarNames(names)
+    return names
+
+
+class _StarNames(dict[str, str]):
+    """Output-name map for ``SELECT *``: every column keeps its own name."""
+
+    def __contains__(self, key: object) -> bool:
+        return True
+
+    def __missing__(self, key: str) -> str:
+        return key
+
+
+def _keyset_predicate(keys: "list[tuple[exp.Column, bool]]") -> "exp.Expr":
+    """Build ``(k1 > :k0) OR (k1 = :k0 AND k2 > :k1) OR ...`` for the keys.
+
+    The expanded form is used instead of row-value comparison so that mixed
+    ASC/DESC orderings work on every dialect.
+    """
+
+    branches = []
+    for i, (column, descending) in enumerate(keys):
+        conditions: list[exp.Expr] = [
+            exp.EQ(this=prev.copy(), expression=exp.var(f":k{j}"))
+            for j, (prev, _) in enumerate(keys[:i])
+        ]
+        comparison = exp.LT if descending else exp.GT
+        conditions.append(comparison(this=column.copy(), expression=exp.var(f":k{i}")))
+        branches.append(exp.and_(*conditions) if len(conditions) > 1 else conditions[0])
+    return exp.or_(*branches) if len(branches) > 1 else branches[0]
+
+
+# =============================================================================
+# Server-side cursors
+# =============================================================================
+
+
+@dataclass
+class ServerCursor:
+    """An open result set held between page requests."""
+
+    db_name: str
+    engine: Any
+    connection: Any
+    result: Any
+    adapter: Any
+    columns: list[tuple[str, str]]
+    timeout_ms: int | None
+    page_size: int
+    resources: ExitStack
+    blob_threshold: int | None = None
+    pending: Any = None
+    last_used: float = field(default_factory=time.monotonic)
+
+    def close(self) -> None:
+        try:
+            self.result.close()
+        finally:
+            self.resources.close()
+
+
+def cursor_limit(pool: Any) -> int | None:
+    """Return how many cursors may pin connections of one pool at once.
+
+    Half of the pool's capacity, so paged queries can't starve other queries
+    of connections. None for pools without a fixed capacity.
+    """
+    if not isinstance(pool, QueuePool) or pool._max_overflow < 0:
+        return None
+    return max(1, (pool.size() + pool._max_overflow) // 2)
+
+
+class ServerCursorStore:
+    """Registry of open server-side cursors with idle expiry.
+
+    Each cursor pins a pooled connection from the time it is opened until it
+    is closed. A connection is reserved with :meth:`reserve` before it is
+    checked out. When the store is full, or the engine's share of its pool
+    (see :func:`cursor_limit`) is used up, the least recently used idle
+    cursors are closed first. Opening a cursor therefore never waits for
+    connections held by idle cursors. A background thread (:meth:`start`)
+    closes cursors that have been idle longer than the timeout.
+    """
+
+    def __init__(self, idle_timeout_seconds: float, max_open: int):
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.max_open = max_open
+        self._cursors: dict[str, ServerCursor] = {}
+        # Connections pinned by cursors per engine, whether stored, being
+        # read or being opened
+        self._pinned: Counter[Any] = Counter()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def reserve(self, engine: Any) -> None:
+        """Reserve a connection of ``engine`` for a cursor about to be opened.
+
+        Evicts idle cursors to make room. The reservation is returned with
+        :meth:`release`, which the cursor's resources must call when closed.
+        """
+        self.reap_idle()
+        limit = cursor_limit(engine.pool)
+        with self._lock:
+            evicted: list[ServerCursor] = []
+            if limit is not None:
+                evicted += self._pop_oldest(
+                    self._pinned[engine] - limit + 1, lambda cursor: cursor.engine is engine
+                )
+            evicted += self._pop_oldest(sum(self._pinned.values()) - self.max_open + 1)
+            self._pinned[engine] += 1
+        for stale in evicted:
+            stale.close()
+
+    def release(self, engine: Any) -> None:
+        """Return a connection reserved with :meth:`reserve`."""
+        with self._lock:
+            self._pinned[engine] -= 1
+            if self._pinned[engine] <= 0:
+                del self._pinned[engine]
+
+    def add(self, cursor: ServerCursor) -> str:
+        """Register a newly opened cursor and return its id."""
+        cursor_id = secrets.token_urlsafe(16)
+        self.put(cursor_id, cursor)
+        return cursor_id
+
+    def put(self, cursor_id: str, cursor: ServerCursor) -> None:
+        """Store a cursor under its id until the next page is requested."""
+        with self._lock:
+            cursor.last_used = time.monotonic()
+            self._cursors[cursor_id] = cursor
+
+    def take(self, cursor_id: str) -> ServerCursor | None:
+        """Remove a cursor from the store while a page is read from it."""
+        self.reap_idle()
+        with self._lock:
+            return self._cursors.pop(cursor_id, None)
+
+    def reap_idle(self) -> None:
+        """Close cursors that have been idle longer than the timeout."""
+        deadline = time.monotonic() - self.idle_timeout_seconds
+        with self._lock:
+            expired = [key for key, cursor in self._cursors.items() if cursor.last_used < deadline]
+            stale = [self._cursors.pop(key) for key in expired]
+        for cursor in stale:
+            cursor.close()
+
+    def close_all(self) -> None:
+        """Close every open cursor (used on shutdown)."""
+        with self._lock:
+            stale = list(self._cursors.values())
+            self._cursors.clear()
+        for cursor in stale:
+            cursor.close()
+
+    def start(self) -> None:
+        """Start closing idle cursors in the background."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cursor-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(max(self.idle_timeout_seconds / 4, 1.0)):
+            self.reap_idle()
+
+    def _pop_oldest(
+        self, count: int, matches: Callable[[ServerCursor], bool] = lambda cursor: True
+    ) -> list[ServerCursor]:
+        """Remove up to ``count`` least recently used stored cursors."""
+        if count <= 0:
+            return []
+        candidates = sorted(
+            (key for key, cursor in self._cursors.items() if matches(cursor)),
+            key=lambda key: self._cursors[key].last_used,
+        )
+        return [self._cursors.pop(key) for key in candidates[:count]]
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+
+server_cursors = ServerCursorStore(
+    idle_timeout_seconds=settings.cursor_idle_timeout_seconds,
+    max_open=settings.max_open_cursors,
+)
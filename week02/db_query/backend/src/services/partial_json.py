@@ -0,0 +1,161 @@
+"""Incremental extraction of string fields from a streamed JSON object.
+
+The model answers with a JSON object such as
+``{"sql": "SELECT ...", "explanation": "..."}`` that arrives a few
+characters at a time. :class:`JsonFieldStream` reads the text as it arrives
+and reports the decoded characters of each top-level string field, and when
+the field is complete, without waiting for the closing brace. Values that
+aren't strings (numbers, nested objects...) are skipped.
+"""
+
+import json
+from dataclasses import dataclass
+
+_WHITESPACE = " \t\r\n"
+
+
+@dataclass
+class FieldDelta:
+    """New characters of a field's value."""
+
+    field: str
+    delta: str
+    complete: bool = False
+
+
+class JsonFieldStream:
+    """Parser for the top-level string fields of a JSON object fed in chunks."""
+
+    def __init__(self) -> None:
+        self._state = "start"
+        self._key: list[str] = []
+        self._field = ""
+        self._escape: str | None = None
+        self._high_surrogate = ""
+        # Nesting depth and string state while skipping a non-string value
+        self._depth = 0
+        self._skip_in_string = False
+        self._skip_escape = False
+        self.values: dict[str, str] = {}
+
+    def feed(self, text: str) -> list[FieldDelta]:
+        """Parse the next chunk and return what it added, merged per field."""
+        deltas: list[FieldDelta] = []
+        chars: list[str] = []
+
+        def flush(complete: bool = False) -> None:
+            if chars or complete:
+                delta = "".join(chars)
+                self.values[self._field] = self.values.get(self._field, "") + delta
+                if deltas and deltas[-1].field == self._field and not deltas[-1].complete:
+                    deltas[-1].delta += delta
+                    deltas[-1].complete = complete
+                else:
+                    deltas.append(FieldDelta(self._field, delta, complete))
+                chars.clear()
+
+        for ch in text:
+            state = self._state
+            if state == "value":
+                if self._escape is not None:
+                    self._escape += ch
+                    decoded = self._decode_escape(self._escape)
+                    if decoded is not None:
+                        chars.append(decoded)
+                elif ch == "\\":
+                    self._escape = ""
+                elif ch == '"':
+                    flush(complete=True)
+                    self._state = "after_value"
+                else:
+                    chars.append(ch)
+            elif state == "start":
+                if ch == "{":
+                    self._state = "before_key"
+            elif state == "before_key":
+                if ch == '"':
+                    self._key = []
+                    self._state = "key"
+                elif ch == "}":
+                    self._state = "end"
+            elif state == "key":
+                if self._escape is not None:
+                    self._escape += ch
+                    decoded = self._decode_escape(self._escape)
+                    if decoded is not None:
+                        self._key.append(decoded)
+                elif ch == "\\":
+                    self._escape = ""
+                elif ch == '"':
+                    self._state = "colon"
+                else:
+                    self._key.append(ch)
+            elif state == "colon":
+                if ch == ":":
+                    self._state = "before_value"
+            elif state == "before_value":
+                if ch in _WHITESPACE:
+                    continue
+                if ch == '"':
+                    self._field = "".join(self._key)
+                    self.values[self._field] = ""
+                    self._state = "value"
+                else:
+                    self._depth = 1 if ch in "{[" else 0
+                    self._skip_in_string = False
+                    self._skip_escape = False
+                    self._state = "skip"
+                    if self._depth == 0 and ch in ",}":
+                        self._state = "before_key" if ch == "," else "end"
+            elif state == "skip":
+                self._skip(ch)
+            elif state == "after_value":
+                if ch == ",":
+                    self._state = "before_key"
+                elif ch == "}":
+                    self._state = "end"
+        if self._state == "value":
+            flush()
+        return deltas
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the object was read."""
+        return self._state == "end"
+
+    def _decode_escape(self, escape: str) -> str | None:
+        """Decode a complete escape sequence, or None while it is partial."""
+        if escape.startswith("u") and len(escape) < 5:
+            return None
+        self._escape = None
+        try:
+            decoded: str = json.loads(f'"\\{escape}"')
+        except ValueError:
+            return escape
+        # Surrogate pairs arrive as two escapes
+        if "\ud800" <= decoded <= "\udbff":
+            self._high_surrogate = decoded
+            return ""
+        if self._high_surrogate:
+            pair, self._high_surrogate = self._high_surrogate + decoded, ""
+            return pair.encode("utf-16", "surrogatepass").decode("utf-16")
+        return decoded
+
+    def _skip(self, ch: str) -> None:
+        if self._skip_in_string:
+            if self._skip_escape:
+                self._skip_escape = False
+            elif ch == "\\":
+                self._skip_escape = True
+            elif ch == '"':
+                self._skip_in_string = False
+        elif ch == '"':
+            self._skip_in_string = True
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]" and self._depth > 0:
+            self._depth -= 1
+        elif self._depth == 0 and ch == ",":
+            self._state = "before_key"
+        elif self._depth == 0 and ch == "}":
+            self._state = "end"
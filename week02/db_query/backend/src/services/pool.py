@@ -0,0 +1,164 @@
+"""Connection pool instrumentation and per-connection pool settings.
+
+Engines created by :class:`~src.services.connection.ConnectionManager` use
+:class:`InstrumentedQueuePool`. The pool times every checkout, and counters
+kept from SQLAlchemy pool events feed ``GET /dbs/{name}/pool``.
+"""
+
+import threading
+import time
+from dataclasses import fields, replace
+from typing import Any, cast
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.pool import ConnectionPoolEntry, PoolProxiedConnection, QueuePool
+
+from src.adapters.base import PoolConfig
+
+# PoolConfig fields that can be overridden per connection
+POOL_SETTING_NAMES = tuple(f.name for f in fields(PoolConfig))
+
+
+class PoolStats:
+    """Counters for one connection pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool: QueuePool) -> dict[str, Any]:
+        """Combine the counters with the pool's live connection counts."""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "avg_checkout_wait_ms": (
+                    round(self.total_wait_seconds / attempts * 1000, 3) if attempts else 0.0
+                ),
+                "max_checkout_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long each checkout waits.
+
+    The wait covers waiting for a free connection, opening a new one and any
+    liveness check.
+    """
+
+    stats: PoolStats
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = cast(InstrumentedQueuePool, super().recreate())
+        pool.stats = self.stats
+        return pool
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def engine_pool(engine: Engine) -> InstrumentedQueuePool:
+    """Return the pool of an engine created by ConnectionManager."""
+    return cast(InstrumentedQueuePool, engine.pool)
+
+
+def merge_pool_config(base: PoolConfig, overrides: dict[str, Any] | None) -> PoolConfig:
+    """Apply per-connection overrides to an adapter's default pool config."""
+    if not overrides:
+        return base
+    return replace(base, **{k: v for k, v in overrides.items() if k in POOL_SETTING_NAMES})
+
+
+def instrument_engine(engine: Engine, config: PoolConfig) -> None:
+    """Register stats counters and the optional idle liveness check."""
+    stats = engine_pool(engine).stats
+
+    @event.listens_for(engine, "connect")
+    def on_connect(
+        dbapi_connection: DBAPIConnection, connection_record: ConnectionPoolEntry
+    ) -> None:
+        stats.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(
+        dbapi_connection: DBAPIConnection,
+        connection_record: ConnectionPoolEntry,
+        connection_proxy: PoolProxiedConnection,
+    ) -> None:
+        stats.increment("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(
+        dbapi_connection: DBAPIConnection | None, connection_record: ConnectionPoolEntry
+    ) -> None:
+        stats.increment("checkins")
+        connection_record.info["last_checkin"] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(
+        dbapi_connection: DBAPIConnection,
+        connection_record: ConnectionPoolEntry,
+        exception: BaseException | None,
+    ) -> None:
+        stats.increment("invalidations")
+
+    interval = config.liveness_interval_seconds
+    if config.pool_pre_ping or not interval:
+        return
+
+    @event.listens_for(engine, "checkout")
+    def check_idle_connection(
+        dbapi_connection: DBAPIConnection,
+        connection_record: ConnectionPoolEntry,
+        connection_proxy: PoolProxiedConnection,
+    ) -> None:
+        # Only connections idle for longer than the interval pay a round trip
+        last_checkin = connection_record.info.get("last_checkin")
+        if last_checkin is None or time.monotonic() - last_checkin <= interval:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception as e:
+            # The pool discards this connection and retries with a new one
+            raise exc.DisconnectionError() from e
@@ -0,0 +1,328 @@
+"""Sampled table previews.
+
+A preview returns a sample of a table's rows instead of its first rows:
+
+* ``tablesample``: databases with ``TABLESAMPLE SYSTEM`` (PostgreSQL) read a
+  random set of pages, sized from the planner's row estimate.
+* ``pk_range``: tables with a single integer primary key are read from a
+  random key onwards (wrapping around to the lowest keys), which is an index
+  range scan.
+* ``head``: other tables and views fall back to the first rows.
+
+The serialized preview is kept in a snapshot cache keyed by the connection's
+catalog version, so opening the same table again doesn't touch the database
+until the snapshot expires or the metadata is refreshed.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import text
+
+from src.adapters import adapter_factory
+from src.config import settings
+from src.lazy_import import lazy_import
+from src.models.errors import QueryTimeoutError
+from src.services.connection import ConnectionManager
+from src.services.query import QueryService
+from src.services.result_buffer import encode_json
+
+if TYPE_CHECKING:
+    from sqlglot import exp
+else:
+    exp = lazy_import("sqlglot.expressions")
+
+# TABLESAMPLE reads this many times the requested rows, so a sample rarely
+# comes up short
+TABLESAMPLE_OVERSAMPLING = 4
+
+# Data types usable for primary key range sampling
+_INTEGER_TYPES = ("INT", "SERIAL")
+
+# (db name, catalog version, schema, table, row limit)
+PreviewKey = tuple[str, int | None, str | None, str, int]
+
+
+@dataclass
+class PreviewSnapshot:
+    """A serialized preview body."""
+
+    body: bytes
+    etag: str
+    created_at: float
+
+
+class PreviewCache:
+    """LRU cache of preview snapshots bounded by total body size."""
+
+    def __init__(self, max_bytes: int, max_age_seconds: float):
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._entries: OrderedDict[PreviewKey, PreviewSnapshot] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: PreviewKey) -> PreviewSnapshot | None:
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is None:
+                return None
+            if time.monotonic() - snapshot.created_at > self.max_age_seconds:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def put(self, key: PreviewKey, snapshot: PreviewSnapshot) -> None:
+        if len(snapshot.body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = snapshot
+            self._size += len(snapshot.body)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, db_name: str) -> None:
+        """Drop every snapshot of a connection."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == db_name]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: PreviewKey) -> None:
+        snapshot = self._entries.pop(key)
+        self._size -= len(snapshot.body)
+
+
+preview_cache = PreviewCache(settings.preview_cache_bytes, settings.preview_max_age_seconds)
+
+
+def is_integer_type(data_type: str) -> bool:
+    type_upper = data_type.upper()
+    return any(marker in type_upper for marker in _INTEGER_TYPES)
+
+
+class PreviewService:
+    """Service for sampling table rows."""
+
+    @classmethod
+    def build_sample_sql(
+        cls,
+        dialect: str,
+        schema_name: str | None,
+        table_name: str,
+        column_names: list[str],
+        limit: int,
+        percent: float | None = None,
+        key_column: str | None = None,
+        key_condition: str | None = None,
+    ) -> str:
+        """Build a sampling SELECT.
+
+        Args:
+            dialect: sqlglot dialect of the database
+            schema_name: Schema of the table (None for the default schema)
+            table_name: Table name
+            column_names: Columns to select
+            limit: Maximum number of rows
+            percent: ``TABLESAMPLE SYSTEM`` percentage, if sampling by page
+            key_column: Integer primary key, if sampling by key range
+            key_condition: ``">="`` to read from ``:start`` onwards, ``"<"``
+                to read the keys below it
+
+        Returns:
+            SQL statement (key range statements take a ``:start`` parameter)
+        """
+
+        table = exp.table_(table_name, db=schema_name, quoted=True)
+        if percent is not None:
+            table.set(
+                "sample",
+                exp.TableSample(method=exp.var("SYSTEM"), percent=exp.Literal.number(percent)),
+            )
+        query = exp.select(*(exp.column(name, quoted=True) for name in column_names)).from_(table)
+        if key_column is not None:
+            key = exp.column(key_column, quoted=True)
+            comparison = exp.GTE if key_condition == ">=" else exp.LT
+            query = query.where(comparison(this=key, expression=exp.var(":start"))).order_by(
+                key.copy()
+            )
+        return query.limit(limit).sql(dialect=dialect)
+
+    @classmethod
+    def sample_table(
+        cls,
+        db_name: str,
+        connection_url: str,
+        schema_name: str | None,
+        table_name: str,
+        columns: list[tuple[str, str, bool]],
+        is_view: bool,
+        limit: int,
+        timeout_ms: int | None = None,
+        rng: random.Random | None = None,
+    ) -> dict[str, Any]:
+        """Sample rows of a table.
+
+        Args:
+            db_name: Database connection name
+            connection_url: Database connection URL
+            schema_name: Schema of the table (None for the default schema)
+            table_name: Table name
+            columns: (column name, data type, is primary key) triples
+            is_view: Views are never sampled, only read from the start
+            limit: Maximum number of rows
+            timeout_ms: Statement timeout in milliseconds (None disables it)
+            rng: Random source for the key range start
+
+        Returns:
+            Preview body: columns, rows, rowCount, truncated and sampling
+        """
+
+        adapter = adapter_factory.get_adapter(connection_url)
+        if not adapter.supports_schemas:
+            schema_name = None
+        rng = rng or random.Random()
+        column_names = [name for name, _, _ in columns]
+        key_columns = [(name, data_type) for name, data_type, is_pk in columns if is_pk]
+        key_column = None
+        if not is_view and len(key_columns) == 1 and is_integer_type(key_columns[0][1]):
+            key_column = key_columns[0][0]
+
+        def build(**kwargs: Any) -> str:
+            sql = cls.build_sample_sql(
+                adapter.sqlglot_dialect, schema_name, table_name, column_names, **kwargs
+            )
+            return adapter.add_statement_timeout_hint(sql, timeout_ms)
+
+        def read(sql: str, params: dict[str, Any] | None = None) -> list[Any]:
+            statements.append(sql)
+            return list(conn.execute(text(sql), params or {}))
+
+        statements: list[str] = []
+        sample = None
+        engine = ConnectionManager.get_read_engine(db_name, connection_url)
+        with engine.connect() as conn:
+            try:
+                with adapter.statement_timeout(conn, timeout_ms):
+                    if not is_view and adapter.supports_tablesample:
+                        estimate = adapter.estimate_row_count(conn, schema_name, table_name)
+                        if estimate and estimate > limit * TABLESAMPLE_OVERSAMPLING:
+                            percent = round(100 * limit * TABLESAMPLE_OVERSAMPLING / estimate, 4)
+                            rows = read(build(limit=limit, percent=percent))
+                            # A short sample falls back to reading the first rows
+                            if len(rows) == limit:
+                                sample = ("tablesample", rows)
+                    elif key_column is not None:
+                        key = exp.column(key_column, quoted=True)
+                        bounds_sql = (
+                            exp.select(exp.Min(this=key), exp.Max(this=key.copy()))
+                            .from_(exp.table_(table_name, db=schema_name, quoted=True))
+                            .sql(dialect=adapter.sqlglot_dialect)
+                        )
+                        statements.append(bounds_sql)
+                        low, high = conn.execute(text(bounds_sql)).one()
+                        if low is not None:
+                            params = {"start": rng.randint(int(low), int(high))}
+                            rows = read(
+                                build(limit=limit, key_column=key_column, key_condition=">="),
+                                params,
+                            )
+                            if len(rows) < limit:
+                                # Wrap around to the lowest keys
+                                rows = rows + read(
+                                    build(
+                                        limit=limit - len(rows),
+                                        key_column=key_column,
+                                        key_condition="<",
+                                    ),
+                                    params,
+                                )
+                            sample = ("pk_range", rows)
+                    if sample is None:
+                        sample = ("head", read(build(limit=limit)))
+            except Exception as e:
+                if timeout_ms and adapter.is_timeout_error(e):
+                    raise QueryTimeoutError(timeout_ms, statements[-1] if statements else None) from e
+                raise
+
+        sampling, rows = sample
+        result_columns = [(name, data_type) for name, data_type, _ in columns]
+        return {
+            "columns": [{"name": name, "type": data_type} for name, data_type in result_columns],
+            "rows": [
+                QueryService._serialize_row(
+                    adapter, row, result_columns, settings.blob_inline_max_bytes
+                )
+                for row in rows
+            ],
+            "rowCount": len(rows),
+            "truncated": len(rows) >= limit,
+            "sampling": sampling,
+        }
+
+    @classmethod
+    def get_preview(
+        cls,
+        db_name: str,
+        connection_url: str,
+        catalog_version: int | None,
+        schema_name: str,
+        table_name: str,
+        columns: list[tuple[str, str, bool]],
+        is_view: bool,
+        limit: int,
+        refresh: bool = False,
+        timeout_ms: int | None = None,
+        cache: PreviewCache = preview_cache,
+    ) -> tuple[PreviewSnapshot, bool]:
+        """Return a serialized preview, from the snapshot cache when possible.
+
+        Returns:
+            Tuple of (snapshot, whether it came from the cache)
+        """
+        key = (db_name, catalog_version, schema_name, table_name, limit)
+        if not refresh:
+            snapshot = cache.get(key)
+            if snapshot is not None:
+                return snapshot, True
+
+        content = cls.sample_table(
+            db_name=db_name,
+            connection_url=connection_url,
+            schema_name=schema_name,
+            table_name=table_name,
+            columns=columns,
+            is_view=is_view,
+            limit=limit,
+            timeout_ms=timeout_ms,
+        )
+        content["catalogVersion"] = catalog_version
+        content["sampledAt"] = datetime.utcnow().isoformat()
+        body = encode_json(content)
+        snapshot = PreviewSnapshot(
+            body=body,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            created_at=time.monotonic(),
+        )
+        cache.put(key, snapshot)
+        return snapshot, False
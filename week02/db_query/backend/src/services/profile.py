@@ -0,0 +1,314 @@
+"""Column profiling.
+
+A profile gives, per column, the null fraction, distinct count, min/max and
+most frequent values over a bounded sample of the table. Aggregates for all
+columns are computed by one statement in a single pass over the sample; top
+values come from a second statement that groups the same sample per column.
+Profiles are cached with the column metadata and served until they are older
+than ``profile_max_age_seconds`` or the metadata is refreshed.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import text
+
+from src.adapters import adapter_factory
+from src.adapters.base import DatabaseAdapter
+from src.db.models import ColumnMetadata
+from src.db.repository import ColumnMetadataRepository
+from src.lazy_import import lazy_import
+from src.models.errors import QueryTimeoutError
+from src.services.connection import ConnectionManager
+
+if TYPE_CHECKING:
+    from sqlglot import exp
+else:
+    exp = lazy_import("sqlglot.expressions")
+
+SAMPLE_ALIAS = "sample"
+
+
+@dataclass
+class TableProfile:
+    """Profiles of a table's columns, in column order."""
+
+    columns: list[tuple[ColumnMetadata, dict[str, Any]]]
+    profiled_at: datetime
+    cached: bool
+
+    @property
+    def sample_rows(self) -> int:
+        return self.columns[0][1]["sample_rows"] if self.columns else 0
+
+    @property
+    def sample_limit(self) -> int:
+        return self.columns[0][1]["sample_limit"] if self.columns else 0
+
+
+class ProfileService:
+    """Service for computing and caching column profiles."""
+
+    @classmethod
+    def _sample(
+        cls,
+        schema_name: str | None,
+        table_name: str,
+        column_names: list[str],
+        sample_rows: int,
+    ) -> "exp.Subquery":
+
+        return (
+            exp.select(*(exp.column(name, quoted=True) for name in column_names))
+            .from_(exp.table_(table_name, db=schema_name, quoted=True))
+            .limit(sample_rows)
+            .subquery(SAMPLE_ALIAS)
+        )
+
+    @classmethod
+    def build_aggregate_sql(
+        cls,
+        adapter: DatabaseAdapter,
+        schema_name: str | None,
+        table_name: str,
+        columns: list[tuple[str, bool]],
+        sample_rows: int,
+    ) -> tuple[str, list[bool]]:
+        """Build the single-pass aggregate statement over a sample.
+
+        Args:
+            adapter: Adapter of the profiled database
+            schema_name: Schema of the table (None for the default schema)
+            table_name: Table name
+            columns: (column name, comparable) pairs; distinct counts and
+                min/max are only computed for comparable columns
+            sample_rows: Maximum number of rows scanned
+
+        Returns:
+            Tuple of (SQL, per-column flag telling whether the distinct count
+            is approximate)
+        """
+
+        projections: list[exp.Expr] = [exp.alias_(exp.Count(this=exp.Star()), "row_count")]
+        approximate = []
+        for i, (name, comparable) in enumerate(columns):
+            column = exp.column(name, table=SAMPLE_ALIAS, quoted=True)
+            projections.append(exp.alias_(exp.Count(this=column.copy()), f"n{i}"))
+            if not comparable:
+                approximate.append(False)
+                continue
+            distinct, is_approximate = adapter.distinct_count_expression(column.copy())
+            approximate.append(is_approximate)
+            projections.extend(
+                [
+                    exp.alias_(distinct, f"d{i}"),
+                    exp.alias_(exp.Min(this=column.copy()), f"lo{i}"),
+                    exp.alias_(exp.Max(this=column.copy()), f"hi{i}"),
+                ]
+            )
+        sample = cls._sample(schema_name, table_name, [name for name, _ in columns], sample_rows)
+        query = exp.select(*projections).from_(sample)
+        return query.sql(dialect=adapter.sqlglot_dialect), approximate
+
+    @classmethod
+    def build_top_values_sql(
+        cls,
+        dialect: str,
+        schema_name: str | None,
+        table_name: str,
+        columns: list[tuple[int, str]],
+        sample_rows: int,
+        top_values: int,
+    ) -> str:
+        """Build the statement returning each column's most frequent values.
+
+        Values are cast to text so the per-column results can be combined
+        with UNION ALL.
+
+        Args:
+            dialect: sqlglot dialect of the profiled database
+            schema_name: Schema of the table (None for the default schema)
+            table_name: Table name
+            columns: (column index, column name) pairs to compute values for
+            sample_rows: Maximum number of rows scanned per column
+            top_values: Number of values returned per column
+
+        Returns:
+            SQL returning (column_index, value, value_count) rows
+        """
+
+        arms = []
+        for index, name in columns:
+            column = exp.column(name, table=SAMPLE_ALIAS, quoted=True)
+            grouped = (
+                exp.select(
+                    exp.alias_(exp.Literal.number(index), "column_index"),
+                    exp.alias_(exp.cast(column.copy(), "text"), "value"),
+                    exp.alias_(exp.Count(this=exp.Star()), "value_count"),
+                )
+                .from_(cls._sample(schema_name, table_name, [name], sample_rows))
+                .where(exp.Not(this=exp.Is(this=column.copy(), expression=exp.Null())))
+                .group_by(column.copy())
+                .order_by(exp.Ordered(this=exp.column("value_count"), desc=True))
+                .limit(top_values)
+            )
+            # Each arm is wrapped so its ORDER BY/LIMIT is valid inside the UNION
+            arms.append(exp.select("*").from_(grouped.subquery(f"top{index}")))
+        query: exp.Query = arms[0]
+        for arm in arms[1:]:
+            query = exp.union(query, arm, distinct=False)
+        return query.sql(dialect=dialect)
+
+    @classmethod
+    def profile_columns(
+        cls,
+        db_name: str,
+        connection_url: str,
+        schema_name: str | None,
+        table_name: str,
+        columns: list[tuple[str, str]],
+        sample_rows: int,
+        top_values: int,
+        timeout_ms: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Compute profiles for columns of a table.
+
+        Args:
+            db_name: Database connection name
+            connection_url: Database connection URL
+            schema_name: Schema of the table (None for the default schema)
+            table_name: Table name
+            columns: (column name, data type) pairs to profile
+            sample_rows: Maximum number of rows scanned
+            top_values: Number of most frequent values kept per column
+            timeout_ms: Statement timeout in milliseconds (None disables it)
+
+        Returns:
+            One profile dict per column, in the given order
+        """
+        adapter = adapter_factory.get_adapter(connection_url)
+        if not adapter.supports_schemas:
+            schema_name = None
+        comparable = [adapter.is_comparable_type(data_type) for _, data_type in columns]
+        aggregate_sql, approximate = cls.build_aggregate_sql(
+            adapter,
+            schema_name,
+            table_name,
+            [(name, is_comparable) for (name, _), is_comparable in zip(columns, comparable)],
+            sample_rows,
+        )
+        top_columns = [(i, name) for i, (name, _) in enumerate(columns) if comparable[i]]
+        top_sql = None
+        if top_columns and top_values > 0:
+            top_sql = cls.build_top_values_sql(
+                adapter.sqlglot_dialect,
+                schema_name,
+                table_name,
+                top_columns,
+                sample_rows,
+                top_values,
+            )
+
+        engine = ConnectionManager.get_read_engine(db_name, connection_url)
+        with engine.connect() as conn:
+            current_sql = aggregate_sql
+            try:
+                with adapter.statement_timeout(conn, timeout_ms):
+                    row = conn.execute(
+                        text(adapter.add_statement_timeout_hint(aggregate_sql, timeout_ms))
+                    ).mappings().one()
+                    top_rows: Sequence[Any] = []
+                    if top_sql is not None:
+                        current_sql = top_sql
+                        top_rows = conn.execute(
+                            text(adapter.add_statement_timeout_hint(top_sql, timeout_ms))
+                        ).all()
+            except Exception as e:
+                if timeout_ms and adapter.is_timeout_error(e):
+                    raise QueryTimeoutError(timeout_ms, current_sql) from e
+                raise
+
+        row_count = row["row_count"]
+        top_by_column: dict[int, list[dict[str, Any]]] = {}
+        for index, value, count in top_rows:
+            top_by_column.setdefault(index, []).append(
+                {"value": adapter.serialize(value), "count": count}
+            )
+
+        profiles = []
+        for i in range(len(columns)):
+            null_count = row_count - row[f"n{i}"]
+            profile: dict[str, Any] = {
+                "sample_rows": row_count,
+                "sample_limit": sample_rows,
+                "null_count": null_count,
+                "null_fraction": round(null_count / row_count, 6) if row_count else None,
+                "distinct_count": None,
+                "distinct_approximate": approximate[i],
+                "min_value": None,
+                "max_value": None,
+                "top_values": [],
+            }
+            if comparable[i]:
+                profile["distinct_count"] = row[f"d{i}"]
+                profile["min_value"] = adapter.serialize(row[f"lo{i}"])
+                profile["max_value"] = adapter.serialize(row[f"hi{i}"])
+                profile["top_values"] = sorted(
+                    top_by_column.get(i, []), key=lambda item: -item["count"]
+                )
+            profiles.append(profile)
+        return profiles
+
+    @classmethod
+    def get_profile(
+        cls,
+        db_name: str,
+        connection_url: str,
+        schema_name: str,
+        table_name: str,
+        columns: list[ColumnMetadata],
+        column_repo: ColumnMetadataRepository,
+        sample_rows: int,
+        top_values: int,
+        max_age_seconds: float,
+        refresh: bool = False,
+        timeout_ms: int | None = None,
+    ) -> TableProfile:
+        """Return a table's profile from the cache, computing it when stale.
+
+        A cached profile is used when every column has one, it was computed
+        with the current sample size and it is younger than
+        ``max_age_seconds``.
+        """
+        now = datetime.utcnow()
+        cached = [
+            (col, col.profile, col.profiled_at)
+            for col in columns
+            if col.profile is not None
+            and col.profiled_at is not None
+            and col.profile.get("sample_limit") == sample_rows
+            and now - col.profiled_at <= timedelta(seconds=max_age_seconds)
+        ]
+        if not refresh and columns and len(cached) == len(columns):
+            return TableProfile(
+                columns=[(col, profile) for col, profile, _ in cached],
+                profiled_at=min(profiled_at for _, _, profiled_at in cached),
+                cached=True,
+            )
+
+        profiles = cls.profile_columns(
+            db_name=db_name,
+            connection_url=connection_url,
+            schema_name=schema_name,
+            table_name=table_name,
+            columns=[(col.column_name, col.data_type) for col in columns],
+            sample_rows=sample_rows,
+            top_values=top_values,
+            timeout_ms=timeout_ms,
+        )
+        column_repo.save_profiles(
+            {col.id: profile for col, profile in zip(columns, profiles)}, now
+        )
+        return TableProfile(columns=list(zip(columns, profiles)), profiled_at=now, cached=False)
@@ -5,17 +5,80 @@ Database-specific behavior is delegated to the appropriate adapter.
 """
 
 import decimal
+import itertools
 import re
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
 from typing import Any
 
 from sqlalchemy import text
+from sqlalchemy.engine import CursorResult, Engine
 
 from src.adapters import adapter_factory
+from src.adapters.base import DatabaseAdapter
+from src.config import settings
+from src.models.errors import InvalidCursorError, QueryTimeoutError
+from src.services.blob import BINARY_TYPES, describe_blob
 from src.services.connection import ConnectionManager
+from src.services.pagination import (
+    KeyLookup,
+    ServerCursor,
+    decode_cursor,
+    decode_key_value,
+    encode_cursor,
+    encode_key_value,
+    plan_keyset,
+    server_cursors,
+)
+from src.services.result_buffer import ResultBuffer
 
 MAX_ROWS = 1000
 
+# Clauses that lock or write rows, so the statement must run on the primary
+_PRIMARY_ONLY_CLAUSE = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bINTO\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class QueryResult:
+    """One page of query results.
+
+    Rows are held in a :class:`ResultBuffer`, which may have spilled to disk;
+    call :meth:`close` once the rows have been sent.
+    """
+
+    buffer: ResultBuffer
+    columns: list[tuple[str, str]]
+    truncated: bool
+    next_cursor: str | None = None
+
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        """All rows of the page, loading spilled rows back into memory."""
+        return list(self.buffer)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.buffer)
+
+    def close(self) -> None:
+        self.buffer.close()
+
+
+@contextmanager
+def _translate_timeout(adapter: DatabaseAdapter, timeout_ms: int | None, sql: str | None) -> Iterator[None]:
+    """Re-raise database timeout errors as QueryTimeoutError."""
+    try:
+        yield
+    except Exception as e:
+        if timeout_ms and adapter.is_timeout_error(e):
+            raise QueryTimeoutError(timeout_ms, sql) from e
+        raise
+
 
 class QueryService:
     """Service for validating and executing SQL queries."""
@@ -92,64 +155,392 @@ class QueryService:
 
         return sql
 
+    @classmethod
+    def is_read_only(cls, sql: str) -> bool:
+        """Check whether a validated SELECT can run on a read replica.
+
+        Locking reads (``FOR UPDATE``/``FOR SHARE``) and ``SELECT ... INTO``
+        must run on the primary.
+        """
+        return _PRIMARY_ONLY_CLAUSE.search(sql) is None
+
+    @classmethod
+    def resolve_statement_timeout(cls, statement_timeout_ms: int | None) -> int | None:
+        """Resolve a connection's timeout against the configured default.
+
+        Args:
+            statement_timeout_ms: Per-connection timeout (None uses the default)
+
+        Returns:
+            Timeout in milliseconds, or None if timeouts are disabled
+        """
+        if statement_timeout_ms is None:
+            statement_timeout_ms = settings.default_statement_timeout_ms
+        return statement_timeout_ms or None
+
+    @classmethod
+    def resolve_page_size(cls, page_size: int | None) -> int:
+        """Clamp a requested page size to ``MAX_ROWS``."""
+        if not page_size or page_size < 1:
+            return MAX_ROWS
+        return min(page_size, MAX_ROWS)
+
     @classmethod
     def execute_query(
-        cls, db_name: str, connection_url: str, sql: str
-    ) -> tuple[list[dict], list[tuple[str, str]], bool]:
-        """Execute a SQL query and return results.
+        cls,
+        db_name: str,
+        connection_url: str,
+        sql: str,
+        statement_timeout_ms: int | None = None,
+        page_size: int | None = None,
+        key_lookup: KeyLookup | None = None,
+        lazy_blobs: bool = False,
+    ) -> QueryResult:
+        """Execute a SQL query and return its first page of results.
+
+        If more rows are available, the result carries a continuation cursor
+        for :meth:`fetch_next_page`. Queries over a single table ordered by a
+        unique key are paged by keyset; other queries keep a server-side
+        cursor open until it is exhausted or idles out.
 
         Args:
             db_name: Database connection name
             connection_url: Database connection URL
             sql: SQL query to execute
+            statement_timeout_ms: Per-connection statement timeout
+                (None uses the configured default, 0 disables it)
+            page_size: Rows per page (defaults to and is capped at MAX_ROWS)
+            key_lookup: Callback returning primary key information for a
+                table, used to plan keyset pagination
+            lazy_blobs: Replace binary values larger than
+                ``settings.blob_inline_max_bytes`` with blob descriptors
 
         Returns:
-            Tuple of (rows, columns, was_truncated)
+            QueryResult with the first page of rows
 
         Raises:
             ValueError: If SQL validation fails
+            QueryTimeoutError: If the database aborted the statement on timeout
         """
         # Get adapter for database-specific behavior
         adapter = adapter_factory.get_adapter(connection_url)
         db_type = adapter.db_type
 
-        engine = ConnectionManager.get_engine(db_name, connection_url)
-
         # Validate SQL
         is_valid, error = cls.validate_sql(sql, db_type)
         if not is_valid:
             raise ValueError(error)
 
-        # Transform SQL (add LIMIT if needed)
-        transformed_sql = cls.transform_sql(sql, db_type)
+        # Plain SELECTs can be served by a read replica; locking reads can't
+        if cls.is_read_only(sql):
+            engine = ConnectionManager.get_read_engine(db_name, connection_url)
+        else:
+            engine = ConnectionManager.get_engine(db_name, connection_url)
+
+        base_sql = sql.strip()
+        if base_sql.endswith(";"):
+            base_sql = base_sql[:-1].strip()
+
+        page_size = cls.resolve_page_size(page_size)
+        timeout_ms = cls.resolve_statement_timeout(statement_timeout_ms)
+        blob_threshold = settings.blob_inline_max_bytes if lazy_blobs else None
+
+        plan = None
+        if adapter.supports_limit_clause:
+            plan = plan_keyset(base_sql, adapter.sqlglot_dialect, page_size, key_lookup)
+
+        if plan is not None:
+            return cls._run_keyset_page(
+                db_name=db_name,
+                engine=engine,
+                adapter=adapter,
+                sql=plan.first_page_sql,
+                next_sql=plan.next_page_sql,
+                key_names=plan.key_names,
+                params={},
+                page_size=page_size,
+                timeout_ms=timeout_ms,
+                blob_threshold=blob_threshold,
+            )
+
+        return cls._open_server_cursor(
+            db_name, engine, adapter, base_sql, page_size, timeout_ms, blob_threshold
+        )
 
+    @classmethod
+    def fetch_next_page(
+        cls,
+        db_name: str,
+        connection_url: str,
+        cursor: str,
+        statement_timeout_ms: int | None = None,
+    ) -> QueryResult:
+        """Fetch the page of results following a continuation cursor.
+
+        Args:
+            db_name: Database connection name
+            connection_url: Database connection URL
+            cursor: Continuation cursor returned with the previous page
+            statement_timeout_ms: Per-connection statement timeout
+
+        Returns:
+            QueryResult with the next page of rows
+
+        Raises:
+            InvalidCursorError: If the cursor is invalid or has expired
+            QueryTimeoutError: If the database aborted the statement on timeout
+        """
+        payload = decode_cursor(cursor)
+        if payload.get("db") != db_name:
+            raise InvalidCursorError("Cursor belongs to a different connection")
+
+        if payload.get("kind") == "keyset":
+            adapter = adapter_factory.get_adapter(connection_url)
+            if cls.is_read_only(payload["sql"]):
+                engine = ConnectionManager.get_read_engine(db_name, connection_url)
+            else:
+                engine = ConnectionManager.get_engine(db_name, connection_url)
+            params = {
+                f"k{i}": decode_key_value(value) for i, value in enumerate(payload["last"])
+            }
+            return cls._run_keyset_page(
+                db_name=db_name,
+                engine=engine,
+                adapter=adapter,
+                sql=payload["sql"],
+                next_sql=payload["sql"],
+                key_names=payload["keys"],
+                params=params,
+                page_size=payload["size"],
+                timeout_ms=cls.resolve_statement_timeout(statement_timeout_ms),
+                blob_threshold=payload.get("blob"),
+            )
+
+        if payload.get("kind") == "server":
+            return cls._read_server_cursor(payload["id"])
+
+        raise InvalidCursorError("Unknown cursor type")
+
+    @classmethod
+    def _run_keyset_page(
+        cls,
+        db_name: str,
+        engine: Engine,
+        adapter: DatabaseAdapter,
+        sql: str,
+        next_sql: str,
+        key_names: list[str],
+        params: dict[str, Any],
+        page_size: int,
+        timeout_ms: int | None,
+        blob_threshold: int | None = None,
+    ) -> QueryResult:
+        """Run one keyset-paged statement, fetching one extra row as lookahead."""
+        sql = adapter.add_statement_timeout_hint(sql, timeout_ms)
+
+        # The connection goes back to the pool as soon as the block exits,
+        # including when the statement was aborted by the timeout.
         with engine.connect() as conn:
-            result = conn.execute(text(transformed_sql))
-
-            # Extract column information
-            cursor_description = result.cursor.description
-            columns = []
-            for col in cursor_description:
-                col_name = col[0]
-                col_type = col[1].__name__ if hasattr(col[1], "__name__") else str(col[1])
-                columns.append((col_name, col_type))
-
-            # Serialize rows using adapter
-            rows = []
-            for row in result:
-                row_dict = {}
-                for i, col in enumerate(columns):
-                    value = row[i]
-                    try:
-                        row_dict[col[0]] = adapter.serialize(value)
-                    except Exception:
-                        # Fallback: convert to string if serialization fails
-                        row_dict[col[0]] = str(value) if value is not None else None
-                rows.append(row_dict)
-
-            truncated = len(rows) == MAX_ROWS
-
-            return rows, columns, truncated
+            with _translate_timeout(adapter, timeout_ms, sql):
+                with adapter.statement_timeout(conn, timeout_ms):
+                    result = conn.execute(text(sql), params)
+                    columns = cls._describe_columns(result)
+                    buffer, last_row, lookahead = cls._collect_page(
+                        result, adapter, columns, page_size, blob_threshold
+                    )
+
+        has_more = lookahead is not None
+        next_cursor = None
+        if has_more:
+            last_row = last_row._mapping
+            next_cursor = encode_cursor(
+                {
+                    "kind": "keyset",
+                    "db": db_name,
+                    "sql": next_sql,
+                    "keys": key_names,
+                    "last": [encode_key_value(last_row[key]) for key in key_names],
+                    "size": page_size,
+                    "blob": blob_threshold,
+                }
+            )
+
+        return QueryResult(
+            buffer=buffer, columns=columns, truncated=has_more, next_cursor=next_cursor
+        )
+
+    @classmethod
+    def _open_server_cursor(
+        cls,
+        db_name: str,
+        engine: Engine,
+        adapter: DatabaseAdapter,
+        sql: str,
+        page_size: int,
+        timeout_ms: int | None,
+        blob_threshold: int | None = None,
+    ) -> QueryResult:
+        """Execute a streamed statement and keep it open if rows remain."""
+        sql = adapter.add_statement_timeout_hint(sql, timeout_ms)
+        # Make room among the held cursors before checking out a connection,
+        # so idle cursors can't exhaust the pool
+        server_cursors.reserve(engine)
+        resources = ExitStack()
+        resources.callback(server_cursors.release, engine)
+        try:
+            conn = resources.enter_context(engine.connect())
+            conn.execution_options(stream_results=True)
+            with _translate_timeout(adapter, timeout_ms, sql):
+                with adapter.statement_timeout(conn, timeout_ms):
+                    result = conn.execute(text(sql))
+                    columns = cls._describe_columns(result)
+                    buffer, _, lookahead = cls._collect_page(
+                        result, adapter, columns, page_size, blob_threshold
+                    )
+        except BaseException:
+            resources.close()
+            raise
+
+        if lookahead is None:
+            result.close()
+            resources.close()
+            return QueryResult(buffer=buffer, columns=columns, truncated=False)
+
+        server_cursor = ServerCursor(
+            db_name=db_name,
+            engine=engine,
+            connection=conn,
+            result=result,
+            adapter=adapter,
+            columns=columns,
+            timeout_ms=timeout_ms,
+            page_size=page_size,
+            blob_threshold=blob_threshold,
+            resources=resources,
+            pending=lookahead,
+        )
+        cursor_id = server_cursors.add(server_cursor)
+        return QueryResult(
+            buffer=buffer,
+            columns=columns,
+            truncated=True,
+            next_cursor=encode_cursor({"kind": "server", "db": db_name, "id": cursor_id}),
+        )
+
+    @classmethod
+    def _read_server_cursor(cls, cursor_id: str) -> QueryResult:
+        """Read the next page from a held server-side cursor."""
+        server_cursor = server_cursors.take(cursor_id)
+        if server_cursor is None:
+            raise InvalidCursorError("Cursor has expired")
+
+        adapter = server_cursor.adapter
+        columns = server_cursor.columns
+        try:
+            with _translate_timeout(adapter, server_cursor.timeout_ms, None):
+                with adapter.statement_timeout(server_cursor.connection, server_cursor.timeout_ms):
+                    buffer, _, lookahead = cls._collect_page(
+                        itertools.chain([server_cursor.pending], server_cursor.result),
+                        adapter,
+                        columns,
+                        server_cursor.page_size,
+                        server_cursor.blob_threshold,
+                    )
+        except BaseException:
+            server_cursor.close()
+            raise
+
+        has_more = lookahead is not None
+        if has_more:
+            server_cursor.pending = lookahead
+            server_cursors.put(cursor_id, server_cursor)
+        else:
+            server_cursor.close()
+
+        return QueryResult(
+            buffer=buffer,
+            columns=columns,
+            truncated=has_more,
+            next_cursor=(
+                encode_cursor({"kind": "server", "db": server_cursor.db_name, "id": cursor_id})
+                if has_more
+                else None
+            ),
+        )
+
+    @classmethod
+    def _collect_page(
+        cls,
+        rows: Iterable[Any],
+        adapter: DatabaseAdapter,
+        columns: list[tuple[str, str]],
+        page_size: int,
+        blob_threshold: int | None = None,
+    ) -> tuple[ResultBuffer, Any, Any]:
+        """Serialize up to ``page_size`` rows into a memory-bounded buffer.
+
+        Rows are read one at a time so that at most one page of serialized
+        rows (within the budget) is held in memory.
+
+        Returns:
+            Tuple of (buffer, last raw row in the page, lookahead raw row or
+            None if the rows are exhausted)
+
+        Raises:
+            ResultTooLargeError: If the page exceeds the hard size cap
+        """
+        buffer = ResultBuffer.for_query()
+        last_row = None
+        try:
+            for row in rows:
+                if len(buffer) == page_size:
+                    return buffer, last_row, row
+                buffer.append(cls._serialize_row(adapter, row, columns, blob_threshold))
+                last_row = row
+        except BaseException:
+            buffer.close()
+            raise
+        return buffer, last_row, None
+
+    @classmethod
+    def _describe_columns(cls, result: CursorResult[Any]) -> list[tuple[str, str]]:
+        """Extract (name, type) pairs from the cursor description."""
+        columns = []
+        for col in result.cursor.description:
+            col_name = col[0]
+            col_type = col[1].__name__ if hasattr(col[1], "__name__") else str(col[1])
+            columns.append((col_name, col_type))
+        return columns
+
+    @classmethod
+    def _serialize_row(
+        cls,
+        adapter: DatabaseAdapter,
+        row: Sequence[Any],
+        columns: list[tuple[str, str]],
+        blob_threshold: int | None = None,
+    ) -> dict[str, Any]:
+        """Serialize one result row using the adapter.
+
+        If ``blob_threshold`` is set, binary values larger than it are replaced
+        by a descriptor instead of being encoded inline.
+        """
+        row_dict: dict[str, Any] = {}
+        for i, col in enumerate(columns):
+            value = row[i]
+            if (
+                blob_threshold is not None
+                and isinstance(value, BINARY_TYPES)
+                and len(value) > blob_threshold
+            ):
+                row_dict[col[0]] = describe_blob(value)
+                continue
+            try:
+                row_dict[col[0]] = adapter.serialize(value)
+            except Exception:
+                # Fallback: convert to string if serialization fails
+                row_dict[col[0]] = str(value) if value is not None else None
+        return row_dict
 
     @classmethod
     def _serialize_value(cls, value: Any, db_type: str = "postgres") -> Any:
@@ -0,0 +1,316 @@
+"""On-demand profiling of single requests.
+
+A request sent with ``X-Profile: cpu`` or ``X-Profile: mem`` and the admin
+token (``REQUEST_PROFILE_TOKEN``) in ``X-Profile-Token`` is profiled by
+:class:`~src.middleware.profiling.ProfilingMiddleware`:
+
+- ``cpu`` runs cProfile on the event loop thread while the request is
+  handled. cProfile only sees the thread it was enabled on, so work that a
+  route hands to a worker thread must go through :func:`profiled_to_thread`
+  (as ``/ask`` does for EXPLAIN and the query), and streamed bodies through
+  :func:`profiled_iterator`, to be profiled too. Their stats are merged into
+  the profile. Other thread pool work, such as sync dependencies, is not
+  included. The output is the raw ``.pstats`` file (for ``pstats``/snakeviz)
+  and a text report of the top functions by cumulative time.
+- ``mem`` traces allocations with tracemalloc and compares snapshots taken
+  before and after the request, including query execution and encoding of
+  the result. The output is a text report of the peak traced memory and the
+  lines that allocated the most.
+
+Profiling is serialized: a profile request arriving while another one runs
+gets ``PROFILER_BUSY``. Other requests are never profiled, but those that
+run on the event loop during a CPU profile show up in it and pay the
+tracing overhead for that time. Profiles are kept in
+``REQUEST_PROFILE_DIR``; only the newest ``REQUEST_PROFILE_KEEP`` are kept.
+"""
+
+import asyncio
+import cProfile
+import hmac
+import io
+import json
+import pstats
+import re
+import secrets
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+from src.config import settings
+
+PROFILE_KINDS = ("cpu", "mem")
+
+# Stack frames kept per allocation when tracing memory
+TRACEMALLOC_FRAMES = 10
+
+_PROFILE_ID = re.compile(r"^[0-9]{20}-[0-9a-f]{8}$")
+
+T = TypeVar("T")
+
+
+def check_token(token: str | None) -> bool:
+    """Check an admin token; profiling is disabled when none is configured."""
+    expected = settings.request_profile_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode(), expected.encode())
+
+
+@dataclass
+class ProfileRecord:
+    """A saved request profile."""
+
+    id: str
+    kind: str
+    method: str
+    path: str
+    status: int | None
+    duration_ms: float
+    created_at: str
+    files: list[str] = field(default_factory=list)
+
+
+class _CpuSession:
+    def __init__(self) -> None:
+        self.profiler = cProfile.Profile()
+        self.thread_id: int | None = None
+        # Profiles of work the request ran on worker threads
+        self.thread_profilers: list[cProfile.Profile] = []
+        self.stopped = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.thread_id = threading.get_ident()
+        self.profiler.enable()
+
+    def stop(self) -> None:
+        self.profiler.disable()
+        with self._lock:
+            self.stopped = True
+
+    def add_thread_profiler(self, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            # Work still running when the response is done isn't reported
+            if not self.stopped:
+                self.thread_profilers.append(profiler)
+
+    def write(self, directory: Path, profile_id: str, top: int) -> list[str]:
+        report = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=report)
+        for profiler in self.thread_profilers:
+            stats.add(profiler)
+        stats.dump_stats(directory / f"{profile_id}.pstats")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        (directory / f"{profile_id}.txt").write_text(report.getvalue(), encoding="utf-8")
+        return [f"{profile_id}.pstats", f"{profile_id}.txt"]
+
+
+class _MemorySession:
+    def __init__(self) -> None:
+        self.started_tracing = False
+        self.before: tracemalloc.Snapshot | None = None
+        self.after: tracemalloc.Snapshot | None = None
+        self.peak = 0
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.started_tracing = True
+        tracemalloc.reset_peak()
+        self.before = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        self.after = tracemalloc.take_snapshot()
+        self.peak = tracemalloc.get_traced_memory()[1]
+        if self.started_tracing:
+            tracemalloc.stop()
+
+    def write(self, directory: Path, profile_id: str, top: int) -> list[str]:
+        ignored = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*"),
+        ]
+        if self.before is None or self.after is None:
+            raise RuntimeError("memory profile written before it was stopped")
+        before = self.before.filter_traces(ignored)
+        after = self.after.filter_traces(ignored)
+        lines = [f"Peak traced memory: {self.peak / 1024:.1f} KiB", ""]
+        lines.append(f"Top {top} allocating lines (size after request, change):")
+        for stat in after.compare_to(before, "lineno")[:top]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"{stat.size / 1024:10.1f} KiB {stat.size_diff / 1024:+10.1f} KiB "
+                f"{stat.count:8} blocks  {frame.filename}:{frame.lineno}"
+            )
+        lines.append("")
+        lines.append(f"Top {top} allocating tracebacks (change):")
+        for stat in after.compare_to(before, "traceback")[:top]:
+            lines.append(f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8} blocks")
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+        (directory / f"{profile_id}.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return [f"{profile_id}.txt"]
+
+
+# The CPU session of the request being handled, seen by worker threads
+# through the context they copy
+_cpu_session: ContextVar[_CpuSession | None] = ContextVar("cpu_session", default=None)
+
+
+def _run_profiled(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    session = _cpu_session.get()
+    if session is None or session.thread_id == threading.get_ident():
+        return func(*args, **kwargs)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        session.add_thread_profiler(profiler)
+
+
+async def profiled_to_thread(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Like :func:`asyncio.to_thread`, but covered by a CPU profile of the request."""
+    return await asyncio.to_thread(_run_profiled, func, *args, **kwargs)
+
+
+def profiled_iterator(iterator: Iterator[T]) -> Iterator[T]:
+    """Wrap a streamed body so a CPU profile covers producing its chunks.
+
+    Starlette iterates sync bodies on worker threads.
+    """
+    while True:
+        try:
+            yield _run_profiled(next, iterator)
+        except StopIteration:
+            return
+
+
+class ProfileSession:
+    """One profiled request; created by :meth:`RequestProfiler.begin`."""
+
+    def __init__(self, profiler: "RequestProfiler", kind: str, method: str, path: str):
+        self.profiler = profiler
+        self.id = f"{datetime.now(UTC):%Y%m%d%H%M%S%f}-{secrets.token_hex(4)}"
+        self.kind = kind
+        self.method = method
+        self.path = path
+        self.status: int | None = None
+        self._session = _CpuSession() if kind == "cpu" else _MemorySession()
+        self._started = 0.0
+        self._context_token: Token[_CpuSession | None] | None = None
+
+    def start(self) -> None:
+        """Start profiling; call from the task that handles the request."""
+        self._started = time.perf_counter()
+        if isinstance(self._session, _CpuSession):
+            self._context_token = _cpu_session.set(self._session)
+        self._session.start()
+
+    def finish(self) -> ProfileRecord:
+        """Stop profiling, save the output and release the profiler."""
+        try:
+            self._session.stop()
+            if self._context_token is not None:
+                _cpu_session.reset(self._context_token)
+            duration_ms = (time.perf_counter() - self._started) * 1000
+            return self.profiler.save(self, self._session, duration_ms)
+        finally:
+            self.profiler.release()
+
+
+class RequestProfiler:
+    """Runs one request profile at a time and stores the results."""
+
+    def __init__(self, directory: str, keep: int, top: int = 50):
+        self.directory = directory
+        self.keep = keep
+        self.top = top
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        if self.directory:
+            return Path(self.directory).expanduser()
+        return settings.sqlite_path.parent / "profiles"
+
+    def begin(self, kind: str, method: str, path: str) -> ProfileSession | None:
+        """Reserve the profiler for a request, or return None if it's busy."""
+        if not self._lock.acquire(blocking=False):
+            return None
+        return ProfileSession(self, kind, method, path)
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def save(
+        self, session: ProfileSession, output: _CpuSession | _MemorySession, duration_ms: float
+    ) -> ProfileRecord:
+        directory = self.path
+        directory.mkdir(parents=True, exist_ok=True)
+        files = output.write(directory, session.id, self.top)
+        record = ProfileRecord(
+            id=session.id,
+            kind=session.kind,
+            method=session.method,
+            path=session.path,
+            status=session.status,
+            duration_ms=round(duration_ms, 1),
+            created_at=datetime.now(UTC).isoformat(),
+            files=files,
+        )
+        (directory / f"{session.id}.json").write_text(
+            json.dumps(asdict(record)), encoding="utf-8"
+        )
+        self._prune(directory)
+        return record
+
+    def records(self) -> list[ProfileRecord]:
+        """Return the saved profiles, newest first."""
+        directory = self.path
+        if not directory.is_dir():
+            return []
+        records = []
+        for meta in sorted(directory.glob("*.json"), reverse=True):
+            record = self._load(meta)
+            if record is not None:
+                records.append(record)
+        return records
+
+    def get(self, profile_id: str) -> ProfileRecord | None:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        return self._load(self.path / f"{profile_id}.json")
+
+    def file_path(self, profile_id: str, filename: str) -> Path | None:
+        """Return the path of one of a profile's files, if it exists."""
+        record = self.get(profile_id)
+        if record is None or filename not in record.files:
+            return None
+        path = self.path / filename
+        return path if path.is_file() else None
+
+    def _load(self, meta: Path) -> ProfileRecord | None:
+        try:
+            return ProfileRecord(**json.loads(meta.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _prune(self, directory: Path) -> None:
+        for meta in sorted(directory.glob("*.json"), reverse=True)[self.keep :]:
+            record = self._load(meta)
+            for filename in record.files if record else []:
+                (directory / filename).unlink(missing_ok=True)
+            meta.unlink(missing_ok=True)
+
+
+request_profiler = RequestProfiler(
+    settings.request_profile_dir,
+    settings.request_profile_keep,
+)
@@ -0,0 +1,184 @@
+"""Memory-bounded buffering of serialized query results.
+
+Rows are accounted by their approximate JSON size as they are serialized.
+Rows stay in memory while both the per-query budget and the process-wide
+budget allow it; after that they are spilled as JSON lines to a temporary
+file, which is memory-mapped when the result is streamed back. A hard cap on
+the total result size aborts the query with ``RESULT_TOO_LARGE``.
+"""
+
+import json
+import mmap
+import tempfile
+import threading
+from collections.abc import Iterator
+from typing import IO, Any
+
+from src.config import settings
+from src.models.errors import ResultTooLargeError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+# Approximate encoded size of scalars that aren't strings
+_SCALAR_SIZE = 8
+
+
+class MemoryBudget:
+    """A byte budget shared by all queries in the process."""
+
+    def __init__(self, limit_bytes: int):
+        self.limit_bytes = limit_bytes
+        self._used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+    def try_reserve(self, size: int) -> bool:
+        """Reserve bytes if the budget allows it."""
+        with self._lock:
+            if self._used + size > self.limit_bytes:
+                return False
+            self._used += size
+            return True
+
+    def release(self, size: int) -> None:
+        """Return previously reserved bytes to the budget."""
+        with self._lock:
+            self._used = max(0, self._used - size)
+
+
+process_budget = MemoryBudget(settings.process_result_budget_bytes)
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the JSON-encoded size of a serialized value in bytes."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return _SCALAR_SIZE
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, dict):
+        return 2 + sum(len(str(key)) + 4 + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return 2 + sum(estimate_size(item) + 1 for item in value)
+    return len(str(value)) + 2
+
+
+class ResultBuffer:
+    """Ordered buffer of serialized rows with spill-to-disk overflow.
+
+    Always call :meth:`close` when done so the memory reservation is returned
+    and the spill file is removed.
+    """
+
+    def __init__(
+        self,
+        query_budget_bytes: int,
+        max_bytes: int,
+        budget: MemoryBudget,
+        spill_dir: str | None = None,
+    ):
+        self.query_budget_bytes = query_budget_bytes
+        self.max_bytes = max_bytes
+        self.budget = budget
+        self.spill_dir = spill_dir
+        self.size_bytes = 0
+        self._rows: list[dict[str, Any]] = []
+        self._memory_bytes = 0
+        self._spill_file: IO[bytes] | None = None
+        self._spilled_count = 0
+
+    @classmethod
+    def for_query(cls) -> "ResultBuffer":
+        """Create a buffer using the configured budgets."""
+        return cls(
+            query_budget_bytes=settings.query_result_budget_bytes,
+            max_bytes=settings.query_result_max_bytes,
+            budget=process_budget,
+            spill_dir=settings.result_spill_dir or None,
+        )
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill_file is not None
+
+    def append(self, row: dict[str, Any]) -> None:
+        """Add a serialized row, spilling to disk once the budgets are used up.
+
+        Raises:
+            ResultTooLargeError: If the result exceeds the hard size cap
+        """
+        size = estimate_size(row)
+        if self.size_bytes + size > self.max_bytes:
+            raise ResultTooLargeError(self.max_bytes)
+        self.size_bytes += size
+
+        if (
+            not self.spilled
+            and self._memory_bytes + size <= self.query_budget_bytes
+            and self.budget.try_reserve(size)
+        ):
+            self._rows.append(row)
+            self._memory_bytes += size
+            return
+
+        # Once spilled, keep appending to disk so rows stay in order
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(dir=self.spill_dir)
+        self._spill_file.write(encode_json(row))
+        self._spill_file.write(b"\n")
+        self._spilled_count += 1
+
+    def __len__(self) -> int:
+        return len(self._rows) + self._spilled_count
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        yield from self._rows
+        loads = orjson.loads if orjson is not None else json.loads
+        for line in self._iter_spilled_lines():
+            yield loads(line)
+
+    def iter_json(self) -> Iterator[bytes]:
+        """Yield each row as encoded JSON; spilled rows are passed through as-is."""
+        for row in self._rows:
+            yield encode_json(row)
+        yield from self._iter_spilled_lines()
+
+    def _iter_spilled_lines(self) -> Iterator[bytes]:
+        if self._spill_file is None or self._spilled_count == 0:
+            return
+        self._spill_file.flush()
+        with mmap.mmap(self._spill_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
+            while start < len(mapped):
+                end = mapped.find(b"\n", start)
+                yield mapped[start:end]
+                start = end + 1
+
+    def close(self) -> None:
+        """Release the memory reservation and delete the spill file."""
+        if self._memory_bytes:
+            self.budget.release(self._memory_bytes)
+            self._memory_bytes = 0
+        self._rows = []
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+            self._spilled_count = 0
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles them
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode(
+        "utf-8"
+    )
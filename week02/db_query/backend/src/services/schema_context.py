@@ -0,0 +1,323 @@
+"""Schema context for natural language queries.
+
+Large catalogs don't fit in a prompt, so the context sent to the LLM is
+pruned per question. Each table becomes a document made of its name, column
+names, comments and the names of the tables it is joined to by foreign keys.
+The documents are ranked against the question with BM25, and the top tables
+plus their foreign key neighbours are rendered until a token budget is spent.
+Catalogs that fit in the budget are sent whole.
+
+Rendering and indexing a catalog reads every table and column row, so built
+catalogs are kept in :data:`schema_catalog_cache`, keyed by connection,
+catalog version and SQL dialect.
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from src.db.models import ColumnMetadata, TableMetadata
+
+# Rough characters per token for schema text, used to estimate prompt size
+CHARS_PER_TOKEN = 4
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_ASCII_WORDS = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+_NON_ASCII_RUNS = re.compile(r"[^\x00-\x7f]+")
+_STOPWORDS = frozenset(
+    """a an and are as at be by do does for from give how i in is it list me of on or
+    per show that the their them there these this to was what which who with""".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text or identifiers into lowercase search terms.
+
+    ``customer_orders``, ``customerOrders`` and "customer orders" all give
+    ``["customer", "order"]``: identifiers are split on case changes and
+    separators, and a plural ``s`` is dropped. Non-ASCII runs (e.g. Chinese
+    comments and questions) are indexed as character bigrams.
+    """
+    terms = []
+    for word in _ASCII_WORDS.findall(text):
+        word = word.lower()
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+            word = word[:-1]
+        terms.append(word)
+    for run in _NON_ASCII_RUNS.findall(text):
+        run = "".join(ch for ch in run if ch.isalnum())
+        if len(run) == 1:
+            terms.append(run)
+        terms.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class BM25Index:
+    """Okapi BM25 over tokenized documents."""
+
+    def __init__(self, documents: list[list[str]]):
+        self.term_counts = [Counter(doc) for doc in documents]
+        self.lengths = [len(doc) for doc in documents]
+        self.avg_length = sum(self.lengths) / len(documents) if documents else 0.0
+        document_frequency: Counter[str] = Counter()
+        for counts in self.term_counts:
+            document_frequency.update(counts.keys())
+        n = len(documents)
+        self.idf = {
+            term: math.log((n - df + 0.5) / (df + 0.5) + 1)
+            for term, df in document_frequency.items()
+        }
+
+    def scores(self, query: Iterable[str]) -> list[float]:
+        terms = [term for term in set(query) if term in self.idf]
+        results = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            score = 0.0
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (self.avg_length or 1))
+            for term in terms:
+                tf = counts.get(term)
+                if tf:
+                    score += self.idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+
+def format_row_estimate(row_estimate: int | None, large_table_rows: int) -> str:
+    """Format a table's estimated row count for its header line."""
+    if row_estimate is None:
+        return ""
+    if row_estimate >= large_table_rows:
+        return f", ~{row_estimate:,} rows, LARGE"
+    return f", ~{row_estimate:,} rows"
+
+
+def render_table(
+    table: TableMetadata, columns: list[ColumnMetadata], large_table_rows: int
+) -> str:
+    """Render one table (with its columns, indexes and foreign keys) for the prompt."""
+    size = format_row_estimate(table.row_estimate, large_table_rows)
+    # An index can only be used through its leading column
+    indexed = {index.columns[0] for index in table.indexes if index.columns}
+    unique = {
+        index.columns[0] for index in table.indexes if index.is_unique and len(index.columns) == 1
+    }
+    column_defs = []
+    for col in columns:
+        constraints = []
+        if col.is_primary_key:
+            constraints.append("PRIMARY KEY")
+        elif col.column_name in unique:
+            constraints.append("UNIQUE INDEXED")
+        elif col.column_name in indexed:
+            constraints.append("INDEXED")
+        if not col.is_nullable:
+            constraints.append("NOT NULL")
+        if col.default_value:
+            constraints.append(f"DEFAULT {col.default_value}")
+        if col.comment:
+            constraints.append(f"-- {col.comment}")
+
+        constraint_str = f" {', '.join(constraints)}" if constraints else ""
+        column_defs.append(f"  {col.column_name} {col.data_type}{constraint_str}")
+
+    column_str = ",\n".join(column_defs)
+    part = f"Table: {table.schema_name}.{table.table_name} ({table.table_type}{size})\n"
+    if table.comment:
+        part += f"Description: {table.comment}\n"
+    part += f"Columns:\n{column_str}"
+    composite = [index for index in table.indexes if len(index.columns) > 1]
+    if composite:
+        part += "\nComposite indexes:\n" + "\n".join(
+            f"  {'UNIQUE ' if index.is_unique else ''}({', '.join(index.columns)})"
+            for index in composite
+        )
+    if table.foreign_keys:
+        part += "\nForeign keys:\n" + "\n".join(
+            f"  ({', '.join(fk.columns)}) -> "
+            f"{fk.referred_schema or table.schema_name}.{fk.referred_table}"
+            f"({', '.join(fk.referred_columns)})"
+            for fk in table.foreign_keys
+        )
+    return part
+
+
+@dataclass
+class CatalogEntry:
+    """One table of a schema catalog, rendered and indexed."""
+
+    key: str
+    text: str
+    tokens: int
+    neighbours: set[str] = field(default_factory=set)
+
+
+@dataclass
+class SchemaContext:
+    """The schema context selected for one question."""
+
+    text: str
+    tables: list[str]
+    total_tables: int
+    token_estimate: int
+
+
+class SchemaCatalog:
+    """Rendered tables of a database, searchable by question."""
+
+    def __init__(self, entries: list[CatalogEntry], documents: list[list[str]]):
+        self.entries = entries
+        self.index = BM25Index(documents)
+        self.total_tokens = sum(entry.tokens for entry in entries)
+
+    @classmethod
+    def build(
+        cls,
+        tables: list[TableMetadata],
+        columns_by_table: dict[int, list[ColumnMetadata]],
+        large_table_rows: int,
+    ) -> "SchemaCatalog":
+        """Render and index tables.
+
+        Args:
+            tables: Table metadata rows (with ``indexes`` and ``foreign_keys``)
+            columns_by_table: Column metadata rows keyed by table id
+            large_table_rows: Row estimate above which tables are flagged LARGE
+        """
+        keys = {table.id: f"{table.schema_name}.{table.table_name}" for table in tables}
+        by_name = {(table.schema_name, table.table_name): keys[table.id] for table in tables}
+        neighbours: dict[str, set[str]] = {key: set() for key in keys.values()}
+        for table in tables:
+            for fk in table.foreign_keys:
+                referred = by_name.get((fk.referred_schema or table.schema_name, fk.referred_table))
+                if referred and referred != keys[table.id]:
+                    neighbours[keys[table.id]].add(referred)
+                    neighbours[referred].add(keys[table.id])
+
+        entries = []
+        documents = []
+        for table in tables:
+            key = keys[table.id]
+            columns = columns_by_table.get(table.id, [])
+            text = render_table(table, columns, large_table_rows)
+            entries.append(
+                CatalogEntry(key=key, text=text, tokens=estimate_tokens(text), neighbours=neighbours[key])
+            )
+            # The table name counts twice: it says most about what a table holds
+            words = [table.table_name, table.table_name, table.comment or ""]
+            for col in columns:
+                words.extend([col.column_name, col.comment or ""])
+            words.extend(name.split(".", 1)[1] for name in neighbours[key])
+            documents.append(tokenize(" ".join(words)))
+        return cls(entries, documents)
+
+    def render_all(self) -> str:
+        return "\n\n".join(entry.text for entry in self.entries)
+
+    def select(self, question: str, top_tables: int, max_tokens: int) -> SchemaContext:
+        """Select the tables relevant to a question within a token budget.
+
+        The ``top_tables`` best matching tables come first, followed by their
+        foreign key neighbours. Tables are added in that order while they fit
+        in ``max_tokens``; the best match is always included. When no table
+        matches (e.g. the question shares no words with the schema), tables
+        are taken in catalog order.
+        """
+        if self.total_tokens <= max_tokens:
+            return self._context(self.entries)
+
+        scores = self.index.scores(tokenize(question))
+        ranked = sorted(
+            (i for i, score in enumerate(scores) if score > 0), key=lambda i: -scores[i]
+        )
+        if ranked:
+            position = {entry.key: i for i, entry in enumerate(self.entries)}
+            primary = ranked[:top_tables]
+            chosen = set(primary)
+            neighbours = sorted(
+                {
+                    position[key]
+                    for i in primary
+                    for key in self.entries[i].neighbours
+                    if position[key] not in chosen
+                },
+                key=lambda i: -scores[i],
+            )
+            candidates = primary + neighbours
+        else:
+            candidates = list(range(len(self.entries)))
+
+        selected: list[CatalogEntry] = []
+        budget = max_tokens
+        for i in candidates:
+            entry = self.entries[i]
+            if selected and entry.tokens > budget:
+                continue
+            selected.append(entry)
+            budget -= entry.tokens
+        return self._context(selected)
+
+    def _context(self, entries: list[CatalogEntry]) -> SchemaContext:
+        text = "\n\n".join(entry.text for entry in entries)
+        return SchemaContext(
+            text=text,
+            tables=[entry.key for entry in entries],
+            total_tables=len(self.entries),
+            token_estimate=estimate_tokens(text),
+        )
+
+
+# (connection name, catalog version, sqlglot dialect)
+CatalogKey = tuple[str, int | None, str]
+
+
+class SchemaCatalogCache:
+    """Built catalogs keyed by (connection name, catalog version, dialect).
+
+    Only the newest catalog version of each connection is kept: storing a
+    catalog drops the connection's older ones.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[CatalogKey, SchemaCatalog] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: CatalogKey) -> SchemaCatalog | None:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: CatalogKey, catalog: SchemaCatalog) -> None:
+        db_name, version = key[0], key[1]
+        with self._lock:
+            for stale in [
+                k for k in self._entries if k[0] == db_name and k[1] != version
+            ]:
+                del self._entries[stale]
+            self._entries[key] = catalog
+
+    def invalidate(self, db_name: str) -> None:
+        """Drop every catalog of a connection."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == db_name]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+schema_catalog_cache = SchemaCatalogCache()
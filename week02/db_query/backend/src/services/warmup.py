@@ -0,0 +1,141 @@
+"""Connection pool warm-up on startup.
+
+Engine creation, DNS lookup, TLS and authentication are paid on the first
+connection to each database. Warm-up does that work for every registered
+endpoint (primaries and replicas) concurrently at startup, leaving
+``pool_min_idle`` open connections in each pool. Warm-up has a time budget:
+when it runs out the service reports ready anyway and slow hosts keep warming
+in the background.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.services.connection import ConnectionManager
+from src.services.pool import engine_pool
+
+
+@dataclass
+class EndpointWarmup:
+    """Outcome of warming up one endpoint."""
+
+    name: str
+    url: str
+    connections: int = 0
+    duration_ms: float | None = None
+    error: str | None = None
+
+
+@dataclass
+class WarmupState:
+    """Progress of the startup warm-up, used for readiness."""
+
+    started_at: float | None = None
+    finished_at: float | None = None
+    timed_out: bool = False
+    endpoints: list[EndpointWarmup] = field(default_factory=list)
+    _done: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def begin(self, endpoints: list[EndpointWarmup]) -> None:
+        self._done.clear()
+        self.endpoints = endpoints
+        self.timed_out = False
+        self.started_at = time.monotonic()
+        self.finished_at = None
+
+    def finish(self, timed_out: bool = False) -> None:
+        self.timed_out = timed_out
+        self.finished_at = time.monotonic()
+        self._done.set()
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize the warm-up for the readiness endpoint."""
+        finished = [e for e in self.endpoints if e.duration_ms is not None]
+        duration_ms = None
+        if self.started_at is not None and self.finished_at is not None:
+            duration_ms = round((self.finished_at - self.started_at) * 1000, 1)
+        return {
+            "durationMs": duration_ms,
+            "timedOut": self.timed_out,
+            "endpoints": len(self.endpoints),
+            "warmed": sum(1 for e in finished if e.error is None),
+            "failed": [e.name for e in finished if e.error is not None],
+            "pending": [e.name for e in self.endpoints if e.duration_ms is None],
+        }
+
+
+warmup_state = WarmupState()
+
+
+def warm_endpoint(endpoint: EndpointWarmup, min_idle: int) -> None:
+    """Create the endpoint's engine and open up to ``min_idle`` connections.
+
+    The connections are opened together and then returned to the pool, so
+    they stay there as idle connections.
+    """
+    started = time.monotonic()
+    connections = []
+    try:
+        engine = ConnectionManager.get_engine(endpoint.name, endpoint.url)
+        for _ in range(max(1, min(min_idle, engine_pool(engine).size()))):
+            connections.append(engine.connect())
+        endpoint.connections = len(connections)
+    except Exception as e:
+        endpoint.error = str(e)
+    finally:
+        for conn in connections:
+            conn.close()
+        endpoint.duration_ms = round((time.monotonic() - started) * 1000, 1)
+
+
+def start_warmup(
+    endpoints: list[tuple[str, str]],
+    min_idle: int,
+    timeout_seconds: float,
+    max_workers: int,
+    state: WarmupState = warmup_state,
+) -> threading.Thread:
+    """Warm up endpoints in the background.
+
+    Args:
+        endpoints: (connection name, URL) pairs to warm up
+        min_idle: Idle connections to leave in each pool
+        timeout_seconds: Time budget after which the state is marked ready
+            even if some endpoints are still connecting
+        max_workers: Number of endpoints warmed up concurrently
+        state: Warm-up state to report progress to
+
+    Returns:
+        The thread coordinating the warm-up
+    """
+    state.begin([EndpointWarmup(name=name, url=url) for name, url in endpoints])
+
+    def run() -> None:
+        if not state.endpoints:
+            state.finish()
+            return
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(state.endpoints))),
+            thread_name_prefix="warmup",
+        )
+        futures = [
+            executor.submit(warm_endpoint, endpoint, min_idle) for endpoint in state.endpoints
+        ]
+        _, not_done = wait(futures, timeout=timeout_seconds)
+        state.finish(timed_out=bool(not_done))
+        # Slow endpoints keep warming in the background
+        executor.shutdown(wait=False)
+
+    thread = threading.Thread(target=run, name="warmup", daemon=True)
+    thread.start()
+    return thread
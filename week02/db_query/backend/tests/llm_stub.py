@@ -0,0 +1,204 @@
+"""Local OpenAI-compatible chat completions server for tests.
+
+The stub answers ``POST /chat/completions`` after an injected latency, and
+can be scripted to fail the next requests with given status codes. Streaming
+requests get the content as server-sent chunks of ``chunk_size``
+characters, ``chunk_delay_seconds`` apart. With ``tokens_per_second`` set,
+the answer also takes as long as a model writing at that rate would
+(counting four characters per token). ``responses`` is a list of canned
+answers used in turn instead of ``content``. It
+records how many requests it saw, the most it handled at once, how many
+TCP connections were opened and the size of each prompt, so tests can check
+retries, concurrency limits and connection reuse, and benchmarks can run
+without a model API.
+
+Usage::
+
+    with LlmStub(content='{"sql": "SELECT 1", "explanation": ""}') as stub:
+        stub.fail_next(503, 429)
+        ...  # point the client at stub.base_url
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Clients hang up mid-answer when deadline and cancellation tests
+        # give up on a request. The default handler prints the traceback
+        # from the handler thread, and on Python 3.11 formatting it parses
+        # source with ast, which races with ast use on other threads (such
+        # as pytest's assertion rewriting) and can fail them
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class LlmStub:
+    def __init__(
+        self,
+        content: str = "{}",
+        latency_seconds: float = 0.0,
+        chunk_size: int = 8,
+        chunk_delay_seconds: float = 0.0,
+        tokens_per_second: float | None = None,
+        responses: list[str] | None = None,
+    ):
+        self.content = content
+        self.latency_seconds = latency_seconds
+        self.chunk_size = chunk_size
+        self.chunk_delay_seconds = chunk_delay_seconds
+        self.tokens_per_second = tokens_per_second
+        self.responses = responses
+        # Characters of message content in each request, in arrival order
+        self.prompt_chars: list[int] = []
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.retry_after: float | None = None
+        self._failures: list[int] = []
+        self._lock = threading.Lock()
+        self._server = _StubServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def writing_seconds(self, text: str) -> float:
+        """Time the simulated model takes to write ``text``."""
+        if not self.tokens_per_second:
+            return 0.0
+        return len(text) / 4 / self.tokens_per_second
+
+    def fail_next(self, *status_codes: int) -> None:
+        """Answer the next requests with these status codes, in order."""
+        with self._lock:
+            self._failures.extend(status_codes)
+
+    def __enter__(self) -> "LlmStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                request = json.loads(body or b"{}")
+                prompt_chars = sum(
+                    len(message.get("content") or "") for message in request.get("messages", [])
+                )
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    stub.prompt_chars.append(prompt_chars)
+                    failure = stub._failures.pop(0) if stub._failures else None
+                    if stub.responses:
+                        content = stub.responses[(stub.requests - 1) % len(stub.responses)]
+                    else:
+                        content = stub.content
+                try:
+                    time.sleep(stub.latency_seconds)
+                    if failure is not None:
+                        headers = {}
+                        if stub.retry_after is not None:
+                            headers["Retry-After"] = str(stub.retry_after)
+                        self._send(failure, {"error": {"message": f"injected {failure}"}}, headers)
+                        return
+                    if request.get("stream"):
+                        self._stream(request, content)
+                        return
+                    time.sleep(stub.writing_seconds(content))
+                    self._send(
+                        200,
+                        {
+                            "id": f"chatcmpl-{stub.requests}",
+                            "object": "chat.completion",
+                            "created": int(time.time()),
+                            "model": request.get("model", "stub"),
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": {"role": "assistant", "content": content},
+                                    "finish_reason": "stop",
+                                }
+                            ],
+                            "usage": {
+                                "prompt_tokens": prompt_chars // 4,
+                                "completion_tokens": len(content) // 4,
+                                "total_tokens": (prompt_chars + len(content)) // 4,
+                            },
+                        },
+                    )
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _stream(self, request: dict, content: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for offset in range(0, len(content), stub.chunk_size):
+                    chunk = {
+                        "id": f"chatcmpl-{stub.requests}",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": request.get("model", "stub"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "delta": {"content": content[offset : offset + stub.chunk_size]},
+                                "finish_reason": None,
+                            }
+                        ],
+                    }
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                    time.sleep(
+                        stub.chunk_delay_seconds
+                        + stub.writing_seconds(content[offset : offset + stub.chunk_size])
+                    )
+                self._write_chunk(b"data: [DONE]\n\n")
+                self._write_chunk(b"")
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send(self, status: int, payload: dict, headers: dict | None = None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
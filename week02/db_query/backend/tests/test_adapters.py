@@ -179,6 +179,21 @@ class TestMySQLAdapter:
     def test_normalize_data_type_json(self, adapter):
         assert adapter.normalize_data_type("JSON") == "JSON"
 
+    def test_add_statement_timeout_hint(self, adapter):
+        assert (
+            adapter.add_statement_timeout_hint("select * from t", 500)
+            == "SELECT /*+ MAX_EXECUTION_TIME(500) */ * from t"
+        )
+        assert adapter.add_statement_timeout_hint("SELECT 1", None) == "SELECT 1"
+
+    def test_is_timeout_error(self, adapter):
+        class FakeMySQLError(Exception):
+            pass
+
+        assert adapter.is_timeout_error(FakeMySQLError(3024, "Query execution was interrupted"))
+        assert not adapter.is_timeout_error(FakeMySQLError(1064, "Syntax error"))
+        assert not adapter.is_timeout_error(ValueError())
+
     def test_get_nl_system_prompt(self, adapter):
         prompt = adapter.get_nl_system_prompt()
         assert "MySQL" in prompt
@@ -216,6 +231,14 @@ class TestPostgreSQLAdapter:
         assert adapter.normalize_data_type("CHARACTER VARYING") == "VARCHAR"
         assert adapter.normalize_data_type("DOUBLE PRECISION") == "DOUBLE"
 
+    def test_is_timeout_error(self, adapter):
+        class FakePgError(Exception):
+            def __init__(self, pgcode):
+                self.pgcode = pgcode
+
+        assert adapter.is_timeout_error(FakePgError("57014"))
+        assert not adapter.is_timeout_error(FakePgError("42601"))
+
     def test_get_nl_system_prompt(self, adapter):
         prompt = adapter.get_nl_system_prompt()
         assert "PostgreSQL" in prompt
@@ -257,6 +280,12 @@ class TestSQLiteAdapter:
         assert adapter.normalize_data_type("REAL") == "REAL"
         assert adapter.normalize_data_type("FLOAT") == "REAL"
 
+    def test_is_timeout_error(self, adapter):
+        import sqlite3
+
+        assert adapter.is_timeout_error(sqlite3.OperationalError("interrupted"))
+        assert not adapter.is_timeout_error(sqlite3.OperationalError("no such table: x"))
+
     def test_get_nl_system_prompt(self, adapter):
         prompt = adapter.get_nl_system_prompt()
         assert "SQLite" in prompt
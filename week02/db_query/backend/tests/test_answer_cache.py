@@ -0,0 +1,112 @@
+"""Tests for the generated SQL cache."""
+import pytest
+
+from src.services.answer_cache import (
+    AnswerCache,
+    char_ngrams,
+    content_words,
+    normalize_question,
+)
+
+QUESTION = "Top 10 customers by revenue this month"
+
+
+@pytest.fixture
+def cache():
+    cache = AnswerCache(max_entries=3, similarity_threshold=0.85, max_age_seconds=3600)
+    cache.store("shop", 1, QUESTION, "SELECT 1", "top customers", generation_seconds=2.0)
+    return cache
+
+
+class TestNormalization:
+    """Tests for question normalization."""
+
+    def test_normalize(self):
+        assert normalize_question("  Top 10   Customers?? ") == "top 10 customers"
+        assert normalize_question("前十名客户？") == "前十名客户"
+
+    def test_content_words(self):
+        assert content_words("show me the orders that are not shipped") == {
+            "orders",
+            "not",
+            "shipped",
+        }
+
+    def test_ngrams(self):
+        assert char_ngrams("ab") == {" ab": 1, "ab ": 1}
+        assert char_ngrams("") == {"  ": 1}
+
+
+class TestAnswerCache:
+    """Tests for exact and similar matches."""
+
+    def test_exact_match(self, cache):
+        match = cache.lookup("shop", 1, "top 10 customers by revenue this month?")
+        assert match.match == "exact"
+        assert match.answer.sql == "SELECT 1"
+
+    def test_similar_match(self, cache):
+        match = cache.lookup("shop", 1, "Top 10 customers by revenue for this month")
+        assert match.match == "similar"
+        assert 0.85 <= match.similarity < 1
+
+    def test_different_numbers_never_match(self, cache):
+        assert cache.lookup("shop", 1, "Top 20 customers by revenue this month") is None
+
+    @pytest.mark.parametrize(
+        "cached, question",
+        [
+            ("list all orders that are shipped", "list all orders that are not shipped"),
+            (
+                "list all orders sorted by revenue ascending",
+                "list all orders sorted by revenue descending",
+            ),
+            ("count orders where status is paid", "count orders where status is unpaid"),
+        ],
+    )
+    def test_different_meaning_never_matches(self, cached, question):
+        cache = AnswerCache(max_entries=3, similarity_threshold=0.9, max_age_seconds=3600)
+        cache.store("shop", 1, cached, "SELECT 1", "", generation_seconds=1.0)
+        assert cache.lookup("shop", 1, question) is None
+
+    def test_unrelated_question(self, cache):
+        assert cache.lookup("shop", 1, "How many products are out of stock") is None
+
+    def test_catalog_version_and_connection(self, cache):
+        assert cache.lookup("shop", 2, QUESTION) is None
+        assert cache.lookup("other", 1, QUESTION) is None
+        cache.store("shop", 2, "orders today", "SELECT 2", "", generation_seconds=1.0)
+        assert cache.lookup("shop", 2, QUESTION) is None
+        assert cache.lookup("shop", 2, "orders today").answer.sql == "SELECT 2"
+
+    def test_evicts_least_recently_used(self, cache):
+        cache.store("shop", 1, "orders today", "SELECT 2", "", generation_seconds=1.0)
+        cache.store("shop", 1, "refunds today", "SELECT 3", "", generation_seconds=1.0)
+        assert cache.lookup("shop", 1, QUESTION) is not None
+        cache.store("shop", 1, "new customers", "SELECT 4", "", generation_seconds=1.0)
+        assert cache.lookup("shop", 1, "orders today") is None
+        assert cache.lookup("shop", 1, QUESTION) is not None
+
+    def test_expiry(self, cache):
+        cache.max_age_seconds = 0
+        assert cache.lookup("shop", 1, QUESTION) is None
+
+    def test_stats(self, cache):
+        cache.lookup("shop", 1, QUESTION)
+        cache.lookup("shop", 1, "Top 10 customers by revenue for this month")
+        cache.lookup("shop", 1, "How many products are out of stock")
+        stats = cache.stats("shop")
+        assert stats["entries"] == 1
+        assert (stats["lookups"], stats["exact_hits"], stats["similar_hits"]) == (3, 1, 1)
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.6667)
+        assert stats["latency_saved_ms"] == 4000.0
+
+        cache.invalidate("shop")
+        assert cache.stats("shop")["lookups"] == 0
+        assert cache.lookup("shop", 1, QUESTION) is None
+
+    def test_disabled(self):
+        cache = AnswerCache(max_entries=0, similarity_threshold=0.9, max_age_seconds=3600)
+        cache.store("shop", 1, QUESTION, "SELECT 1", "", generation_seconds=1.0)
+        assert cache.lookup("shop", 1, QUESTION) is None
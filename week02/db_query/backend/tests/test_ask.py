@@ -0,0 +1,154 @@
+"""Tests for the one-shot ask endpoint."""
+import json
+import pstats
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.adapters.sqlite import SQLiteAdapter
+from src.db.models import Base
+from src.db.repository import get_db
+from src.main import app
+from src.services import ask as ask_module
+from src.services import nl_query
+from src.services import request_profiler as request_profiler_module
+from src.services.llm_client import LlmClient
+from src.services.request_profiler import request_profiler
+from tests.llm_stub import LlmStub
+
+ANSWER = {"sql": "SELECT name FROM users ORDER BY id", "explanation": "All user names"}
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    db_path = tmp_path / "users.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO users (name) VALUES (?)", [("ann",), ("bob",), ("cy",)])
+    conn.commit()
+    conn.close()
+
+    # Keep connection metadata in memory rather than in the configured store
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+
+    with LlmStub(content=json.dumps(ANSWER)) as stub:
+        monkeypatch.setattr(nl_query.settings, "deepseek_api_key", "test")
+        monkeypatch.setattr(
+            nl_query,
+            "_client",
+            LlmClient(
+                api_key="test",
+                base_url=stub.base_url,
+                timeout_seconds=5.0,
+                max_retries=0,
+                retry_base_seconds=0.01,
+                max_concurrency=2,
+                max_connections=2,
+            ),
+        )
+        client = TestClient(app)
+        response = client.put(
+            "/api/v1/dbs/ask_test", json={"url": f"sqlite:///{db_path.as_posix()}"}
+        )
+        assert response.status_code == 201
+        yield client, stub
+        client.delete("/api/v1/dbs/ask_test")
+
+
+class TestAskEndpoint:
+    """Tests for POST /dbs/{name}/ask."""
+
+    def test_answers_with_rows(self, api):
+        client, _ = api
+        response = client.post("/api/v1/dbs/ask_test/ask", json={"question": "user names"})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["sql"] == ANSWER["sql"]
+        assert body["explanation"] == ANSWER["explanation"]
+        assert body["contextTables"] == ["main.users"]
+        assert body["plannerCost"] is None
+        assert body["result"]["rows"] == [{"name": "ann"}, {"name": "bob"}, {"name": "cy"}]
+        assert body["result"]["rowCount"] == 3
+        assert set(body["timings"]) == {"generationMs", "executionMs", "totalMs"}
+        assert "total;dur=" in response.headers["server-timing"]
+
+    def test_pages_results(self, api):
+        client, _ = api
+        body = client.post(
+            "/api/v1/dbs/ask_test/ask", json={"question": "user names", "pageSize": 2}
+        ).json()
+        assert body["result"]["rowCount"] == 2
+        assert body["result"]["nextCursor"]
+
+        next_page = client.post(
+            "/api/v1/dbs/ask_test/query/next", json={"cursor": body["result"]["nextCursor"]}
+        ).json()
+        assert next_page["rows"] == [{"name": "cy"}]
+
+    def test_uses_answer_cache(self, api):
+        client, stub = api
+        client.post("/api/v1/dbs/ask_test/ask", json={"question": "user names"})
+        body = client.post("/api/v1/dbs/ask_test/ask", json={"question": "User names?"}).json()
+        assert body["cache"] == "exact"
+        assert body["result"]["rowCount"] == 3
+        assert stub.requests == 1
+
+    def test_rejects_non_select(self, api):
+        client, stub = api
+        stub.content = json.dumps({"sql": "DELETE FROM users", "explanation": ""})
+        response = client.post("/api/v1/dbs/ask_test/ask", json={"question": "remove users"})
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "SQL_VALIDATION_ERROR"
+
+    def test_cost_guard(self, api, monkeypatch):
+        client, _ = api
+        monkeypatch.setattr(SQLiteAdapter, "explain_cost", lambda self, conn, sql: 5000.0)
+        monkeypatch.setattr(ask_module.settings, "ask_max_query_cost", 1000.0)
+
+        response = client.post("/api/v1/dbs/ask_test/ask", json={"question": "user names"})
+        assert response.status_code == 400
+        error = response.json()["error"]
+        assert error["code"] == "QUERY_TOO_EXPENSIVE"
+        assert error["details"]["cost"] == 5000.0
+
+        response = client.post(
+            "/api/v1/dbs/ask_test/ask", json={"question": "user names", "explain": False}
+        )
+        assert response.status_code == 200
+
+    def test_unknown_connection(self, api):
+        client, _ = api
+        response = client.post("/api/v1/dbs/missing/ask", json={"question": "anything"})
+        assert response.status_code == 404
+
+    def test_cpu_profile_covers_worker_threads(self, api, tmp_path, monkeypatch):
+        client, _ = api
+        monkeypatch.setattr(request_profiler_module.settings, "request_profile_token", "t")
+        monkeypatch.setattr(request_profiler, "directory", str(tmp_path))
+        response = client.post(
+            "/api/v1/dbs/ask_test/ask",
+            json={"question": "user names"},
+            headers={"X-Profile": "cpu", "X-Profile-Token": "t"},
+        )
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+        stats = pstats.Stats(str(tmp_path / f"{profile_id}.pstats"))
+        functions = {name for _, _, name in stats.stats}
+        assert {"check_cost", "execute_query", "_iter_query_result_json"} <= functions
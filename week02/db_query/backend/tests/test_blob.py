@@ -0,0 +1,132 @@
+"""Tests for lazy large-object handling."""
+import sqlite3
+
+import pytest
+
+from src.adapters.sqlite import SQLiteAdapter
+from src.models.errors import BlobTooLargeError
+from src.services.blob import BlobService, describe_blob, sniff_content_type
+from src.services.connection import ConnectionManager
+from src.services.query import QueryService
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+
+
+@pytest.fixture
+def blob_url(tmp_path):
+    """Create a SQLite database with a table holding binary values."""
+    path = tmp_path / "files.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE files (id INTEGER PRIMARY KEY, name TEXT, data BLOB)")
+    conn.executemany(
+        "INSERT INTO files (id, name, data) VALUES (?, ?, ?)",
+        [(1, "logo.png", PNG), (2, "small", b"\x00\x01"), (3, "empty", None)],
+    )
+    conn.commit()
+    conn.close()
+    url = f"sqlite:///{path.as_posix()}"
+    yield url
+    ConnectionManager.remove_engine("files", url)
+
+
+class TestSniffContentType:
+    """Tests for content type detection."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            (PNG, "image/png"),
+            (b"\xff\xd8\xff\xe0rest", "image/jpeg"),
+            (b"%PDF-1.7", "application/pdf"),
+            (b"RIFF\x00\x00\x00\x00WEBPVP8", "image/webp"),
+            ("héllo".encode(), "text/plain"),
+            (b"\x00\x01\x02", "application/octet-stream"),
+            (b"\xfe\xfe\xfe\xfe\xfe\xfe", "application/octet-stream"),
+        ],
+    )
+    def test_sniff(self, value, expected):
+        assert sniff_content_type(value) == expected
+
+    def test_describe_blob(self):
+        descriptor = describe_blob(memoryview(PNG))
+        assert descriptor["$blob"] is True
+        assert descriptor["length"] == len(PNG)
+        assert descriptor["contentType"] == "image/png"
+        assert len(descriptor["sha256"]) == 16
+
+
+class TestSerializeBytes:
+    """Tests for inline byte serialization."""
+
+    def test_text_bytes_decoded(self):
+        assert SQLiteAdapter().serialize(b"plain text\n") == "plain text\n"
+
+    def test_binary_bytes_hex_encoded(self):
+        assert SQLiteAdapter().serialize(b"\x00\x01\xff") == "0001ff"
+        assert SQLiteAdapter().serialize(b"\xff\xfe") == "fffe"
+
+
+class TestLazyBlobs:
+    """Tests for replacing large values with descriptors and fetching them."""
+
+    def test_lazy_mode_returns_descriptor(self, blob_url, monkeypatch):
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "blob_inline_max_bytes", 16)
+        result = QueryService.execute_query(
+            "files", blob_url, "SELECT * FROM files ORDER BY id", lazy_blobs=True
+        )
+        rows = result.rows
+        assert rows[0]["data"]["$blob"] is True
+        assert rows[0]["data"]["length"] == len(PNG)
+        # Values under the threshold stay inline
+        assert rows[1]["data"] == "0001"
+        assert rows[2]["data"] is None
+
+    def test_default_mode_inlines_values(self, blob_url):
+        result = QueryService.execute_query("files", blob_url, "SELECT data FROM files WHERE id = 1")
+        assert result.rows[0]["data"] == PNG.hex()
+
+    def test_fetch_blob_by_key(self, blob_url):
+        found, value = BlobService.fetch_blob("files", blob_url, None, "files", "data", {"id": 1})
+        assert found is True
+        assert value == PNG
+
+    def test_fetch_blob_missing_row_and_null(self, blob_url):
+        assert BlobService.fetch_blob("files", blob_url, None, "files", "data", {"id": 99}) == (
+            False,
+            None,
+        )
+        assert BlobService.fetch_blob("files", blob_url, None, "files", "data", {"id": 3}) == (
+            True,
+            None,
+        )
+
+    def test_build_fetch_sql_quotes_identifiers(self):
+        sql = BlobService.build_fetch_sql("postgres", "public", "my files", "data", ["a", "b"])
+        assert sql == (
+            'SELECT "data" FROM "public"."my files" WHERE "a" = :k0 AND "b" = :k1'
+        )
+
+    def test_fetch_blob_over_cap_refused(self, blob_url):
+        with pytest.raises(BlobTooLargeError) as error:
+            BlobService.fetch_blob(
+                "files", blob_url, None, "files", "data", {"id": 1}, max_bytes=len(PNG) - 1
+            )
+        assert error.value.details == {"lengthBytes": len(PNG), "limitBytes": len(PNG) - 1}
+
+    def test_fetch_blob_at_cap_and_uncapped(self, blob_url):
+        for max_bytes in (len(PNG), 0):
+            found, value = BlobService.fetch_blob(
+                "files", blob_url, None, "files", "data", {"id": 1}, max_bytes=max_bytes
+            )
+            assert (found, value) == (True, PNG)
+
+    def test_text_measured_in_bytes(self, blob_url):
+        with ConnectionManager.get_engine("files", blob_url).begin() as conn:
+            conn.exec_driver_sql("INSERT INTO files (id, data) VALUES (4, 'ééé')")
+        with pytest.raises(BlobTooLargeError):
+            BlobService.fetch_blob("files", blob_url, None, "files", "data", {"id": 4}, max_bytes=5)
+        assert BlobService.fetch_blob(
+            "files", blob_url, None, "files", "data", {"id": 4}, max_bytes=6
+        ) == (True, "ééé".encode())
@@ -0,0 +1,107 @@
+"""Tests for the cached catalog body of GET /dbs/{name}."""
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.models import Base
+from src.db.repository import get_db
+from src.main import app
+from src.services.catalog_cache import CatalogBodyCache, CatalogTables, catalog_body_cache
+from src.services.connection import ConnectionManager
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    db_path = tmp_path / "catalog.db"
+    conn = sqlite3.connect(db_path)
+    for i in range(20):
+        conn.execute(f"CREATE TABLE table_{i} (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    catalog_body_cache.clear()
+    client = TestClient(app)
+    url = f"sqlite:///{db_path.as_posix()}"
+    assert client.put("/api/v1/dbs/catalog_test", json={"url": url}).status_code == 201
+    yield client, db_path
+    client.delete("/api/v1/dbs/catalog_test")
+
+
+class TestCatalogEndpoint:
+    """Tests for serving the catalog from the cache."""
+
+    def test_repeated_get_is_served_from_cache(self, api):
+        client, _ = api
+        first = client.get("/api/v1/dbs/catalog_test", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/api/v1/dbs/catalog_test", headers={"Accept-Encoding": "gzip"})
+        assert first.headers["content-encoding"] == "gzip"
+        assert second.content == first.content
+        assert catalog_body_cache.hits == 1
+        body = second.json()
+        assert body["tableCount"] == 20
+        assert len(body["tables"]) == 20
+
+    def test_identity_body(self, api):
+        client, _ = api
+        response = client.get("/api/v1/dbs/catalog_test", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.json()["name"] == "catalog_test"
+
+    def test_refresh_replaces_cached_catalog(self, api):
+        client, db_path = api
+        client.get("/api/v1/dbs/catalog_test", headers={"Accept-Encoding": "gzip"})
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE added (id INTEGER PRIMARY KEY)")
+        conn.commit()
+        conn.close()
+
+        refreshed = client.post("/api/v1/dbs/catalog_test/refresh")
+        assert refreshed.json()["tableCount"] == 21
+        response = client.get("/api/v1/dbs/catalog_test", headers={"Accept-Encoding": "gzip"})
+        assert response.json()["tableCount"] == 21
+
+    def test_status_changes_are_not_served_stale(self, api):
+        client, db_path = api
+        client.get("/api/v1/dbs/catalog_test", headers={"Accept-Encoding": "gzip"})
+        ConnectionManager.configure_replicas(
+            "catalog_test", [f"sqlite:///{db_path.as_posix()}"]
+        )
+        response = client.get("/api/v1/dbs/catalog_test", headers={"Accept-Encoding": "gzip"})
+        assert len(response.json()["replicas"]) == 1
+
+
+class TestCatalogBodyCache:
+    """Tests for the catalog body cache itself."""
+
+    def test_tables_only_kept_for_current_version(self):
+        cache = CatalogBodyCache(max_entries=4)
+        cache.put_tables("db", 1, CatalogTables(body=b"[]", table_count=0, view_count=0))
+        assert cache.get_tables("db", 1) is not None
+        assert cache.get_tables("db", 2) is None
+
+    def test_bodies_evicted_and_invalidated(self):
+        cache = CatalogBodyCache(max_entries=2)
+        for version in range(3):
+            cache.put_body(("db", version, "gzip", b"{}"), b"body")
+        assert len(cache) == 2
+        assert cache.get_body(("db", 0, "gzip", b"{}")) is None
+        cache.invalidate("db")
+        assert len(cache) == 0
@@ -0,0 +1,109 @@
+"""Tests for the connection circuit breaker."""
+import pytest
+
+from src.config import settings
+from src.models.errors import CircuitOpenError
+from src.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.services.connection import ConnectionManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+
+    def test_opens_after_threshold(self, clock):
+        breaker = CircuitBreaker(failure_threshold=3, cooldown_seconds=10, clock=clock)
+        for _ in range(2):
+            assert breaker.allow_request()
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+        assert breaker.retry_after_seconds() == 10
+
+    def test_success_resets_failure_count(self, clock):
+        breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=10, clock=clock)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_single_half_open_probe(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request()
+        # Other callers fail fast while the probe is in flight
+        assert not breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_probe_reopens(self, clock):
+        breaker = CircuitBreaker(failure_threshold=3, cooldown_seconds=10, clock=clock)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 15
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.retry_after_seconds() == 10
+
+
+class TestConnectionManagerBreaker:
+    """Tests for failing fast on unreachable databases."""
+
+    def test_engine_fails_fast_when_open(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "circuit_failure_threshold", 2)
+        monkeypatch.setattr(settings, "circuit_cooldown_seconds", 0.0)
+        missing_dir = tmp_path / "not-yet"
+        url = f"sqlite:///{(missing_dir / 'db.sqlite').as_posix()}"
+        try:
+            engine = ConnectionManager.get_engine("flaky", url)
+            for _ in range(2):
+                with pytest.raises(Exception) as exc_info:
+                    engine.connect()
+                assert not isinstance(exc_info.value, CircuitOpenError)
+
+            breaker = ConnectionManager.get_breaker("flaky", url)
+            breaker.cooldown_seconds = 60
+            with pytest.raises(CircuitOpenError) as exc_info:
+                engine.connect()
+            assert exc_info.value.code == "CONNECTION_FAILED"
+            assert exc_info.value.details["retryAfterSeconds"] > 0
+
+            # Once the database is reachable, the half-open probe closes the breaker
+            missing_dir.mkdir()
+            breaker.cooldown_seconds = 0
+            with engine.connect():
+                pass
+            assert breaker.state == CLOSED
+        finally:
+            ConnectionManager.remove_engine("flaky", url)
+
+    def test_test_connection_fails_fast_when_open(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "circuit_failure_threshold", 1)
+        monkeypatch.setattr(settings, "circuit_cooldown_seconds", 60.0)
+        url = f"sqlite:///{(tmp_path / 'missing' / 'db.sqlite').as_posix()}"
+        try:
+            with pytest.raises(Exception) as exc_info:
+                ConnectionManager.test_connection("down", url)
+            assert not isinstance(exc_info.value, CircuitOpenError)
+            with pytest.raises(CircuitOpenError):
+                ConnectionManager.test_connection("down", url)
+        finally:
+            ConnectionManager.remove_engine("down", url)
@@ -0,0 +1,151 @@
+"""Tests for response compression negotiation."""
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.middleware.compression import CompressionMiddleware, GzipCodec, negotiate
+
+CATALOG = {"tables": [{"name": f"table_{i}", "columns": ["id", "name"]} for i in range(200)]}
+ROWS = [{"id": i, "name": f"user{i}"} for i in range(2000)]
+
+
+def make_app(**options) -> tuple[TestClient, CompressionMiddleware]:
+    app = FastAPI()
+
+    @app.get("/catalog")
+    async def catalog():
+        return JSONResponse(CATALOG)
+
+    @app.post("/query")
+    async def query():
+        return JSONResponse(ROWS)
+
+    @app.get("/small")
+    async def small():
+        return JSONResponse({"ok": True})
+
+    @app.get("/stream")
+    async def stream():
+        def chunks():
+            for row in ROWS:
+                yield json.dumps(row).encode() + b"\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"\x00" * 4096, media_type="image/png")
+
+    app.add_middleware(CompressionMiddleware, **options)
+    client = TestClient(app)
+    # Build the middleware stack so the instance can be inspected
+    client.get("/small")
+    middleware = app.middleware_stack
+    while not isinstance(middleware, CompressionMiddleware):
+        middleware = middleware.app
+    return client, middleware
+
+
+def decompress(encoding: str, body: bytes) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    if encoding == "br":
+        brotli = pytest.importorskip("brotli")
+        return brotli.decompress(body)
+    raise AssertionError(encoding)
+
+
+def get_raw(client, url, encoding, method="GET"):
+    """Send a request and return the response with its body still encoded."""
+    with client.stream(method, url, headers={"Accept-Encoding": encoding}) as response:
+        body = b"".join(response.iter_raw())
+    return response, body
+
+
+class NamedCodec(GzipCodec):
+    def __init__(self, name: str):
+        self.name = name
+
+
+class TestNegotiate:
+    """Tests for Accept-Encoding parsing."""
+
+    codecs = [NamedCodec("zstd"), NamedCodec("br"), NamedCodec("gzip")]
+
+    def test_server_preference_on_tie(self):
+        assert negotiate("gzip, br, zstd", self.codecs).name == "zstd"
+
+    def test_q_values(self):
+        assert negotiate("zstd;q=0.5, gzip;q=0.9", self.codecs).name == "gzip"
+
+    def test_wildcard(self):
+        assert negotiate("*;q=0.1, zstd;q=0", self.codecs).name == "br"
+
+    def test_nothing_acceptable(self):
+        assert negotiate("identity", self.codecs) is None
+        assert negotiate("", self.codecs) is None
+        assert negotiate("gzip;q=0", self.codecs) is None
+
+
+class TestCompressionMiddleware:
+    """Tests for compressing complete and streamed responses."""
+
+    @pytest.mark.parametrize("encoding", ["gzip", "zstd", "br"])
+    def test_complete_body_compressed(self, encoding):
+        if encoding == "zstd":
+            pytest.importorskip("zstandard")
+        if encoding == "br":
+            pytest.importorskip("brotli")
+        client, _ = make_app()
+        response, body = get_raw(client, "/query", encoding, method="POST")
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["content-length"] == str(len(body))
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert json.loads(decompress(encoding, body)) == ROWS
+
+    def test_small_body_not_compressed(self):
+        client, _ = make_app(minimum_size=1024)
+        response, body = get_raw(client, "/small", "gzip")
+        assert "content-encoding" not in response.headers
+        assert json.loads(body) == {"ok": True}
+
+    def test_no_accept_encoding(self):
+        client, _ = make_app()
+        response, body = get_raw(client, "/query", "identity", method="POST")
+        assert "content-encoding" not in response.headers
+        assert json.loads(body) == ROWS
+
+    def test_incompressible_type_passes_through(self):
+        client, _ = make_app()
+        response, body = get_raw(client, "/image", "gzip")
+        assert "content-encoding" not in response.headers
+        assert body.startswith(b"\x89PNG")
+
+    def test_streamed_body_compressed(self):
+        client, _ = make_app()
+        response, body = get_raw(client, "/stream", "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        lines = gzip.decompress(body).splitlines()
+        assert [json.loads(line) for line in lines] == ROWS
+
+    def test_catalog_compressed_once(self):
+        client, middleware = make_app()
+        first, first_body = get_raw(client, "/catalog", "gzip")
+        second, second_body = get_raw(client, "/catalog", "gzip")
+        assert first_body == second_body
+        assert json.loads(gzip.decompress(second_body)) == CATALOG
+        assert middleware.cache.misses == 1
+        assert middleware.cache.hits == 1
+
+    def test_post_bodies_not_cached(self):
+        client, middleware = make_app()
+        get_raw(client, "/query", "gzip", method="POST")
+        assert len(middleware.cache) == 0
@@ -0,0 +1,63 @@
+"""Guard against regressions in the time it takes to import the app."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that should only be imported on first use, not at startup
+DEFERRED_MODULES = ("openai", "httpx", "sqlglot", "psycopg2", "pymysql")
+
+# Cumulative import time of src.main; override on slow machines
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "1500"))
+
+# Wall-clock budgets flake on shared CI runners, so the check is opt-in
+timing_test = pytest.mark.skipif(
+    os.environ.get("SKIP_IMPORT_TIME_TESTS", "true").lower() == "true",
+    reason="Import time budget disabled by default. Set SKIP_IMPORT_TIME_TESTS=false to enable.",
+)
+
+
+def import_app(tmp_path) -> dict[str, int]:
+    """Import src.main in a fresh interpreter; return cumulative µs per module."""
+    env = {
+        **os.environ,
+        "DEEPSEEK_API_KEY": "test",
+        "DATABASE_SQLITE_PATH": str(tmp_path / "meta.db"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestImportTime:
+    """Tests for startup imports."""
+
+    def test_heavy_modules_are_deferred(self, tmp_path):
+        modules = import_app(tmp_path)
+        assert "src.main" in modules
+        loaded = [name for name in DEFERRED_MODULES if name in modules]
+        assert loaded == []
+
+    @timing_test
+    def test_import_time_budget(self, tmp_path):
+        best_ms = min(import_app(tmp_path)["src.main"] for _ in range(3)) / 1000
+        assert best_ms < IMPORT_TIME_BUDGET_MS, (
+            f"importing src.main took {best_ms:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)"
+        )
@@ -0,0 +1,100 @@
+"""Tests for the async LLM client against a local stub server."""
+import asyncio
+import random
+import time
+
+import pytest
+
+from src.models.errors import LlmTimeoutError, LlmUnavailableError
+from src.services.llm_client import LlmClient
+from src.services.nl_query import NlQueryService
+from tests.llm_stub import LlmStub
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def make_client(stub, **overrides):
+    options = {
+        "api_key": "test",
+        "base_url": stub.base_url,
+        "timeout_seconds": 5.0,
+        "max_retries": 2,
+        "retry_base_seconds": 0.01,
+        "max_concurrency": 4,
+        "max_connections": 4,
+        "rng": random.Random(0),
+    }
+    options.update(overrides)
+    return LlmClient(**options)
+
+
+@pytest.fixture
+def stub():
+    with LlmStub(content='{"sql": "SELECT 1", "explanation": "one"}') as stub:
+        yield stub
+
+
+class TestLlmClient:
+    """Tests for retries, deadlines, concurrency and connection reuse."""
+
+    async def test_reuses_connections(self, stub):
+        client = make_client(stub)
+        for _ in range(5):
+            assert await client.chat(MESSAGES, model="stub") == stub.content
+        assert stub.requests == 5
+        assert stub.connections == 1
+
+    async def test_retries_rate_limits_and_server_errors(self, stub):
+        stub.fail_next(429, 503)
+        client = make_client(stub)
+        assert await client.chat(MESSAGES, model="stub") == stub.content
+        assert stub.requests == 3
+
+    async def test_gives_up_after_retries(self, stub):
+        stub.fail_next(500, 502, 503, 504)
+        client = make_client(stub)
+        with pytest.raises(LlmUnavailableError):
+            await client.chat(MESSAGES, model="stub")
+        assert stub.requests == 3
+
+    async def test_client_errors_are_not_retried(self, stub):
+        stub.fail_next(400)
+        client = make_client(stub)
+        with pytest.raises(Exception) as excinfo:
+            await client.chat(MESSAGES, model="stub")
+        assert not isinstance(excinfo.value, LlmUnavailableError)
+        assert stub.requests == 1
+
+    async def test_retry_after_beyond_deadline(self, stub):
+        stub.retry_after = 60
+        stub.fail_next(429)
+        client = make_client(stub, timeout_seconds=1.0)
+        started = time.perf_counter()
+        with pytest.raises(LlmUnavailableError) as excinfo:
+            await client.chat(MESSAGES, model="stub")
+        assert excinfo.value.details["retryAfterSeconds"] == 60
+        assert time.perf_counter() - started < 1.0
+        assert stub.requests == 1
+
+    async def test_deadline(self, stub):
+        stub.latency_seconds = 2.0
+        client = make_client(stub, timeout_seconds=0.2)
+        started = time.perf_counter()
+        with pytest.raises(LlmTimeoutError):
+            await client.chat(MESSAGES, model="stub")
+        assert time.perf_counter() - started < 1.5
+
+    async def test_concurrency_limit(self, stub):
+        stub.latency_seconds = 0.1
+        client = make_client(stub, max_concurrency=2)
+        results = await asyncio.gather(*(client.chat(MESSAGES, model="stub") for _ in range(6)))
+        assert results == [stub.content] * 6
+        assert stub.max_in_flight == 2
+
+    async def test_generate_sql(self, stub, monkeypatch):
+        monkeypatch.setattr("src.services.nl_query.settings.deepseek_api_key", "test")
+        monkeypatch.setattr("src.services.nl_query._client", make_client(stub))
+        sql, explanation = await NlQueryService.generate_sql(
+            question="one", schema_context="", db_type="sqlite"
+        )
+        assert (sql, explanation) == ("SELECT 1", "one")
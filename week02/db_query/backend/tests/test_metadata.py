@@ -0,0 +1,173 @@
+"""Tests for metadata extraction."""
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.adapters.sqlite import SQLiteAdapter
+from src.db.models import Base
+from src.db.repository import ColumnMetadataRepository, TableMetadataRepository
+from src.services.connection import ConnectionManager
+from src.services.metadata import MetadataService
+from src.services.nl_query import NlQueryService
+
+
+@pytest.fixture
+def metadata_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def make_db(path, analyze):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT)")
+    conn.execute("CREATE INDEX idx_events_kind ON events (kind)")
+    conn.executemany("INSERT INTO events (kind) VALUES (?)", [("a",)] * 300)
+    conn.execute("CREATE VIEW kinds AS SELECT DISTINCT kind FROM events")
+    if analyze:
+        conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    return f"sqlite:///{path.as_posix()}"
+
+
+@pytest.fixture
+def analyzed_url(tmp_path):
+    url = make_db(tmp_path / "analyzed.db", analyze=True)
+    yield url
+    ConnectionManager.remove_engine("stats", url)
+
+
+class TestTableStatistics:
+    """Tests for row count and size estimates."""
+
+    def test_sqlite_statistics(self, analyzed_url):
+        with ConnectionManager.get_engine("stats", analyzed_url).connect() as conn:
+            statistics = SQLiteAdapter().extract_table_statistics(conn, None)
+        assert statistics["events"].row_estimate == 300
+        if statistics["events"].size_bytes is not None:
+            assert statistics["events"].size_bytes > 0
+
+    def test_not_analyzed(self, tmp_path):
+        url = make_db(tmp_path / "plain.db", analyze=False)
+        with ConnectionManager.get_engine("stats", url).connect() as conn:
+            statistics = SQLiteAdapter().extract_table_statistics(conn, None)
+        ConnectionManager.remove_engine("stats", url)
+        assert statistics.get("events") is None or statistics["events"].row_estimate is None
+
+    def test_estimates_stored_during_extraction(self, analyzed_url, metadata_session):
+        table_repo = TableMetadataRepository(metadata_session)
+        column_repo = ColumnMetadataRepository(metadata_session)
+        MetadataService.extract_metadata("stats", analyzed_url, table_repo, column_repo)
+
+        events = table_repo.get_by_name("stats", "events")
+        assert events.row_estimate == 300
+        assert table_repo.get_by_name("stats", "kinds").row_estimate is None
+
+
+@pytest.fixture
+def shop_url(tmp_path):
+    path = tmp_path / "shop.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE customers (id INTEGER PRIMARY KEY, email TEXT UNIQUE, region TEXT);
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY,
+            customer_id INTEGER REFERENCES customers (id),
+            status TEXT,
+            created_at TEXT
+        );
+        CREATE INDEX idx_orders_customer ON orders (customer_id);
+        CREATE INDEX idx_orders_status_created ON orders (status, created_at);
+        """
+    )
+    conn.close()
+    url = f"sqlite:///{path.as_posix()}"
+    yield url
+    ConnectionManager.remove_engine("shop", url)
+
+
+class TestRelationships:
+    """Tests for foreign key and index extraction."""
+
+    def test_foreign_keys_and_indexes_stored(self, shop_url, metadata_session):
+        table_repo = TableMetadataRepository(metadata_session)
+        MetadataService.extract_metadata(
+            "shop", shop_url, table_repo, ColumnMetadataRepository(metadata_session)
+        )
+
+        orders = table_repo.get_by_name("shop", "orders")
+        [fk] = orders.foreign_keys
+        assert fk.columns == ["customer_id"]
+        assert fk.referred_table == "customers"
+        assert fk.referred_columns == ["id"]
+        assert sorted((index.columns, index.is_unique) for index in orders.indexes) == [
+            (["customer_id"], False),
+            (["status", "created_at"], False),
+        ]
+
+        customers = table_repo.get_by_name("shop", "customers")
+        assert [(index.columns, index.is_unique) for index in customers.indexes] == [
+            (["email"], True)
+        ]
+
+    def test_keys_loaded_in_bulk(self, shop_url, metadata_session):
+        table_repo = TableMetadataRepository(metadata_session)
+        MetadataService.extract_metadata(
+            "shop", shop_url, table_repo, ColumnMetadataRepository(metadata_session)
+        )
+        metadata_session.expunge_all()
+
+        statements = []
+        engine = metadata_session.get_bind()
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            tables = table_repo.get_by_database_with_keys("shop")
+            fk_counts = {table.table_name: len(table.foreign_keys) for table in tables}
+            index_counts = {table.table_name: len(table.indexes) for table in tables}
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert fk_counts == {"customers": 0, "orders": 1}
+        assert index_counts == {"customers": 1, "orders": 2}
+        # The tables, then one query each for foreign keys and indexes
+        assert len(statements) == 3
+
+    def test_schema_context_marks_indexes_and_joins(self, shop_url, metadata_session):
+        table_repo = TableMetadataRepository(metadata_session)
+        column_repo = ColumnMetadataRepository(metadata_session)
+        MetadataService.extract_metadata("shop", shop_url, table_repo, column_repo)
+
+        context = NlQueryService.build_schema_context("shop", table_repo, column_repo)
+        assert "  customer_id INTEGER INDEXED" in context
+        assert "  status TEXT INDEXED" in context
+        assert "  created_at TEXT\n" in context or context.endswith("created_at TEXT")
+        assert "  email TEXT UNIQUE INDEXED" in context
+        assert "  (status, created_at)" in context
+        assert "  (customer_id) -> main.customers(id)" in context
+
+
+class TestSchemaContext:
+    """Tests for row estimates in the natural language schema context."""
+
+    def test_marks_large_tables(self, analyzed_url, metadata_session, monkeypatch):
+        table_repo = TableMetadataRepository(metadata_session)
+        column_repo = ColumnMetadataRepository(metadata_session)
+        MetadataService.extract_metadata("stats", analyzed_url, table_repo, column_repo)
+
+        context = NlQueryService.build_schema_context("stats", table_repo, column_repo)
+        assert "Table: main.events (table, ~300 rows)" in context
+        assert "Table: main.kinds (view)" in context
+
+        monkeypatch.setattr("src.services.nl_query.settings.nl_large_table_rows", 100)
+        context = NlQueryService.build_schema_context("stats", table_repo, column_repo)
+        assert "(table, ~300 rows, LARGE)" in context
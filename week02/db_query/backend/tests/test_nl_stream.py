@@ -0,0 +1,188 @@
+"""Tests for streamed natural language to SQL generation."""
+import json
+import random
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.db.models import Base
+from src.db.repository import get_db
+from src.main import app
+from src.services import nl_query
+from src.services.llm_client import LlmClient
+from src.services.partial_json import JsonFieldStream
+from tests.llm_stub import LlmStub
+
+ANSWER = {"sql": 'SELECT "name" FROM users LIMIT 5', "explanation": "Five user names\nfrom users"}
+
+
+def feed_all(parser, text, size):
+    deltas = []
+    for offset in range(0, len(text), size):
+        deltas.extend(parser.feed(text[offset : offset + size]))
+    return deltas
+
+
+class TestJsonFieldStream:
+    """Tests for incremental field extraction."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+    def test_fields_in_any_chunking(self, size):
+        text = json.dumps(ANSWER)
+        parser = JsonFieldStream()
+        deltas = feed_all(parser, text, size)
+        for field in ("sql", "explanation"):
+            assert "".join(d.delta for d in deltas if d.field == field) == ANSWER[field]
+        assert [d.field for d in deltas if d.complete] == ["sql", "explanation"]
+        assert parser.values == ANSWER
+        assert parser.done
+
+    def test_sql_completes_before_explanation_arrives(self):
+        parser = JsonFieldStream()
+        deltas = parser.feed('{"sql": "SELECT 1", "expla')
+        assert deltas[-1].field == "sql" and deltas[-1].complete
+        assert "explanation" not in parser.values
+
+    @pytest.mark.parametrize("size", [1, 3])
+    def test_unicode_escapes(self, size):
+        text = json.dumps({"explanation": "价格 > 😀 \\ \"q\""})
+        parser = JsonFieldStream()
+        feed_all(parser, text, size)
+        assert parser.values["explanation"] == "价格 > 😀 \\ \"q\""
+
+    def test_skips_other_values(self):
+        text = '{"n": 1, "nested": {"a": "}", "b": [1, {"c": 2}]}, "sql": "SELECT 2", "ok": true}'
+        parser = JsonFieldStream()
+        feed_all(parser, text, 1)
+        assert parser.values == {"sql": "SELECT 2"}
+        assert parser.done
+
+
+class TestStreamChat:
+    """Tests for the streaming LLM client."""
+
+    async def test_yields_deltas(self):
+        content = json.dumps(ANSWER)
+        with LlmStub(content=content, chunk_size=5) as stub:
+            client = LlmClient(
+                api_key="test",
+                base_url=stub.base_url,
+                timeout_seconds=5.0,
+                max_retries=1,
+                retry_base_seconds=0.01,
+                max_concurrency=2,
+                max_connections=2,
+                rng=random.Random(0),
+            )
+            stub.fail_next(503)
+            deltas = [delta async for delta in client.stream_chat([], model="stub")]
+        assert "".join(deltas) == content
+        assert len(deltas) == -(-len(content) // 5)
+        assert stub.requests == 2
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    db_path = tmp_path / "users.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+
+    # Keep connection metadata in memory rather than in the configured store
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+
+    with LlmStub(content=json.dumps(ANSWER), chunk_size=4) as stub:
+        monkeypatch.setattr(nl_query.settings, "deepseek_api_key", "test")
+        monkeypatch.setattr(
+            nl_query,
+            "_client",
+            LlmClient(
+                api_key="test",
+                base_url=stub.base_url,
+                timeout_seconds=5.0,
+                max_retries=0,
+                retry_base_seconds=0.01,
+                max_concurrency=2,
+                max_connections=2,
+            ),
+        )
+        client = TestClient(app)
+        response = client.put(
+            "/api/v1/dbs/stream_test", json={"url": f"sqlite:///{db_path.as_posix()}"}
+        )
+        assert response.status_code == 201
+        yield client, stub
+        client.delete("/api/v1/dbs/stream_test")
+
+
+def read_events(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+class TestStreamEndpoint:
+    """Tests for POST /dbs/{name}/query/natural/stream."""
+
+    def test_streams_sql_before_explanation(self, api):
+        client, _ = api
+        response = client.post(
+            "/api/v1/dbs/stream_test/query/natural/stream",
+            json={"question": "five user names"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "content-encoding" not in response.headers
+
+        events = read_events(response)
+        names = [name for name, _ in events]
+        assert names[0] == "context"
+        assert events[0][1]["contextTables"] == ["main.users"]
+        assert names.index("sql_complete") < names.index("explanation")
+        assert names[-1] == "done"
+        assert "".join(data["delta"] for name, data in events if name == "sql") == ANSWER["sql"]
+        sql_complete = dict(events)["sql_complete"]
+        assert sql_complete == {"sql": ANSWER["sql"], "valid": True, "error": None}
+        assert dict(events)["done"]["explanation"] == ANSWER["explanation"]
+
+    def test_cached_answer(self, api):
+        client, stub = api
+        url = "/api/v1/dbs/stream_test/query/natural/stream"
+        client.post(url, json={"question": "five user names"})
+        events = read_events(client.post(url, json={"question": "Five user names?"}))
+        assert [name for name, _ in events] == ["sql_complete", "done"]
+        assert events[1][1]["cache"] == "exact"
+        assert stub.requests == 1
+
+    def test_error_event(self, api):
+        client, stub = api
+        stub.fail_next(500)
+        events = read_events(
+            client.post(
+                "/api/v1/dbs/stream_test/query/natural/stream?refresh=true",
+                json={"question": "five user names"},
+            )
+        )
+        assert events[-1][0] == "error"
+        assert events[-1][1]["code"] == "NL_QUERY_UNAVAILABLE"
@@ -0,0 +1,142 @@
+"""Tests for per-connection pool settings and pool statistics."""
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import exc, text
+
+from src.adapters.base import PoolConfig
+from src.services.connection import ConnectionManager
+from src.services.pool import merge_pool_config
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    path = tmp_path / "pooled.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER)")
+    conn.commit()
+    conn.close()
+    url = f"sqlite:///{path.as_posix()}"
+    yield url
+    ConnectionManager.configure_pool("pooled", None)
+    ConnectionManager.remove_engine("pooled", url)
+
+
+class TestMergePoolConfig:
+    """Tests for applying per-connection overrides."""
+
+    def test_no_overrides_keeps_defaults(self):
+        base = PoolConfig()
+        assert merge_pool_config(base, None) is base
+
+    def test_overrides_replace_fields(self):
+        config = merge_pool_config(PoolConfig(), {"pool_size": 2, "pool_use_lifo": True})
+        assert config.pool_size == 2
+        assert config.pool_use_lifo is True
+        assert config.max_overflow == PoolConfig().max_overflow
+
+    def test_unknown_keys_ignored(self):
+        assert merge_pool_config(PoolConfig(), {"bogus": 1}) == PoolConfig()
+
+    def test_engine_kwargs(self):
+        kwargs = PoolConfig(pool_recycle=60, pool_use_lifo=True).to_engine_kwargs()
+        assert kwargs["pool_recycle"] == 60
+        assert kwargs["pool_use_lifo"] is True
+        assert "pool_recycle" not in PoolConfig().to_engine_kwargs()
+
+
+class TestPoolStats:
+    """Tests for live pool statistics."""
+
+    def test_counts_checkouts(self, db_url):
+        engine = ConnectionManager.get_engine("pooled", db_url)
+        first = engine.connect()
+        second = engine.connect()
+
+        stats = ConnectionManager.get_pool_stats("pooled", db_url)
+        assert stats["checked_out"] == 2
+        assert stats["checkouts"] == 2
+        assert stats["connects"] == 2
+
+        first.close()
+        second.close()
+        stats = ConnectionManager.get_pool_stats("pooled", db_url)
+        assert stats["checked_out"] == 0
+        assert stats["idle"] == 2
+        assert stats["max_checkout_wait_ms"] >= stats["avg_checkout_wait_ms"] > 0
+
+    def test_counts_timeouts(self, db_url):
+        ConnectionManager.configure_pool(
+            "pooled", {"pool_size": 1, "max_overflow": 0, "pool_timeout": 0.05}
+        )
+        engine = ConnectionManager.get_engine("pooled", db_url)
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        stats = ConnectionManager.get_pool_stats("pooled", db_url)
+        assert stats["timeouts"] == 1
+        assert stats["max_checkout_wait_ms"] >= 50
+
+
+class TestConfigurePool:
+    """Tests for changing pool settings at runtime."""
+
+    def test_rebuilds_pool_with_new_settings(self, db_url):
+        old_engine = ConnectionManager.get_engine("pooled", db_url)
+        assert old_engine.pool.size() == PoolConfig().pool_size
+
+        ConnectionManager.configure_pool("pooled", {"pool_size": 2})
+        new_engine = ConnectionManager.get_engine("pooled", db_url)
+        assert new_engine is not old_engine
+        assert new_engine.pool.size() == 2
+        assert ConnectionManager.get_pool_config("pooled", db_url).pool_size == 2
+
+    def test_checked_out_connection_survives_rebuild(self, db_url):
+        engine = ConnectionManager.get_engine("pooled", db_url)
+        conn = engine.connect()
+
+        ConnectionManager.configure_pool("pooled", {"pool_size": 1})
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+        conn.close()
+
+    def test_reset_restores_defaults(self, db_url):
+        ConnectionManager.configure_pool("pooled", {"pool_size": 1})
+        ConnectionManager.configure_pool("pooled", None)
+        assert ConnectionManager.get_pool_config("pooled", db_url) == PoolConfig()
+
+
+class TestLivenessCheck:
+    """Tests for the periodic liveness check used instead of pre-ping."""
+
+    @pytest.fixture
+    def engine(self, db_url):
+        ConnectionManager.configure_pool(
+            "pooled", {"pool_pre_ping": False, "liveness_interval_seconds": 60}
+        )
+        return ConnectionManager.get_engine("pooled", db_url)
+
+    def kill_idle_connection(self, engine):
+        with engine.connect() as conn:
+            dbapi_connection = conn.connection.dbapi_connection
+        dbapi_connection.close()
+
+    def test_long_idle_dead_connection_replaced(self, engine, db_url, monkeypatch):
+        self.kill_idle_connection(engine)
+        later = time.monotonic() + 120
+        monkeypatch.setattr(time, "monotonic", lambda: later)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+        stats = ConnectionManager.get_pool_stats("pooled", db_url)
+        assert stats["connects"] == 2
+        assert stats["invalidations"] == 1
+
+    def test_recently_used_connection_not_pinged(self, engine, db_url):
+        self.kill_idle_connection(engine)
+
+        # Within the interval the dead connection is handed out unchecked
+        with engine.connect() as conn:
+            with pytest.raises(exc.DBAPIError):
+                conn.execute(text("SELECT 1"))
@@ -0,0 +1,146 @@
+"""Tests for sampled table previews."""
+import json
+import random
+import sqlite3
+
+import pytest
+
+from src.services.connection import ConnectionManager
+from src.services.preview import PreviewCache, PreviewService, PreviewSnapshot
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    path = tmp_path / "preview.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE numbered (id INTEGER PRIMARY KEY, label TEXT)")
+    conn.executemany(
+        "INSERT INTO numbered (id, label) VALUES (?, ?)", [(i, f"row {i}") for i in range(1, 51)]
+    )
+    conn.execute("CREATE TABLE unkeyed (label TEXT)")
+    conn.executemany("INSERT INTO unkeyed (label) VALUES (?)", [("a",), ("b",), ("c",)])
+    conn.commit()
+    conn.close()
+    url = f"sqlite:///{path.as_posix()}"
+    yield url
+    ConnectionManager.remove_engine("preview", url)
+
+
+NUMBERED = [("id", "INTEGER", True), ("label", "TEXT", False)]
+
+
+def sample(db_url, table="numbered", columns=NUMBERED, limit=5, seed=1, is_view=False):
+    return PreviewService.sample_table(
+        "preview", db_url, None, table, columns, is_view, limit, rng=random.Random(seed)
+    )
+
+
+class TestSampleSql:
+    """Tests for the generated sampling statements."""
+
+    def test_tablesample(self):
+        sql = PreviewService.build_sample_sql(
+            "postgres", "public", "t", ["a"], limit=10, percent=0.5
+        )
+        assert sql == 'SELECT "a" FROM "public"."t" TABLESAMPLE SYSTEM (0.5) LIMIT 10'
+
+    def test_key_range(self):
+        sql = PreviewService.build_sample_sql(
+            "mysql", None, "t", ["id"], limit=10, key_column="id", key_condition=">="
+        )
+        assert sql == "SELECT `id` FROM `t` WHERE `id` >= :start ORDER BY `id` LIMIT 10"
+
+
+class TestSampleTable:
+    """Tests for sampling against SQLite."""
+
+    def test_pk_range_starts_at_random_key(self, db_url):
+        preview = sample(db_url, seed=3)
+        ids = [row["id"] for row in preview["rows"]]
+        start = random.Random(3).randint(1, 50)
+        assert preview["sampling"] == "pk_range"
+        assert ids == list(range(start, start + 5))
+        assert preview["columns"] == [
+            {"name": "id", "type": "INTEGER"},
+            {"name": "label", "type": "TEXT"},
+        ]
+
+    def test_pk_range_wraps_around(self, db_url):
+        preview = sample(db_url, limit=60)
+        ids = [row["id"] for row in preview["rows"]]
+        assert sorted(ids) == list(range(1, 51))
+        assert preview["truncated"] is False
+
+    def test_head_without_integer_key(self, db_url):
+        preview = sample(db_url, table="unkeyed", columns=[("label", "TEXT", False)], limit=2)
+        assert preview["sampling"] == "head"
+        assert [row["label"] for row in preview["rows"]] == ["a", "b"]
+        assert preview["truncated"] is True
+
+    def test_head_for_views(self, db_url):
+        assert sample(db_url, is_view=True)["sampling"] == "head"
+
+
+class TestPreviewCache:
+    """Tests for the snapshot cache."""
+
+    def snapshot(self, body=b"x" * 10, created_at=0.0):
+        return PreviewSnapshot(body=body, etag="e", created_at=created_at)
+
+    def test_evicts_least_recently_used_by_size(self, monkeypatch):
+        monkeypatch.setattr("time.monotonic", lambda: 0.0)
+        cache = PreviewCache(max_bytes=25, max_age_seconds=60)
+        cache.put(("db", 1, "a"), self.snapshot())
+        cache.put(("db", 1, "b"), self.snapshot())
+        cache.get(("db", 1, "a"))
+        cache.put(("db", 1, "c"), self.snapshot())
+        assert cache.get(("db", 1, "b")) is None
+        assert cache.get(("db", 1, "a")) is not None
+        assert cache.size_bytes == 20
+
+    def test_expires(self, monkeypatch):
+        cache = PreviewCache(max_bytes=100, max_age_seconds=60)
+        cache.put(("db",), self.snapshot(created_at=0.0))
+        monkeypatch.setattr("time.monotonic", lambda: 61.0)
+        assert cache.get(("db",)) is None
+        assert len(cache) == 0
+
+    def test_invalidate_connection(self):
+        cache = PreviewCache(max_bytes=100, max_age_seconds=60)
+        cache.put(("db", 1), self.snapshot())
+        cache.put(("other", 1), self.snapshot())
+        cache.invalidate("db")
+        assert len(cache) == 1
+
+
+class TestGetPreview:
+    """Tests for serving previews from the cache."""
+
+    def get(self, db_url, cache, catalog_version=1, refresh=False):
+        return PreviewService.get_preview(
+            db_name="preview",
+            connection_url=db_url,
+            catalog_version=catalog_version,
+            schema_name="main",
+            table_name="numbered",
+            columns=NUMBERED,
+            is_view=False,
+            limit=5,
+            refresh=refresh,
+            cache=cache,
+        )
+
+    def test_cached_until_catalog_changes(self, db_url):
+        cache = PreviewCache(max_bytes=1024 * 1024, max_age_seconds=60)
+        first, cached = self.get(db_url, cache)
+        assert cached is False
+        assert json.loads(first.body)["catalogVersion"] == 1
+
+        again, cached = self.get(db_url, cache)
+        assert cached is True
+        assert again is first
+
+        _, cached = self.get(db_url, cache, catalog_version=2)
+        assert cached is False
+        _, cached = self.get(db_url, cache, refresh=True)
+        assert cached is False
@@ -0,0 +1,147 @@
+"""Tests for column profiling."""
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.adapters.postgresql import PostgreSQLAdapter
+from src.adapters.sqlite import SQLiteAdapter
+from src.db.models import ColumnMetadata
+from src.services.connection import ConnectionManager
+from src.services.profile import ProfileService
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    path = tmp_path / "profiled.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, color TEXT, payload BLOB)")
+    colors = ["red", "red", "red", "blue", "blue", None, "green", None]
+    conn.executemany(
+        "INSERT INTO items (id, color, payload) VALUES (?, ?, ?)",
+        [(i + 1, color, b"\x00\x01") for i, color in enumerate(colors)],
+    )
+    conn.commit()
+    conn.close()
+    url = f"sqlite:///{path.as_posix()}"
+    yield url
+    ConnectionManager.remove_engine("profiled", url)
+
+
+COLUMNS = [("id", "INTEGER"), ("color", "TEXT"), ("payload", "BLOB")]
+
+
+class FakeColumnRepo:
+    def __init__(self):
+        self.saved = None
+
+    def save_profiles(self, profiles, profiled_at):
+        self.saved = (profiles, profiled_at)
+
+
+def make_columns():
+    return [
+        ColumnMetadata(id=i + 1, column_name=name, data_type=data_type, position=i + 1)
+        for i, (name, data_type) in enumerate(COLUMNS)
+    ]
+
+
+class TestProfileSql:
+    """Tests for the generated profile statements."""
+
+    def test_aggregates_in_one_statement(self):
+        sql, approximate = ProfileService.build_aggregate_sql(
+            PostgreSQLAdapter(), "public", "items", [("id", True), ("doc", False)], 100
+        )
+        assert sql.count("SELECT") == 2
+        assert 'COUNT(DISTINCT "sample"."id")' in sql
+        assert 'MIN("sample"."doc")' not in sql
+        assert 'FROM "public"."items" LIMIT 100' in sql
+        assert approximate == [False, False]
+
+    def test_comparable_types(self):
+        assert SQLiteAdapter().is_comparable_type("TEXT")
+        assert not SQLiteAdapter().is_comparable_type("BLOB")
+        assert not PostgreSQLAdapter().is_comparable_type("JSONB")
+        assert not PostgreSQLAdapter().is_comparable_type("BOOLEAN")
+
+
+class TestProfileColumns:
+    """Tests for computing profiles against SQLite."""
+
+    def test_profile_values(self, db_url):
+        id_profile, color, payload = ProfileService.profile_columns(
+            "profiled", db_url, None, "items", COLUMNS, sample_rows=100, top_values=2
+        )
+        assert id_profile["min_value"] == 1
+        assert id_profile["max_value"] == 8
+        assert id_profile["distinct_count"] == 8
+
+        assert color["sample_rows"] == 8
+        assert color["null_count"] == 2
+        assert color["null_fraction"] == 0.25
+        assert color["distinct_count"] == 3
+        assert color["top_values"] == [
+            {"value": "red", "count": 3},
+            {"value": "blue", "count": 2},
+        ]
+
+        assert payload["null_count"] == 0
+        assert payload["distinct_count"] is None
+        assert payload["top_values"] == []
+
+    def test_sample_bounds_scan(self, db_url):
+        [color] = ProfileService.profile_columns(
+            "profiled", db_url, None, "items", [("color", "TEXT")], sample_rows=3, top_values=5
+        )
+        assert color["sample_rows"] == 3
+        assert color["top_values"] == [{"value": "red", "count": 3}]
+
+
+class TestProfileCache:
+    """Tests for serving cached profiles."""
+
+    def get_profile(self, db_url, columns, repo, **kwargs):
+        return ProfileService.get_profile(
+            db_name="profiled",
+            connection_url=db_url,
+            schema_name="main",
+            table_name="items",
+            columns=columns,
+            column_repo=repo,
+            sample_rows=100,
+            top_values=3,
+            max_age_seconds=60,
+            **kwargs,
+        )
+
+    def test_computes_and_saves(self, db_url):
+        repo = FakeColumnRepo()
+        profile = self.get_profile(db_url, make_columns(), repo)
+        assert profile.cached is False
+        assert profile.sample_rows == 8
+        assert set(repo.saved[0]) == {1, 2, 3}
+
+    def test_fresh_cache_used(self, db_url):
+        columns = make_columns()
+        for col in columns:
+            col.profile = {"sample_rows": 8, "sample_limit": 100}
+            col.profiled_at = datetime.utcnow()
+        repo = FakeColumnRepo()
+        profile = self.get_profile(db_url, columns, repo)
+        assert profile.cached is True
+        assert repo.saved is None
+
+    @pytest.mark.parametrize(
+        "age, sample_limit, refresh",
+        [(timedelta(minutes=5), 100, False), (timedelta(0), 50, False), (timedelta(0), 100, True)],
+    )
+    def test_stale_cache_recomputed(self, db_url, age, sample_limit, refresh):
+        columns = make_columns()
+        for col in columns:
+            col.profile = {"sample_rows": 8, "sample_limit": sample_limit}
+            col.profiled_at = datetime.utcnow() - age
+        repo = FakeColumnRepo()
+        profile = self.get_profile(db_url, columns, repo, refresh=refresh)
+        assert profile.cached is False
+        assert repo.saved is not None
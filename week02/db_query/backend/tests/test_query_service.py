@@ -0,0 +1,233 @@
+"""Tests for the SQL query execution service against SQLite databases."""
+import sqlite3
+
+import pytest
+
+from src.models.errors import InvalidCursorError, QueryTimeoutError, ResultTooLargeError
+from src.services.connection import ConnectionManager
+from src.services.pagination import TableKeyInfo, cursor_limit, plan_keyset, server_cursors
+from src.services.query import QueryService
+
+# Counts forever unless the statement is interrupted
+ENDLESS_SQL = (
+    "SELECT (WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT count(*) FROM c)"
+)
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    """Create a small SQLite database and return its connection URL."""
+    path = tmp_path / "sample.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+    conn.executemany(
+        "INSERT INTO users (id, name) VALUES (?, ?)",
+        [(i, f"user{i}") for i in range(1, 51)],
+    )
+    conn.commit()
+    conn.close()
+    url = f"sqlite:///{path.as_posix()}"
+    yield url
+    ConnectionManager.remove_engine("sample", url)
+
+
+class TestStatementTimeout:
+    """Tests for server-enforced statement timeouts."""
+
+    def test_select_within_timeout(self, sqlite_url):
+        result = QueryService.execute_query(
+            "sample", sqlite_url, "SELECT * FROM users", statement_timeout_ms=5000
+        )
+        assert len(result.rows) == 50
+        assert [c[0] for c in result.columns] == ["id", "name"]
+        assert result.truncated is False
+
+    def test_timeout_raises_query_timeout(self, sqlite_url):
+        with pytest.raises(QueryTimeoutError) as exc_info:
+            QueryService.execute_query(
+                "sample", sqlite_url, ENDLESS_SQL, statement_timeout_ms=50
+            )
+        assert exc_info.value.code == "QUERY_TIMEOUT"
+        assert exc_info.value.details["timeoutMs"] == 50
+
+    def test_timeout_releases_connection(self, sqlite_url):
+        with pytest.raises(QueryTimeoutError):
+            QueryService.execute_query(
+                "sample", sqlite_url, ENDLESS_SQL, statement_timeout_ms=50
+            )
+        engine = ConnectionManager.get_engine("sample", sqlite_url)
+        assert engine.pool.checkedout() == 0
+
+        # The same pooled connection is usable again without the old deadline
+        result = QueryService.execute_query(
+            "sample", sqlite_url, "SELECT count(*) AS n FROM users", statement_timeout_ms=0
+        )
+        assert result.rows == [{"n": 50}]
+
+    def test_resolve_statement_timeout(self, monkeypatch):
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "default_statement_timeout_ms", 1234)
+        assert QueryService.resolve_statement_timeout(None) == 1234
+        assert QueryService.resolve_statement_timeout(0) is None
+        assert QueryService.resolve_statement_timeout(10) == 10
+
+
+def users_key_lookup(schema_name, table_name):
+    if table_name == "users":
+        return TableKeyInfo(primary_key=["id"], not_null={"id", "name"})
+    return None
+
+
+def fetch_all_pages(sqlite_url, result):
+    """Follow continuation cursors and return every page's row ids."""
+    pages = [[row["id"] for row in result.rows]]
+    while result.next_cursor:
+        result = QueryService.fetch_next_page("sample", sqlite_url, result.next_cursor)
+        pages.append([row["id"] for row in result.rows])
+    return pages
+
+
+class TestKeysetPlanning:
+    """Tests for deriving keyset pagination plans from the SQL AST."""
+
+    def test_plan_adds_primary_key_order(self):
+        plan = plan_keyset("SELECT * FROM users", "sqlite", 10, users_key_lookup)
+        assert plan is not None
+        assert "ORDER BY" in plan.first_page_sql
+        assert plan.first_page_sql.endswith("LIMIT 11")
+        assert ":k0" in plan.next_page_sql
+        assert plan.key_names == ["id"]
+
+    def test_plan_uses_aliased_key_column(self):
+        plan = plan_keyset(
+            "SELECT id AS user_id, name FROM users WHERE name <> 'x' ORDER BY id DESC",
+            "sqlite",
+            10,
+            users_key_lookup,
+        )
+        assert plan is not None
+        assert plan.key_names == ["user_id"]
+        assert "id < :k0" in plan.next_page_sql
+
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "SELECT * FROM users LIMIT 5",
+            "SELECT count(*) FROM users",
+            "SELECT name FROM users",
+            "SELECT * FROM users ORDER BY name",
+            "SELECT * FROM users u JOIN users v ON u.id = v.id",
+            "SELECT * FROM orders",
+        ],
+    )
+    def test_no_plan_for_unsupported_queries(self, sql):
+        assert plan_keyset(sql, "sqlite", 10, users_key_lookup) is None
+
+
+class TestPagination:
+    """Tests for paging through query results with continuation cursors."""
+
+    def test_keyset_pages_cover_all_rows(self, sqlite_url):
+        result = QueryService.execute_query(
+            "sample", sqlite_url, "SELECT * FROM users", page_size=20, key_lookup=users_key_lookup
+        )
+        assert result.truncated is True
+        pages = fetch_all_pages(sqlite_url, result)
+        assert [len(page) for page in pages] == [20, 20, 10]
+        assert sum(pages, []) == list(range(1, 51))
+        assert len(server_cursors) == 0
+
+    def test_keyset_descending_order(self, sqlite_url):
+        result = QueryService.execute_query(
+            "sample",
+            sqlite_url,
+            "SELECT id, name FROM users ORDER BY id DESC",
+            page_size=30,
+            key_lookup=users_key_lookup,
+        )
+        pages = fetch_all_pages(sqlite_url, result)
+        assert sum(pages, []) == list(range(50, 0, -1))
+
+    def test_server_cursor_pages_cover_all_rows(self, sqlite_url):
+        result = QueryService.execute_query(
+            "sample", sqlite_url, "SELECT * FROM users ORDER BY name", page_size=20
+        )
+        assert len(server_cursors) == 1
+        pages = fetch_all_pages(sqlite_url, result)
+        assert [len(page) for page in pages] == [20, 20, 10]
+        assert len(server_cursors) == 0
+        assert ConnectionManager.get_engine("sample", sqlite_url).pool.checkedout() == 0
+
+    def test_exact_page_is_not_truncated(self, sqlite_url):
+        result = QueryService.execute_query(
+            "sample", sqlite_url, "SELECT * FROM users", page_size=50, key_lookup=users_key_lookup
+        )
+        assert result.truncated is False
+        assert result.next_cursor is None
+
+    def test_tampered_cursor_is_rejected(self, sqlite_url):
+        result = QueryService.execute_query(
+            "sample", sqlite_url, "SELECT * FROM users", page_size=10, key_lookup=users_key_lookup
+        )
+        body, signature = result.next_cursor.split(".")
+        with pytest.raises(InvalidCursorError):
+            QueryService.fetch_next_page("sample", sqlite_url, body[:-2] + "AA." + signature)
+        with pytest.raises(InvalidCursorError):
+            QueryService.fetch_next_page("other", sqlite_url, result.next_cursor)
+
+    def test_idle_server_cursor_expires(self, sqlite_url, monkeypatch):
+        result = QueryService.execute_query(
+            "sample", sqlite_url, "SELECT * FROM users ORDER BY name", page_size=10
+        )
+        monkeypatch.setattr(server_cursors, "idle_timeout_seconds", 0)
+        server_cursors.reap_idle()
+        assert ConnectionManager.get_engine("sample", sqlite_url).pool.checkedout() == 0
+        with pytest.raises(InvalidCursorError):
+            QueryService.fetch_next_page("sample", sqlite_url, result.next_cursor)
+
+    def test_more_cursors_than_the_pool_holds(self, sqlite_url):
+        ConnectionManager.configure_pool("sample", {"pool_timeout": 2})
+        try:
+            pool = ConnectionManager.get_engine("sample", sqlite_url).pool
+            results = [
+                QueryService.execute_query(
+                    "sample", sqlite_url, "SELECT * FROM users ORDER BY name", page_size=10
+                )
+                for _ in range(pool.size() + pool._max_overflow + 5)
+            ]
+            assert len(server_cursors) == cursor_limit(pool)
+            assert pool.checkedout() == cursor_limit(pool)
+            # The oldest cursors were closed to make room; the newest still page
+            with pytest.raises(InvalidCursorError):
+                QueryService.fetch_next_page("sample", sqlite_url, results[0].next_cursor)
+            assert len(fetch_all_pages(sqlite_url, results[-1])) == 5
+            plain = QueryService.execute_query("sample", sqlite_url, "SELECT count(*) FROM users")
+            assert plain.rows[0]["count(*)"] == 50
+        finally:
+            server_cursors.close_all()
+            ConnectionManager.configure_pool("sample", None)
+        assert pool.checkedout() == 0
+
+
+class TestResultBudget:
+    """Tests for result-size budgets applied while rows are serialized."""
+
+    def test_spilled_page_returns_all_rows(self, sqlite_url, monkeypatch):
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "query_result_budget_bytes", 200)
+        result = QueryService.execute_query("sample", sqlite_url, "SELECT * FROM users")
+        assert result.buffer.spilled
+        assert [row["id"] for row in result.rows] == list(range(1, 51))
+        result.close()
+
+    def test_hard_cap_aborts_query(self, sqlite_url, monkeypatch):
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "query_result_max_bytes", 500)
+        with pytest.raises(ResultTooLargeError):
+            QueryService.execute_query("sample", sqlite_url, "SELECT * FROM users ORDER BY name")
+        assert ConnectionManager.get_engine("sample", sqlite_url).pool.checkedout() == 0
+        assert len(server_cursors) == 0
@@ -0,0 +1,155 @@
+"""Tests for read replica routing."""
+import sqlite3
+
+import pytest
+
+from src.adapters.sqlite import SQLiteAdapter
+from src.api.databases import _build_replica_responses
+from src.services.connection import ConnectionManager
+from src.services.query import QueryService
+
+
+def make_db(path, label):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE source (label TEXT NOT NULL)")
+    conn.execute("INSERT INTO source (label) VALUES (?)", (label,))
+    conn.commit()
+    conn.close()
+    return f"sqlite:///{path.as_posix()}"
+
+
+@pytest.fixture
+def endpoints(tmp_path):
+    """A primary and two replicas, each reporting its own label."""
+    urls = {
+        "primary": make_db(tmp_path / "primary.db", "primary"),
+        "replica1": make_db(tmp_path / "replica1.db", "replica1"),
+        "replica2": make_db(tmp_path / "replica2.db", "replica2"),
+    }
+    yield urls
+    ConnectionManager.remove_replicas("routed")
+    for url in urls.values():
+        ConnectionManager.remove_engine("routed", url)
+
+
+def served_by(primary_url, sql="SELECT label FROM source"):
+    result = QueryService.execute_query("routed", primary_url, sql)
+    return result.rows[0]["label"]
+
+
+class TestReplicaRouting:
+    """Tests for choosing an endpoint for read-only queries."""
+
+    def test_no_replicas_uses_primary(self, endpoints):
+        assert served_by(endpoints["primary"]) == "primary"
+
+    def test_unchecked_replica_not_used(self, endpoints):
+        ConnectionManager.configure_replicas("routed", [endpoints["replica1"]])
+        assert served_by(endpoints["primary"]) == "primary"
+
+    def test_healthy_replica_serves_reads(self, endpoints):
+        ConnectionManager.configure_replicas("routed", [endpoints["replica1"]])
+        ConnectionManager.check_replicas()
+        [replica] = ConnectionManager.get_replicas("routed")
+        assert replica.healthy is True
+        assert served_by(endpoints["primary"]) == "replica1"
+
+    def test_locking_reads_are_not_read_only(self):
+        assert QueryService.is_read_only("SELECT * FROM t")
+        assert not QueryService.is_read_only("SELECT * FROM t FOR UPDATE")
+        assert not QueryService.is_read_only("SELECT * FROM t LOCK IN SHARE MODE")
+
+    def test_unhealthy_replica_skipped(self, endpoints, tmp_path):
+        broken = f"sqlite:///{(tmp_path / 'missing' / 'x.db').as_posix()}"
+        ConnectionManager.configure_replicas("routed", [broken])
+        ConnectionManager.check_replicas()
+        [replica] = ConnectionManager.get_replicas("routed")
+        assert replica.healthy is False
+        assert replica.last_error
+        assert served_by(endpoints["primary"]) == "primary"
+        ConnectionManager.remove_engine("routed", broken)
+
+    def test_lag_gate_skips_unmeasured_replicas(self, endpoints):
+        # SQLite can't report replication lag, so the gate excludes it
+        ConnectionManager.configure_replicas(
+            "routed", [endpoints["replica1"]], max_lag_seconds=5
+        )
+        ConnectionManager.check_replicas()
+        assert served_by(endpoints["primary"]) == "primary"
+
+    def test_failing_lag_query_keeps_replica_routable(self, endpoints, monkeypatch):
+        def fail(self, connection):
+            raise RuntimeError("access denied; you need REPLICATION CLIENT")
+
+        monkeypatch.setattr(SQLiteAdapter, "replication_lag_seconds", fail)
+        ConnectionManager.configure_replicas("routed", [endpoints["replica1"]])
+        ConnectionManager.check_replicas()
+        [replica] = ConnectionManager.get_replicas("routed")
+        assert replica.healthy is True
+        assert replica.last_error is None
+        assert served_by(endpoints["primary"]) == "replica1"
+
+    def test_failing_lag_query_with_gate_is_recorded(self, endpoints, monkeypatch):
+        def fail(self, connection):
+            raise RuntimeError("access denied; you need REPLICATION CLIENT")
+
+        monkeypatch.setattr(SQLiteAdapter, "replication_lag_seconds", fail)
+        ConnectionManager.configure_replicas(
+            "routed", [endpoints["replica1"]], max_lag_seconds=5
+        )
+        ConnectionManager.check_replicas()
+        [replica] = ConnectionManager.get_replicas("routed")
+        assert replica.healthy is True
+        assert replica.lag_seconds is None
+        assert "REPLICATION CLIENT" in replica.last_error
+        assert served_by(endpoints["primary"]) == "primary"
+
+    def test_lag_gate(self, endpoints):
+        ConnectionManager.configure_replicas(
+            "routed", [endpoints["replica1"], endpoints["replica2"]], max_lag_seconds=5
+        )
+        ConnectionManager.check_replicas()
+        first, second = ConnectionManager.get_replicas("routed")
+        first.lag_seconds = 30.0
+        second.lag_seconds = 1.0
+        assert served_by(endpoints["primary"]) == "replica2"
+
+    def test_least_loaded_replica_chosen(self, endpoints):
+        ConnectionManager.configure_replicas(
+            "routed", [endpoints["replica1"], endpoints["replica2"]]
+        )
+        ConnectionManager.check_replicas()
+        busy = ConnectionManager.get_engine("routed", endpoints["replica1"]).connect()
+        try:
+            assert served_by(endpoints["primary"]) == "replica2"
+        finally:
+            busy.close()
+
+    def test_reconfigure_keeps_health_and_drops_removed(self, endpoints):
+        ConnectionManager.configure_replicas(
+            "routed", [endpoints["replica1"], endpoints["replica2"]]
+        )
+        ConnectionManager.check_replicas()
+        ConnectionManager.configure_replicas("routed", [endpoints["replica2"]])
+        [replica] = ConnectionManager.get_replicas("routed")
+        assert replica.url == endpoints["replica2"]
+        assert replica.healthy is True
+        ConnectionManager.remove_replicas("routed")
+        assert ConnectionManager.get_replicas("routed") == []
+
+
+class TestReplicaStatus:
+    """Tests for reporting replica status."""
+
+    def test_status_does_not_create_engines(self, endpoints):
+        ConnectionManager.configure_replicas("routed", [endpoints["replica1"]])
+        [status] = _build_replica_responses("routed")
+        assert status.active_connections == 0
+        assert ConnectionManager.find_engine("routed", endpoints["replica1"]) is None
+
+    def test_status_reports_checked_out_connections(self, endpoints):
+        ConnectionManager.configure_replicas("routed", [endpoints["replica1"]])
+        engine = ConnectionManager.get_engine("routed", endpoints["replica1"])
+        with engine.connect():
+            [status] = _build_replica_responses("routed")
+        assert status.active_connections == 1
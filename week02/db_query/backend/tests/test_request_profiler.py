@@ -0,0 +1,108 @@
+"""Tests for on-demand request profiling."""
+import pstats
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services import request_profiler as profiler_module
+from src.services.request_profiler import request_profiler
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler_module.settings, "request_profile_token", TOKEN)
+    monkeypatch.setattr(request_profiler, "directory", str(tmp_path))
+    monkeypatch.setattr(request_profiler, "keep", 3)
+    return TestClient(app)
+
+
+def profile(client, kind, token=TOKEN):
+    return client.get("/health", headers={"X-Profile": kind, "X-Profile-Token": token})
+
+
+class TestProfilingMiddleware:
+    """Tests for the X-Profile header."""
+
+    def test_unprofiled_requests_pass_through(self, client, tmp_path):
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cpu_profile(self, client, tmp_path):
+        response = profile(client, "cpu")
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
+        profile_id = response.headers["x-profile-id"]
+
+        record = client.get(
+            f"/api/v1/profiles/{profile_id}", headers={"X-Profile-Token": TOKEN}
+        ).json()
+        assert record["kind"] == "cpu"
+        assert record["path"] == "/health"
+        assert record["status"] == 200
+        assert record["files"] == [f"{profile_id}.pstats", f"{profile_id}.txt"]
+
+        stats = pstats.Stats(str(tmp_path / f"{profile_id}.pstats"))
+        assert stats.total_calls > 0
+        assert "cumulative" in (tmp_path / f"{profile_id}.txt").read_text()
+
+    def test_memory_profile(self, client):
+        response = profile(client, "mem")
+        profile_id = response.headers["x-profile-id"]
+        report = client.get(
+            f"/api/v1/profiles/{profile_id}/files/{profile_id}.txt",
+            headers={"X-Profile-Token": TOKEN},
+        )
+        assert report.status_code == 200
+        assert report.text.startswith("Peak traced memory:")
+        assert "allocating lines" in report.text
+
+    def test_requires_token(self, client, monkeypatch):
+        assert profile(client, "cpu", token="wrong").status_code == 403
+        monkeypatch.setattr(profiler_module.settings, "request_profile_token", "")
+        response = profile(client, "cpu", token="")
+        assert response.status_code == 403
+        assert response.json()["error"]["code"] == "PROFILE_FORBIDDEN"
+
+    def test_unknown_kind(self, client):
+        response = profile(client, "disk")
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_one_profile_at_a_time(self, client):
+        session = request_profiler.begin("cpu", "GET", "/other")
+        try:
+            response = profile(client, "cpu")
+            assert response.status_code == 409
+            assert response.json()["error"]["code"] == "PROFILER_BUSY"
+        finally:
+            request_profiler.release()
+        assert session is not None
+        assert profile(client, "cpu").status_code == 200
+
+
+class TestProfilesApi:
+    """Tests for listing and downloading profiles."""
+
+    def test_keeps_newest_profiles(self, client, tmp_path):
+        ids = [profile(client, "mem").headers["x-profile-id"] for _ in range(5)]
+        listed = client.get("/api/v1/profiles", headers={"X-Profile-Token": TOKEN}).json()
+        assert sorted(p["id"] for p in listed["data"]) == sorted(ids[-3:])
+        assert len(list(tmp_path.iterdir())) == 6
+
+    def test_requires_token(self, client):
+        assert client.get("/api/v1/profiles").status_code == 403
+
+    def test_unknown_profile_and_file(self, client):
+        headers = {"X-Profile-Token": TOKEN}
+        assert client.get("/api/v1/profiles/../../etc", headers=headers).status_code == 404
+        profile_id = profile(client, "mem").headers["x-profile-id"]
+        response = client.get(
+            f"/api/v1/profiles/{profile_id}/files/{profile_id}.json", headers=headers
+        )
+        assert response.status_code == 404
+        assert response.json()["error"]["code"] == "PROFILE_NOT_FOUND"
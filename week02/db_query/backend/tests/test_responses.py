@@ -0,0 +1,107 @@
+"""Tests for encoding query results as JSON and MessagePack."""
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+
+from src.api.responses import (
+    FastJSONResponse,
+    MsgPackResponse,
+    prefers_msgpack,
+    render_query_result,
+)
+from src.models.query import ColumnInfo, QueryResultResponse
+from src.services.query import QueryResult
+from src.services.result_buffer import MemoryBudget, ResultBuffer, encode_json
+
+msgpack = pytest.importorskip("msgpack")
+
+COLUMNS = [("id", "INTEGER"), ("name", "TEXT"), ("score", "REAL")]
+ROWS = [{"id": i, "name": f"user{i}", "score": i / 2, "note": None} for i in range(20)]
+
+
+def make_result(query_budget_bytes=1_000_000):
+    buffer = ResultBuffer(
+        query_budget_bytes=query_budget_bytes, max_bytes=1_000_000, budget=MemoryBudget(1_000_000)
+    )
+    for row in ROWS:
+        buffer.append(row)
+    return QueryResult(buffer=buffer, columns=COLUMNS, truncated=True, next_cursor="abc")
+
+
+def expected_body():
+    """The body the pydantic response model would have produced."""
+    return QueryResultResponse(
+        columns=[ColumnInfo(name=name, type=col_type) for name, col_type in COLUMNS],
+        rows=ROWS,
+        row_count=len(ROWS),
+        truncated=True,
+        next_cursor="abc",
+    ).model_dump(by_alias=True)
+
+
+def read_streaming(response) -> bytes:
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+class TestPrefersMsgpack:
+    """Tests for Accept header negotiation."""
+
+    @pytest.mark.parametrize(
+        "accept,expected",
+        [
+            (None, False),
+            ("*/*", False),
+            ("application/json", False),
+            ("application/msgpack", True),
+            ("application/x-msgpack", True),
+            ("application/json;q=0.5, application/msgpack", True),
+            ("application/json, application/msgpack;q=0.5", False),
+            ("application/msgpack;q=0", False),
+        ],
+    )
+    def test_negotiation(self, accept, expected):
+        assert prefers_msgpack(accept) is expected
+
+
+class TestRenderQueryResult:
+    """Tests for the fast query result encoders."""
+
+    def test_json_matches_response_model(self):
+        response = render_query_result(make_result())
+        assert isinstance(response, FastJSONResponse)
+        assert json.loads(response.body) == expected_body()
+
+    def test_msgpack_matches_response_model(self):
+        response = render_query_result(make_result(), "application/msgpack")
+        assert isinstance(response, MsgPackResponse)
+        assert response.media_type == "application/msgpack"
+        assert msgpack.unpackb(response.body) == expected_body()
+
+    def test_spilled_json_stream(self):
+        result = make_result(query_budget_bytes=200)
+        assert result.buffer.spilled
+        response = render_query_result(result)
+        assert json.loads(read_streaming(response)) == expected_body()
+        result.close()
+
+    def test_spilled_msgpack_stream(self):
+        result = make_result(query_budget_bytes=200)
+        response = render_query_result(result, "application/msgpack")
+        assert response.media_type == "application/msgpack"
+        assert msgpack.unpackb(read_streaming(response)) == expected_body()
+        result.close()
+
+
+class TestEncodeJson:
+    """Tests for the JSON encoder fallbacks."""
+
+    def test_large_integers(self):
+        assert json.loads(encode_json({"n": 2**70})) == {"n": 2**70}
+
+    def test_unknown_types_as_strings(self):
+        assert json.loads(encode_json({"d": Decimal("1.5")})) == {"d": "1.5"}
@@ -0,0 +1,68 @@
+"""Tests for memory-bounded result buffering with disk spill."""
+import json
+
+import pytest
+
+from src.models.errors import ResultTooLargeError
+from src.services.result_buffer import MemoryBudget, ResultBuffer, estimate_size
+
+
+def make_rows(count, width=100):
+    return [{"id": i, "payload": "x" * width} for i in range(count)]
+
+
+class TestResultBuffer:
+    """Tests for the ResultBuffer spill behaviour."""
+
+    def test_small_result_stays_in_memory(self):
+        budget = MemoryBudget(10_000)
+        buffer = ResultBuffer(query_budget_bytes=10_000, max_bytes=100_000, budget=budget)
+        for row in make_rows(5):
+            buffer.append(row)
+        assert not buffer.spilled
+        assert list(buffer) == make_rows(5)
+        assert budget.used_bytes == buffer.size_bytes
+        buffer.close()
+        assert budget.used_bytes == 0
+
+    def test_overflow_spills_to_disk_in_order(self):
+        budget = MemoryBudget(1_000_000)
+        buffer = ResultBuffer(query_budget_bytes=1_000, max_bytes=1_000_000, budget=budget)
+        rows = make_rows(50)
+        for row in rows:
+            buffer.append(row)
+        assert buffer.spilled
+        assert len(buffer) == 50
+        assert list(buffer) == rows
+        assert [json.loads(line) for line in buffer.iter_json()] == rows
+        buffer.close()
+        assert budget.used_bytes == 0
+        assert list(buffer) == []
+
+    def test_process_budget_forces_spill(self):
+        budget = MemoryBudget(500)
+        first = ResultBuffer(query_budget_bytes=10_000, max_bytes=100_000, budget=budget)
+        second = ResultBuffer(query_budget_bytes=10_000, max_bytes=100_000, budget=budget)
+        for row in make_rows(3):
+            first.append(row)
+        for row in make_rows(3):
+            second.append(row)
+        assert not first.spilled
+        assert second.spilled
+        first.close()
+        second.close()
+
+    def test_hard_cap_raises(self):
+        buffer = ResultBuffer(
+            query_budget_bytes=1_000, max_bytes=2_000, budget=MemoryBudget(1_000_000)
+        )
+        with pytest.raises(ResultTooLargeError) as exc_info:
+            for row in make_rows(100):
+                buffer.append(row)
+        assert exc_info.value.code == "RESULT_TOO_LARGE"
+        buffer.close()
+
+    def test_estimate_size_tracks_json_length(self):
+        row = {"id": 1, "name": "hello", "tags": ["a", "b"], "meta": {"k": None}}
+        encoded = len(json.dumps(row, separators=(",", ":")))
+        assert abs(estimate_size(row) - encoded) < encoded
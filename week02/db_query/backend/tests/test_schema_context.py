@@ -0,0 +1,200 @@
+"""Tests for relevance-pruned schema context."""
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db.models import Base
+from src.db.repository import ColumnMetadataRepository, TableMetadataRepository
+from src.services.connection import ConnectionManager
+from src.services.metadata import MetadataService
+from src.services.nl_query import NlQueryService
+from src.services.schema_context import (
+    BM25Index,
+    SchemaCatalog,
+    SchemaCatalogCache,
+    estimate_tokens,
+    tokenize,
+)
+
+
+def make_table(table_id, name, columns, foreign_keys=(), comment=None):
+    table = SimpleNamespace(
+        id=table_id,
+        schema_name="main",
+        table_name=name,
+        table_type="table",
+        row_estimate=None,
+        comment=comment,
+        indexes=[],
+        foreign_keys=[
+            SimpleNamespace(
+                columns=[column],
+                referred_schema="main",
+                referred_table=referred,
+                referred_columns=["id"],
+            )
+            for column, referred in foreign_keys
+        ],
+    )
+    columns = [
+        SimpleNamespace(
+            column_name=column,
+            data_type="INTEGER" if column == "id" or column.endswith("_id") else "TEXT",
+            is_primary_key=column == "id",
+            is_nullable=column != "id",
+            default_value=None,
+            comment=None,
+        )
+        for column in columns
+    ]
+    return table, columns
+
+
+def make_catalog():
+    specs = [
+        ("customers", ["id", "name", "email"], []),
+        ("orders", ["id", "customer_id", "status", "created_at"], [("customer_id", "customers")]),
+        ("order_items", ["id", "order_id", "product_id", "quantity"], [
+            ("order_id", "orders"), ("product_id", "products"),
+        ]),
+        ("products", ["id", "title", "price"], []),
+    ]
+    # Padding tables push the catalog over small budgets
+    specs += [(f"audit_log_{i}", ["id", "actor", "action", "payload"], []) for i in range(20)]
+    tables, columns = [], {}
+    for i, (name, cols, fks) in enumerate(specs, start=1):
+        table, table_columns = make_table(i, name, cols, fks)
+        tables.append(table)
+        columns[i] = table_columns
+    return SchemaCatalog.build(tables, columns, large_table_rows=1_000_000)
+
+
+class TestTokenize:
+    """Tests for identifier and question tokenization."""
+
+    def test_splits_identifiers(self):
+        assert tokenize("customer_orders") == ["customer", "order"]
+        assert tokenize("customerOrders") == ["customer", "order"]
+        assert tokenize("HTTPStatus") == ["http", "status"]
+
+    def test_drops_stopwords(self):
+        assert tokenize("Show me all the orders of this month") == ["all", "order", "month"]
+
+    def test_cjk_bigrams(self):
+        assert tokenize("订单金额") == ["订单", "单金", "金额"]
+
+
+class TestBM25Index:
+    """Tests for BM25 scoring."""
+
+    def test_rare_terms_score_higher(self):
+        index = BM25Index([["order", "id"], ["customer", "id"], ["product", "id"]])
+        scores = index.scores(["order", "id"])
+        assert scores[0] > scores[1] == scores[2] > 0
+
+    def test_unknown_terms(self):
+        assert BM25Index([["order"]]).scores(["nothing"]) == [0.0]
+
+
+class TestSchemaCatalog:
+    """Tests for per-question table selection."""
+
+    def test_small_catalog_is_sent_whole(self):
+        catalog = make_catalog()
+        context = catalog.select("orders per customer", top_tables=2, max_tokens=100_000)
+        assert len(context.tables) == context.total_tables == 24
+        assert context.text == catalog.render_all()
+
+    def test_selects_matching_tables_and_neighbours(self):
+        catalog = make_catalog()
+        context = catalog.select("total quantity sold per product", top_tables=2, max_tokens=400)
+        assert context.total_tables == 24
+        assert context.tables[:2] == ["main.order_items", "main.products"]
+        # orders joins to order_items, so it comes along as a neighbour
+        assert "main.orders" in context.tables
+        assert not any(name.startswith("main.audit_log") for name in context.tables)
+        assert context.token_estimate == estimate_tokens(context.text)
+        assert context.token_estimate <= 400
+
+    def test_budget_keeps_best_match(self):
+        catalog = make_catalog()
+        context = catalog.select("customer emails", top_tables=5, max_tokens=1)
+        assert context.tables == ["main.customers"]
+
+    def test_no_match_falls_back_to_catalog_order(self):
+        catalog = make_catalog()
+        context = catalog.select("zzz", top_tables=2, max_tokens=200)
+        assert context.tables[0] == "main.customers"
+        assert context.token_estimate <= 200
+
+
+@pytest.fixture
+def shop_repos(tmp_path):
+    conn = sqlite3.connect(tmp_path / "shop.db")
+    conn.execute("CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute(
+        "CREATE TABLE orders (id INTEGER PRIMARY KEY, "
+        "customer_id INTEGER REFERENCES customers (id), total REAL)"
+    )
+    conn.commit()
+    conn.close()
+    url = f"sqlite:///{(tmp_path / 'shop.db').as_posix()}"
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    table_repo = TableMetadataRepository(session)
+    column_repo = ColumnMetadataRepository(session)
+    MetadataService.extract_metadata("shop", url, table_repo, column_repo)
+    yield url, table_repo, column_repo
+    session.close()
+    ConnectionManager.remove_engine("shop", url)
+
+
+class TestSchemaCatalogCache:
+    """Tests for cached catalogs."""
+
+    def test_keeps_newest_version(self):
+        cache = SchemaCatalogCache()
+        catalog = make_catalog()
+        cache.put(("a", 1, "sqlite"), catalog)
+        cache.put(("b", 1, "sqlite"), catalog)
+        cache.put(("a", 2, "sqlite"), catalog)
+        assert cache.get(("a", 1, "sqlite")) is None
+        assert cache.get(("a", 2, "sqlite")) is catalog
+        assert cache.get(("b", 1, "sqlite")) is catalog
+
+        cache.invalidate("a")
+        assert len(cache) == 1
+
+    def test_catalog_built_once_per_version(self, shop_repos, monkeypatch):
+        url, table_repo, column_repo = shop_repos
+        cache = SchemaCatalogCache()
+        builds = []
+        build_catalog = NlQueryService.build_catalog
+
+        def counting_build(*args, **kwargs):
+            builds.append(args)
+            return build_catalog(*args, **kwargs)
+
+        monkeypatch.setattr(NlQueryService, "build_catalog", counting_build)
+        first = NlQueryService.get_catalog("shop", url, 1, table_repo, column_repo, cache=cache)
+        again = NlQueryService.get_catalog("shop", url, 1, table_repo, column_repo, cache=cache)
+        assert again is first
+        assert len(builds) == 1
+
+        NlQueryService.get_catalog("shop", url, 2, table_repo, column_repo, cache=cache)
+        assert len(builds) == 2
+        assert first.render_all() == NlQueryService.build_schema_context(
+            "shop", table_repo, column_repo
+        )
+        assert "  (customer_id) -> main.customers(id)" in first.render_all()
+
+    def test_columns_by_database(self, shop_repos):
+        _, table_repo, column_repo = shop_repos
+        columns = column_repo.get_by_database("shop")
+        for table in table_repo.get_by_database("shop"):
+            assert columns[table.id] == column_repo.get_by_table(table.id)
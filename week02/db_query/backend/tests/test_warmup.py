@@ -0,0 +1,75 @@
+"""Tests for startup pool warm-up."""
+import sqlite3
+import threading
+
+import pytest
+
+from src.services import warmup
+from src.services.connection import ConnectionManager
+from src.services.warmup import WarmupState, start_warmup
+
+
+@pytest.fixture
+def sqlite_urls(tmp_path):
+    urls = []
+    for i in range(3):
+        path = tmp_path / f"db{i}.db"
+        sqlite3.connect(path).close()
+        urls.append(f"sqlite:///{path.as_posix()}")
+    yield urls
+    for url in urls:
+        ConnectionManager.remove_engine("warm", url)
+
+
+class TestWarmup:
+    """Tests for warming up connection pools concurrently."""
+
+    def test_pools_left_with_idle_connections(self, sqlite_urls):
+        state = WarmupState()
+        assert not state.ready
+        start_warmup(
+            [("warm", url) for url in sqlite_urls],
+            min_idle=2,
+            timeout_seconds=10,
+            max_workers=4,
+            state=state,
+        ).join()
+        assert state.ready
+        assert state.summary()["warmed"] == 3
+        assert state.summary()["timedOut"] is False
+        for url in sqlite_urls:
+            assert ConnectionManager.get_engine("warm", url).pool.checkedin() == 2
+
+    def test_failures_do_not_block_readiness(self, tmp_path):
+        broken = f"sqlite:///{(tmp_path / 'missing' / 'db.sqlite').as_posix()}"
+        state = WarmupState()
+        try:
+            start_warmup(
+                [("broken", broken)], min_idle=1, timeout_seconds=10, max_workers=1, state=state
+            ).join()
+        finally:
+            ConnectionManager.remove_engine("broken", broken)
+        assert state.ready
+        assert state.summary()["failed"] == ["broken"]
+        assert state.endpoints[0].error
+
+    def test_time_budget(self, monkeypatch):
+        release = threading.Event()
+
+        def slow_warm(endpoint, min_idle):
+            release.wait(5)
+
+        monkeypatch.setattr(warmup, "warm_endpoint", slow_warm)
+        state = WarmupState()
+        start_warmup(
+            [("slow", "sqlite://")], min_idle=1, timeout_seconds=0.05, max_workers=1, state=state
+        ).join()
+        release.set()
+        assert state.ready
+        assert state.summary()["timedOut"] is True
+        assert state.summary()["pending"] == ["slow"]
+
+    def test_no_endpoints_is_ready(self):
+        state = WarmupState()
+        start_warmup([], min_idle=1, timeout_seconds=1, max_workers=1, state=state).join()
+        assert state.ready